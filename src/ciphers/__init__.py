@@ -1,3 +1,4 @@
 from src.ciphers.des.des_cipher import DesCipher
+from src.ciphers.des.triple_des_cipher import TripleDesCipher
 from src.ciphers.monoalphabetic.monoalphabetic_cipher import MonoalphabeticCipher
 from src.ciphers.polyalphabetic.polyalphabetic_cipher import PolyalphabeticCipher
@@ -0,0 +1,150 @@
+from functools import lru_cache
+from typing import List, Tuple
+
+import numpy as np
+
+from src.ciphers.des.des_key_context import DesKeyContext
+from src.ciphers.des.des_tables import get_des_tables
+
+# Number of blocks processed per pass, keeps the temporary arrays small
+BATCH_SIZE = 1 << 16
+
+
+@lru_cache(maxsize=None)
+def _get_numpy_tables() -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns the shared DES lookup tables as uint64 NumPy arrays.
+
+    :return: A tuple with the initial permutation, final permutation, expansion and SP tables
+    """
+    tables = get_des_tables()
+    return (np.array(tables.initial_permutation, dtype=np.uint64),
+            np.array(tables.final_permutation, dtype=np.uint64),
+            np.array(tables.expansion, dtype=np.uint64),
+            np.array(tables.sp, dtype=np.uint64))
+
+
+class DesBatchEngine:
+    """
+    DES core that processes a whole NumPy array of 64-bit blocks at once (ECB).
+    Every round is run across the array with vectorized table gathers.
+    """
+
+    def __init__(self, key_context: DesKeyContext) -> None:
+        """
+        Constructor method that takes the round keys from the key context as uint64 values.
+
+        :param key_context: The key schedule of the key
+        """
+        # Shared lookup tables
+        self._ip, self._fp, self._expansion, self._sp = _get_numpy_tables()
+
+        # Round keys as 48-bit values for encryption and decryption
+        self._round_keys, self._round_keys_reverse = key_context.get_engine_data("numpy", self.build_round_keys)
+
+    @staticmethod
+    def build_round_keys(key_context: DesKeyContext) -> Tuple[List[np.uint64], List[np.uint64]]:
+        """
+        Converts the round keys of a key context into uint64 values.
+
+        :param key_context: The key schedule of the key
+        :return: A tuple with the forward and reverse round keys
+        """
+        round_keys = [np.uint64(round_key) for round_key in key_context.round_keys]
+        return round_keys, round_keys[::-1]
+
+    @staticmethod
+    def _permute(blocks: np.ndarray, tables: np.ndarray) -> np.ndarray:
+        """
+        Permutes the bits of every block using byte-indexed lookup tables.
+
+        :param blocks: Array of uint64 blocks
+        :param tables: The byte-indexed tables of the permutation (8 x 256)
+        :return: Array with the permuted blocks
+        """
+        result = tables[0][blocks >> 56]
+        for byte_num in range(1, 8):
+            result |= tables[byte_num][(blocks >> (56 - 8 * byte_num)) & 0xFF]
+        return result
+
+    def schedule(self, decrypt: bool = False) -> List[np.uint64]:
+        """
+        Returns the round keys in the representation used by this engine.
+
+        :param decrypt: Whether to return the reverse round keys
+        :return: List of round keys as uint64 values
+        """
+        return self._round_keys_reverse if decrypt else self._round_keys
+
+    def _process_batch(self, blocks: np.ndarray, schedules: Tuple[List[np.uint64], ...]) -> np.ndarray:
+        """
+        Processes a batch of blocks using the DES algorithm.
+
+        :param blocks: Array of uint64 blocks
+        :param schedules: Lists of round keys as uint64 values, applied in order
+        :return: Array with the processed blocks
+        """
+        e0, e1, e2, e3 = self._expansion
+        sp = self._sp
+
+        # Initial Permutation
+        blocks = self._permute(blocks, self._ip)
+
+        # Split the blocks into left and right halves
+        left, right = blocks >> 32, blocks & 0xFFFFFFFF
+
+        for round_keys in schedules:
+            # Iterate through 16 rounds, swapping the halves after each one
+            for round_key in round_keys:
+                # Expansion D-box and XOR with the round key
+                xor_result = e0[right >> 24]
+                xor_result |= e1[(right >> 16) & 0xFF]
+                xor_result |= e2[(right >> 8) & 0xFF]
+                xor_result |= e3[right & 0xFF]
+                xor_result ^= round_key
+
+                # S-boxes and Straight Permutation
+                sbox_result = sp[0][xor_result >> 42]
+                for box_num in range(1, 8):
+                    sbox_result |= sp[box_num][(xor_result >> (42 - 6 * box_num)) & 0x3F]
+
+                left, right = right, left ^ sbox_result
+
+            # The last swap is undone
+            left, right = right, left
+
+        # Combination and Final Permutation
+        return self._permute((left << 32) | right, self._fp)
+
+    def process_blocks(self, blocks: np.ndarray, *schedules: List[np.uint64]) -> np.ndarray:
+        """
+        Processes an array of blocks in fixed-size batches.
+        Several schedules can be given to chain DES operations without the intermediate permutations.
+
+        :param blocks: Array of uint64 blocks
+        :param schedules: Lists of round keys as uint64 values, applied in order
+        :return: Array with the processed blocks
+        """
+        blocks = np.asarray(blocks, dtype=np.uint64).ravel()
+        result = np.empty_like(blocks)
+        for start in range(0, len(blocks), BATCH_SIZE):
+            result[start:start + BATCH_SIZE] = self._process_batch(blocks[start:start + BATCH_SIZE], schedules)
+        return result
+
+    def encrypt_blocks(self, blocks: np.ndarray) -> np.ndarray:
+        """
+        Encrypts an array of 64-bit blocks.
+
+        :param blocks: Array of uint64 plaintext blocks
+        :return: Array of uint64 ciphertext blocks
+        """
+        return self.process_blocks(blocks, self._round_keys)
+
+    def decrypt_blocks(self, blocks: np.ndarray) -> np.ndarray:
+        """
+        Decrypts an array of 64-bit blocks.
+
+        :param blocks: Array of uint64 ciphertext blocks
+        :return: Array of uint64 plaintext blocks
+        """
+        return self.process_blocks(blocks, self._round_keys_reverse)
@@ -0,0 +1,275 @@
+from functools import lru_cache
+from typing import List, Tuple
+
+import numpy as np
+
+from src.ciphers.des import const
+from src.ciphers.des.des_key_context import DesKeyContext
+
+# Number of blocks packed in every bit-plane
+SLICE_SIZE = 1 << 16
+
+# Gate operations of the S-box circuits
+GATE_AND = 0
+GATE_OR = 1
+GATE_XOR = 2
+GATE_NOT = 3
+
+
+class SboxCircuit:
+    """
+    Boolean circuit of a DES S-box over its 6 input bits.
+    Signals 0 to 5 are the inputs (most significant first), the rest are the outputs of the gates.
+    """
+
+    def __init__(self, s_box: List[List[int]]) -> None:
+        """
+        Constructor method that builds the circuit from the S-box truth table.
+
+        :param s_box: The S-box (4 rows of 16 columns)
+        """
+        self.gates = []
+        self._memo = {}
+
+        # Outputs of the S-box, most significant first
+        self.outputs = []
+        for output_bit in range(4):
+            truth_table = []
+            for chunk in range(64):
+                row = ((chunk >> 4) & 0b10) | (chunk & 1)
+                column = (chunk >> 1) & 0xF
+                truth_table.append((s_box[row][column] >> (3 - output_bit)) & 1)
+            self.outputs.append(self._build_output(truth_table))
+
+    def _gate(self, op: int, a: int, b: int = -1) -> int:
+        """
+        Adds a gate to the circuit, reusing an identical one if it already exists.
+
+        :param op: The gate operation
+        :param a: The first input signal
+        :param b: The second input signal (unused for NOT)
+        :return: The signal of the gate output
+        """
+        if op != GATE_NOT and a > b:
+            a, b = b, a
+        key = (op, a, b)
+        if key not in self._memo:
+            self.gates.append(key)
+            self._memo[key] = 6 + len(self.gates) - 1
+        return self._memo[key]
+
+    def _mux(self, select: int, low: tuple, high: tuple) -> tuple:
+        """
+        Builds a multiplexer returning low when the select signal is 0 and high otherwise.
+        Nodes are ("const", bit) or ("signal", index), constants are folded away.
+
+        :param select: The select signal
+        :param low: The node selected when the select signal is 0
+        :param high: The node selected when the select signal is 1
+        :return: The node of the multiplexer output
+        """
+        if low == high:
+            return low
+        (low_kind, low_value), (high_kind, high_value) = low, high
+        if low_kind == "const" and high_kind == "const":
+            return ("signal", select) if high_value else ("signal", self._gate(GATE_NOT, select))
+        if low_kind == "const":
+            if low_value:
+                return ("signal", self._gate(GATE_OR, self._gate(GATE_NOT, select), high_value))
+            return ("signal", self._gate(GATE_AND, select, high_value))
+        if high_kind == "const":
+            if high_value:
+                return ("signal", self._gate(GATE_OR, select, low_value))
+            return ("signal", self._gate(GATE_AND, self._gate(GATE_NOT, select), low_value))
+        # low ^ ((low ^ high) & select)
+        difference = self._gate(GATE_AND, self._gate(GATE_XOR, low_value, high_value), select)
+        return ("signal", self._gate(GATE_XOR, low_value, difference))
+
+    def _build_output(self, truth_table: List[int]) -> int:
+        """
+        Builds the multiplexer tree of an output bit, selecting by the least significant input first.
+
+        :param truth_table: The output bit for each of the 64 inputs
+        :return: The signal of the output
+        """
+        nodes = [("const", bit) for bit in truth_table]
+        for select in range(5, -1, -1):
+            nodes = [self._mux(select, nodes[i], nodes[i + 1]) for i in range(0, len(nodes), 2)]
+        return nodes[0][1]
+
+    def evaluate(self, inputs: List[int], ones: int) -> List[int]:
+        """
+        Evaluates the circuit over bit-planes.
+
+        :param inputs: The 6 input bit-planes
+        :param ones: A bit-plane with all the bits set (used for NOT)
+        :return: The 4 output bit-planes
+        """
+        signals = list(inputs)
+        append = signals.append
+        for op, a, b in self.gates:
+            if op == GATE_AND:
+                append(signals[a] & signals[b])
+            elif op == GATE_OR:
+                append(signals[a] | signals[b])
+            elif op == GATE_XOR:
+                append(signals[a] ^ signals[b])
+            else:
+                append(signals[a] ^ ones)
+        return [signals[output] for output in self.outputs]
+
+
+@lru_cache(maxsize=None)
+def _get_sbox_circuits() -> Tuple[SboxCircuit, ...]:
+    """
+    Returns the shared S-box circuits, building them the first time they are requested.
+
+    :return: A tuple with the circuit of each S-box
+    """
+    return tuple(SboxCircuit(s_box) for s_box in const.s_box_table)
+
+
+class DesBitsliceEngine:
+    """
+    Bitsliced DES core over wide Python integers.
+    N blocks are transposed into 64 bit-planes (one N-bit integer per bit position), so every bitwise
+    operation processes all the blocks at once. Permutations become reordering of planes and the
+    S-boxes are boolean circuits, so the execution does not depend on the data (constant time).
+    """
+
+    def __init__(self, key_context: DesKeyContext) -> None:
+        """
+        Constructor method that takes the round keys from the key context as lists of bits.
+
+        :param key_context: The key schedule of the key
+        """
+        # Shared S-box circuits
+        self._circuits = _get_sbox_circuits()
+
+        # Round keys as lists of 48 bits for encryption and decryption
+        self._round_keys, self._round_keys_reverse = key_context.get_engine_data("bitslice", self.build_round_keys)
+
+    @staticmethod
+    def build_round_keys(key_context: DesKeyContext) -> Tuple[List[List[bool]], List[List[bool]]]:
+        """
+        Converts the round keys of a key context into lists of bits.
+
+        :param key_context: The key schedule of the key
+        :return: A tuple with the forward and reverse round keys
+        """
+        round_keys = [[bit == "1" for bit in round_key] for round_key in key_context.round_keys_binary]
+        return round_keys, round_keys[::-1]
+
+    @staticmethod
+    def to_planes(blocks: np.ndarray) -> List[int]:
+        """
+        Transposes blocks into bit-planes.
+
+        :param blocks: Array of uint64 blocks
+        :return: 64 integers, the i-th holds bit i+1 (most significant first) of every block
+        """
+        planes = []
+        for shift in range(63, -1, -1):
+            bits = ((blocks >> shift) & 1).astype(np.uint8)
+            planes.append(int.from_bytes(np.packbits(bits, bitorder="little").tobytes(), "little"))
+        return planes
+
+    @staticmethod
+    def from_planes(planes: List[int], num_blocks: int) -> np.ndarray:
+        """
+        Transposes bit-planes back into blocks.
+
+        :param planes: The 64 bit-planes
+        :param num_blocks: The number of blocks stored in the planes
+        :return: Array of uint64 blocks
+        """
+        num_bytes = (num_blocks + 7) // 8
+        blocks = np.zeros(num_blocks, dtype=np.uint64)
+        for shift, plane in zip(range(63, -1, -1), planes):
+            plane_bytes = np.frombuffer(plane.to_bytes(num_bytes, "little"), dtype=np.uint8)
+            bits = np.unpackbits(plane_bytes, bitorder="little")[:num_blocks]
+            blocks |= bits.astype(np.uint64) << np.uint64(shift)
+        return blocks
+
+    def schedule(self, decrypt: bool = False) -> List[List[bool]]:
+        """
+        Returns the round keys in the representation used by this engine.
+
+        :param decrypt: Whether to return the reverse round keys
+        :return: List of round keys as lists of bits
+        """
+        return self._round_keys_reverse if decrypt else self._round_keys
+
+    def _process_planes(self, planes: List[int], schedules: Tuple[List[List[bool]], ...], ones: int) -> List[int]:
+        """
+        Processes bit-planes using the DES algorithm.
+
+        :param planes: The 64 input bit-planes
+        :param schedules: Lists of round keys as lists of bits, applied in order
+        :param ones: A bit-plane with all the bits set
+        :return: The 64 output bit-planes
+        """
+        # Initial Permutation
+        planes = [planes[position - 1] for position in const.initial_permutation_table]
+
+        # Split the block into left and right halves
+        left, right = planes[:32], planes[32:]
+
+        for round_keys in schedules:
+            # Iterate through 16 rounds, swapping the halves after each one
+            for round_key in round_keys:
+                # Expansion D-box and XOR with the round key
+                expanded = [right[position - 1] ^ ones if key_bit else right[position - 1]
+                            for position, key_bit in zip(const.expansion_d_box_table, round_key)]
+
+                # S-boxes
+                sbox_result = []
+                for box_num, circuit in enumerate(self._circuits):
+                    sbox_result.extend(circuit.evaluate(expanded[6 * box_num:6 * box_num + 6], ones))
+
+                # Straight Permutation and XOR with the left half
+                left, right = right, [plane ^ sbox_result[position - 1]
+                                      for plane, position in zip(left, const.straight_permutation_table)]
+
+            # The last swap is undone
+            left, right = right, left
+
+        # Combination and Final Permutation
+        combined = left + right
+        return [combined[position - 1] for position in const.final_permutation_table]
+
+    def process_blocks(self, blocks: np.ndarray, *schedules: List[List[bool]]) -> np.ndarray:
+        """
+        Processes an array of blocks in slices of SLICE_SIZE blocks.
+        Several schedules can be given to chain DES operations without the intermediate permutations.
+
+        :param blocks: Array of uint64 blocks
+        :param schedules: Lists of round keys as lists of bits, applied in order
+        :return: Array with the processed blocks
+        """
+        blocks = np.asarray(blocks, dtype=np.uint64).ravel()
+        result = np.empty_like(blocks)
+        for start in range(0, len(blocks), SLICE_SIZE):
+            block_slice = blocks[start:start + SLICE_SIZE]
+            ones = (1 << len(block_slice)) - 1
+            planes = self._process_planes(self.to_planes(block_slice), schedules, ones)
+            result[start:start + SLICE_SIZE] = self.from_planes(planes, len(block_slice))
+        return result
+
+    def encrypt_blocks(self, blocks: np.ndarray) -> np.ndarray:
+        """
+        Encrypts an array of 64-bit blocks.
+
+        :param blocks: Array of uint64 plaintext blocks
+        :return: Array of uint64 ciphertext blocks
+        """
+        return self.process_blocks(blocks, self._round_keys)
+
+    def decrypt_blocks(self, blocks: np.ndarray) -> np.ndarray:
+        """
+        Decrypts an array of 64-bit blocks.
+
+        :param blocks: Array of uint64 ciphertext blocks
+        :return: Array of uint64 plaintext blocks
+        """
+        return self.process_blocks(blocks, self._round_keys_reverse)
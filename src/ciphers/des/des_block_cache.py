@@ -0,0 +1,150 @@
+from collections import OrderedDict
+from typing import Callable
+
+import numpy as np
+
+# Default number of blocks remembered per direction
+BLOCK_CACHE_SIZE = 1 << 16
+
+
+class DesBlockCache:
+    """
+    Memoization of the blocks processed with a key, for ECB over repetitive data (e.g. uniform image regions).
+    Duplicated blocks of an array are processed once and scattered back, and a bounded LRU remembers the
+    results across calls. Every encrypted block is also remembered for decryption, and vice versa.
+    """
+
+    def __init__(self, max_size: int = BLOCK_CACHE_SIZE) -> None:
+        """
+        Constructor method that initializes empty caches.
+
+        :param max_size: The maximum number of blocks remembered for encryption and for decryption
+        :raises ValueError: If the size is not positive
+        """
+        if max_size <= 0:
+            raise ValueError(f"Invalid block cache size: {max_size}")
+        self.max_size = max_size
+        self.clear()
+
+    def __getstate__(self) -> dict:
+        """
+        Pickles the cache without its blocks, so sending a cipher to worker processes stays cheap.
+
+        :return: The state of the cache
+        """
+        return {"max_size": self.max_size}
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Restores an empty cache from its state.
+
+        :param state: The state of the cache
+        """
+        self.__init__(state["max_size"])
+
+    def clear(self) -> None:
+        """
+        Forgets all the blocks and resets the statistics.
+        """
+        # Results by input block, for encryption (False) and decryption (True)
+        self._caches = {False: OrderedDict(), True: OrderedDict()}
+        self.requests = 0
+        self.duplicates = 0
+        self.cache_hits = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Fraction of the requested blocks that did not need to be processed.
+        """
+        return (self.duplicates + self.cache_hits) / self.requests if self.requests else 0.0
+
+    def stats(self) -> dict:
+        """
+        Gets the statistics of the cache.
+
+        :return: A dictionary with the requested blocks, the duplicates found in the same call, the blocks found in
+        the cache, the processed blocks and the hit rate
+        """
+        processed = self.requests - self.duplicates - self.cache_hits
+        return {"requests": self.requests, "duplicates": self.duplicates, "cache_hits": self.cache_hits,
+                "processed": processed, "hit_rate": self.hit_rate}
+
+    def _store(self, blocks: list, results: list, decrypt: bool) -> None:
+        """
+        Remembers processed blocks in both directions, evicting the least recently used ones.
+
+        :param blocks: The input blocks as integers
+        :param results: The processed blocks as integers
+        :param decrypt: Whether the blocks were decrypted
+        """
+        cache, inverse_cache = self._caches[decrypt], self._caches[not decrypt]
+        for block, result in zip(blocks[-self.max_size:], results[-self.max_size:]):
+            cache[block] = result
+            inverse_cache[result] = block
+        for lru in (cache, inverse_cache):
+            while len(lru) > self.max_size:
+                lru.popitem(last=False)
+
+    def process_block(self, block: int, process: Callable[[int], int], decrypt: bool = False) -> int:
+        """
+        Processes a single block, unless it is in the cache.
+
+        :param block: The input block as an integer
+        :param process: The function that processes a block
+        :param decrypt: Whether the function decrypts
+        :return: The processed block as an integer
+        """
+        self.requests += 1
+        cache = self._caches[decrypt]
+        result = cache.get(block)
+        if result is not None:
+            self.cache_hits += 1
+            cache.move_to_end(block)
+            return result
+
+        result = process(block)
+        self._store([block], [result], decrypt)
+        return result
+
+    def process_blocks(self, blocks: np.ndarray, process: Callable[[np.ndarray], np.ndarray],
+                       decrypt: bool = False) -> np.ndarray:
+        """
+        Processes an array of independent blocks, running the function only on the unique blocks not in the cache.
+
+        :param blocks: Array of uint64 blocks
+        :param process: The function that processes an array of blocks
+        :param decrypt: Whether the function decrypts
+        :return: Array with the processed blocks
+        """
+        blocks = np.asarray(blocks, dtype=np.uint64).ravel()
+        if not len(blocks):
+            return process(blocks)
+
+        # Every distinct block is looked up once
+        unique, inverse = np.unique(blocks, return_inverse=True)
+        self.requests += len(blocks)
+        self.duplicates += len(blocks) - len(unique)
+
+        cache = self._caches[decrypt]
+        unique_list = unique.tolist()
+        results = np.zeros_like(unique)
+        missing = []
+        for index, block in enumerate(unique_list):
+            result = cache.get(block)
+            if result is None:
+                missing.append(index)
+            else:
+                results[index] = result
+                cache.move_to_end(block)
+        self.cache_hits += len(unique) - len(missing)
+
+        # Only the blocks never seen are processed
+        if missing:
+            missing = np.array(missing)
+            processed = process(unique[missing])
+            results[missing] = processed
+            self._store([unique_list[index] for index in missing.tolist()], processed.tolist(), decrypt)
+
+        # Scatter the results to the positions of the duplicates
+        return results[inverse.ravel()]
@@ -1,7 +1,24 @@
-from typing import List
+import secrets
+from typing import Iterable, Iterator, List, Optional, Union
+
+import numpy as np
 
 from src.ciphers.des import const
+from src.ciphers.des.des_batch_engine import DesBatchEngine
+from src.ciphers.des.des_block_cache import DesBlockCache
+from src.ciphers.des.des_bitslice_engine import DesBitsliceEngine
 from src.ciphers.des.des_cipher_helper import DesCipherHelper
+from src.ciphers.des.des_int_engine import DesIntEngine
+from src.ciphers.des.des_key_context import get_key_context
+from src.ciphers.des.des_modes import MODES, DesMode
+from src.ciphers.des.des_stream import CHUNK_SIZE, DesStream
+from src.util.text_util import TextUtil
+
+# Default memory budget of the image files processed in strips
+IMAGE_MAX_MEMORY = 64 << 20
+
+# Copies of a strip alive while it is processed (input, blocks, output...), used to size the strips
+IMAGE_STRIP_COPIES = 8
 
 class DesCipher:
     """
@@ -9,10 +26,34 @@ class DesCipher:
     It provides methods for key generation, encryption, and helper functions.
     """
 
-    def __init__(self) -> None:
+    # Available DES cores ("string" is the reference implementation in _process_block)
+    ENGINES = {
+        "string": None,
+        "int": DesIntEngine,
+    }
+
+    # Available DES cores for arrays of blocks
+    BATCH_ENGINES = {
+        "numpy": DesBatchEngine,
+        "bitslice": DesBitsliceEngine,
+    }
+
+    def __init__(self, engine: str = "int", batch_engine: str = "numpy", key: Optional[str] = None,
+                 block_cache_size: int = 0) -> None:
         """
         Constructor method that initializes the DES object with predefined tables.
+
+        :param engine: The DES core used to process single blocks ("string" or "int")
+        :param batch_engine: The DES core used to process arrays of blocks ("numpy" or "bitslice")
+        :param key: The key as a 16-character hexadecimal string (a random one is generated if not provided)
+        :param block_cache_size: The number of blocks remembered by the ECB/single-block cache (0 disables it)
+        :raises ValueError: If the engine, the batch engine or the key is not supported
         """
+        if engine not in self.ENGINES:
+            raise ValueError(f"Invalid DES engine: {engine}")
+        if batch_engine not in self.BATCH_ENGINES:
+            raise ValueError(f"Invalid DES batch engine: {batch_engine}")
+
         # Instance of DesCipherHelper
         self.des_helper = DesCipherHelper()
 
@@ -31,10 +72,19 @@ class DesCipher:
         # Final Permutation Table
         self.final_permutation_table = const.final_permutation_table
 
-        # Generate keys
+        # Generate keys (the schedule of recently used keys is cached)
         self._seed = self.des_helper._generate_seed()
-        self._key = self.des_helper._generate_random_key(self._seed)
-        self._round_keys_binary = self.des_helper.generate_keys(self._key)
+        self._key = key.upper() if key is not None else self.des_helper._generate_random_key(self._seed)
+        self._key_context = get_key_context(self._key)
+        self._round_keys_binary = self._key_context.round_keys_binary
+
+        # Instance of the selected DES core
+        self._engine_name = engine
+        self._engine = self.ENGINES[engine](self._key_context) if self.ENGINES[engine] else None
+        self._batch_engine = self.BATCH_ENGINES[batch_engine](self._key_context)
+
+        # Optional memoization of the blocks processed with this key
+        self.block_cache = DesBlockCache(block_cache_size) if block_cache_size else None
 
     def _process_block(self, block_hex: str, round_keys_binary: List[str]) -> str:
         """
@@ -94,6 +144,11 @@ class DesCipher:
         :param plaintext_hex: The input plaintext as a hexadecimal string
         :return: The encrypted ciphertext as a binary string
         """
+        if self._engine is not None and self.block_cache is not None:
+            return format(self.block_cache.process_block(int(plaintext_hex, 16), self.cipher_int_block), "016X")
+        if self._engine is not None:
+            return format(self.cipher_int_block(int(plaintext_hex, 16)), "016X")
+
         # Use regular keys
         round_keys_binary = self._round_keys_binary
         # Process block
@@ -107,26 +162,180 @@ class DesCipher:
         :param cipher_text: The input ciphertext as a hexadecimal string
         :return: The decrypted plaintext as a binary string
         """
+        if self._engine is not None and self.block_cache is not None:
+            return format(self.block_cache.process_block(int(cipher_text, 16), self.decipher_int_block, decrypt=True), "016X")
+        if self._engine is not None:
+            return format(self.decipher_int_block(int(cipher_text, 16)), "016X")
+
         # Use reverse keys
-        round_keys_binary_reverse = self._round_keys_binary[::-1]
+        round_keys_binary_reverse = self._key_context.round_keys_binary_reverse
         # Process block
         plaintext = self._process_block(cipher_text, round_keys_binary_reverse)
         return plaintext
     
+    def cipher_int_block(self, block: int) -> int:
+        """
+        Encrypts a single 64-bit block given as an integer.
+
+        :param block: The plaintext block as an integer
+        :return: The ciphertext block as an integer
+        """
+        if self._engine is not None:
+            return self._engine.encrypt_block(block)
+        return int(self.cipher_block(format(block, "016X")), 16)
+
+    def decipher_int_block(self, block: int) -> int:
+        """
+        Decrypts a single 64-bit block given as an integer.
+
+        :param block: The ciphertext block as an integer
+        :return: The plaintext block as an integer
+        """
+        if self._engine is not None:
+            return self._engine.decrypt_block(block)
+        return int(self.decipher_block(format(block, "016X")), 16)
+
+    def cipher_blocks(self, blocks: np.ndarray) -> np.ndarray:
+        """
+        Encrypts an array of 64-bit blocks (ECB) using the batch engine.
+
+        :param blocks: The plaintext blocks as a uint64 NumPy array
+        :return: The ciphertext blocks as a uint64 NumPy array
+        """
+        return self._batch_engine.encrypt_blocks(blocks)
+
+    def decipher_blocks(self, blocks: np.ndarray) -> np.ndarray:
+        """
+        Decrypts an array of 64-bit blocks (ECB) using the batch engine.
+
+        :param blocks: The ciphertext blocks as a uint64 NumPy array
+        :return: The plaintext blocks as a uint64 NumPy array
+        """
+        return self._batch_engine.decrypt_blocks(blocks)
+
+    def cipher_bytes(self, data: Union[bytes, bytearray, memoryview], mode: DesMode = DesMode.ecb,
+                     iv: Optional[int] = None, workers: int = 1) -> bytes:
+        """
+        Encrypts the given data using the DES algorithm.
+        ECB and CBC use PKCS#7 padding, CTR and OFB keep the length of the data.
+
+        :param data: The input plaintext as bytes
+        :param mode: The mode of operation
+        :param iv: The 64-bit IV (initial counter for CTR), a random one is used if not provided (ignored in ECB)
+        :param workers: The number of worker processes for the parallelizable modes (ECB, CTR)
+        :return: The encrypted ciphertext as bytes, prefixed with the IV in modes other than ECB
+        """
+        data = memoryview(data).cast("B")
+
+        # The IV is sent in clear before the ciphertext
+        header = b""
+        if mode != DesMode.ecb:
+            iv = secrets.randbits(64) if iv is None else iv
+            header = iv.to_bytes(8, "big")
+        block_mode = MODES[mode](self, iv or 0, workers)
+
+        # Full blocks are read in place, the last one is padded
+        full_length = len(data) - len(data) % 8
+        if block_mode.is_stream:
+            last_block = bytes(data[full_length:]).ljust(8, b"\x00") if full_length < len(data) else b""
+        else:
+            last_block = self.des_helper.pad_bytes(data)
+        blocks = np.concatenate((self.des_helper.bytes_to_uint64_blocks(data[:full_length]),
+                                 self.des_helper.bytes_to_uint64_blocks(last_block)))
+
+        # Encrypt the blocks with the mode of operation
+        ciphertext = self.des_helper.uint64_blocks_to_bytes(block_mode.encrypt(blocks))
+        if block_mode.is_stream:
+            ciphertext = ciphertext[:len(data)]
+        return header + ciphertext
+
+    def decipher_bytes(self, data: Union[bytes, bytearray, memoryview], mode: DesMode = DesMode.ecb,
+                       workers: int = 1) -> bytes:
+        """
+        Decrypts the given data using the DES algorithm.
+
+        :param data: The input ciphertext as bytes (prefixed with the IV in modes other than ECB)
+        :param mode: The mode of operation
+        :param workers: The number of worker processes for the parallelizable modes (ECB, CBC, CTR)
+        :return: The decrypted plaintext as bytes
+        :raises ValueError: If the length of the ciphertext or the padding is not valid
+        """
+        data = memoryview(data).cast("B")
+
+        # Read the IV sent before the ciphertext
+        iv = 0
+        if mode != DesMode.ecb:
+            if len(data) < 8:
+                raise ValueError("Ciphertext is missing the IV")
+            iv = int.from_bytes(data[:8], "big")
+            data = data[8:]
+        block_mode = MODES[mode](self, iv, workers)
+
+        if block_mode.is_stream:
+            # The last block can be partial
+            full_length = len(data) - len(data) % 8
+            last_block = bytes(data[full_length:]).ljust(8, b"\x00") if full_length < len(data) else b""
+            blocks = np.concatenate((self.des_helper.bytes_to_uint64_blocks(data[:full_length]),
+                                     self.des_helper.bytes_to_uint64_blocks(last_block)))
+            return self.des_helper.uint64_blocks_to_bytes(block_mode.decrypt(blocks))[:len(data)]
+
+        if not data or len(data) % 8:
+            raise ValueError("Ciphertext length must be a non-zero multiple of 8 bytes")
+
+        # Decrypt the blocks with the mode of operation
+        blocks = block_mode.decrypt(self.des_helper.bytes_to_uint64_blocks(data))
+        return self.des_helper.unpad_bytes(self.des_helper.uint64_blocks_to_bytes(blocks))
+
+    def stream(self, mode: DesMode = DesMode.ecb, iv: Optional[int] = None, decrypt: bool = False,
+               workers: int = 1, pad: bool = True, header: bool = True) -> DesStream:
+        """
+        Creates a stream to encrypt or decrypt data given in chunks, with a bounded buffer.
+
+        :param mode: The mode of operation
+        :param iv: The 64-bit IV for encryption, a random one is used if not provided (ignored in ECB)
+        :param decrypt: Whether to decrypt instead of encrypt
+        :param workers: The number of worker processes for the parallelizable modes
+        :param pad: Whether ECB and CBC use PKCS#7 padding
+        :param header: Whether the IV is written before the ciphertext (otherwise it must be given to decrypt)
+        :return: The DesStream instance
+        """
+        return DesStream(self, mode=mode, iv=iv, decrypt=decrypt, workers=workers, pad=pad, header=header)
+
+    def cipher_file(self, input_path: str, output_path: str, mode: DesMode = DesMode.ecb, iv: Optional[int] = None,
+                    workers: int = 1, chunk_size: int = CHUNK_SIZE) -> None:
+        """
+        Encrypts a file of any size in fixed-size chunks (the input is memory mapped).
+
+        :param input_path: The path of the plaintext file
+        :param output_path: The path of the ciphertext file
+        :param mode: The mode of operation
+        :param iv: The 64-bit IV, a random one is used if not provided (ignored in ECB)
+        :param workers: The number of worker processes for the parallelizable modes
+        :param chunk_size: The number of bytes processed on every step
+        """
+        self.stream(mode=mode, iv=iv, workers=workers).process_file(input_path, output_path, chunk_size)
+
+    def decipher_file(self, input_path: str, output_path: str, mode: DesMode = DesMode.ecb,
+                      workers: int = 1, chunk_size: int = CHUNK_SIZE) -> None:
+        """
+        Decrypts a file of any size in fixed-size chunks (the input is memory mapped).
+
+        :param input_path: The path of the ciphertext file
+        :param output_path: The path of the plaintext file
+        :param mode: The mode of operation
+        :param workers: The number of worker processes for the parallelizable modes
+        :param chunk_size: The number of bytes processed on every step
+        """
+        self.stream(mode=mode, decrypt=True, workers=workers).process_file(input_path, output_path, chunk_size)
+
     def cipher_content(self, content: str) -> str:
         """
         Encrypts the given plaintext using the DES algorithm.
 
         :param content: The input plaintext as a regular string
-        :return: The encrypted ciphertext as a binary string
+        :return: The encrypted ciphertext as a hexadecimal string
         """
-        # Convert the input string to hexadecimal
-        hex_string = self.des_helper.text_to_hex(content)
-        hex_blocks = self.des_helper.hex_to_64_bits_blocks(hex_string)
-
-        # Call cipher_block to perform encryption
-        ciphertext = "".join(self.cipher_block(hex_string) for hex_string in hex_blocks)
-        return ciphertext
+        return self.cipher_bytes(content.encode("utf-8")).hex().upper()
 
     def decipher_content(self, ciphered_content: str) -> str:
         """
@@ -135,30 +344,16 @@ class DesCipher:
         :param ciphered_content: The input ciphertext as a hexadecimal string
         :return: The decrypted plaintext as a regular string
         """
-        # Get hex blocks of 64 bits
-        hex_blocks = self.des_helper.hex_to_64_bits_blocks(ciphered_content)
-
-        # Call decipher_block to perform decryption
-        hex_text = "".join(self.decipher_block(hex_string) for hex_string in hex_blocks)
-
-        # Convert hexadecimal code to text
-        deciphered_text = self.des_helper.hex_to_text(hex_text)
-        return deciphered_text
+        return self.decipher_bytes(bytes.fromhex(ciphered_content)).decode("utf-8")
 
     def cipher_hex_img(self, content: str) -> str:
         """
         Encrypts the given hex image using DES algorithm.
 
         :param content: The image as a hexadecimal string
-        :return: The encrypted ciphertext as a binary string
+        :return: The encrypted ciphertext as a hexadecimal string
         """
-        # Convert the input string to hexadecimal
-        hex_blocks = self.des_helper.hex_to_64_bits_blocks(content)
-
-        # Call cipher_block to perform encryption
-        ciphertext = "".join(self.cipher_block(hex_string) for hex_string in hex_blocks)
-
-        return ciphertext
+        return self.cipher_bytes(bytes.fromhex(content)).hex().upper()
 
     def decipher_hex_img(self, ciphered_content: str) -> str:
         """
@@ -167,10 +362,150 @@ class DesCipher:
         :param ciphered_content: The input ciphertext as a hexadecimal string
         :return: The decrypted text as a hexadecimal image
         """
-        # Get hex blocks of 64 bits
-        hex_blocks = self.des_helper.hex_to_64_bits_blocks(ciphered_content)
+        return self.decipher_bytes(bytes.fromhex(ciphered_content)).hex().upper()
+
+    def _process_image(self, pixels: np.ndarray, decrypt: bool, mode: DesMode, iv: int, workers: int) -> np.ndarray:
+        """
+        Processes the pixel buffer of an image as 64-bit blocks, without converting it to another representation.
+
+        :param pixels: The pixels as a uint8 array of any shape
+        :param decrypt: Whether to decrypt instead of encrypt
+        :param mode: The mode of operation
+        :param iv: The 64-bit IV (ignored in ECB)
+        :param workers: The number of worker processes for the parallelizable modes
+        :return: The processed pixels with the same shape
+        """
+        # The output buffer starts as a copy, so the last bytes that do not fill a block stay unchanged
+        result = np.array(pixels, dtype=np.uint8, order="C")
+        flat = result.reshape(-1)
+
+        # Full blocks are processed through a big-endian view of the buffer
+        blocks = flat[:len(flat) - len(flat) % 8].view(">u8")
+        if len(blocks):
+            block_mode = MODES[mode](self, iv, workers)
+            blocks[:] = block_mode.decrypt(blocks) if decrypt else block_mode.encrypt(blocks)
+        return result
+
+    def cipher_image(self, pixels: np.ndarray, mode: DesMode = DesMode.ecb, iv: int = 0, workers: int = 1) -> np.ndarray:
+        """
+        Encrypts the pixels of an image (grayscale, RGB or RGBA) using the DES algorithm.
+        The result keeps the shape of the image, so no padding is added and the IV is not stored.
+
+        :param pixels: The pixels as a uint8 array, as returned by TextUtil.read_image_pixels
+        :param mode: The mode of operation
+        :param iv: The 64-bit IV (ignored in ECB), the same one must be used to decipher the image
+        :param workers: The number of worker processes for the parallelizable modes
+        :return: The encrypted pixels as a uint8 array
+        """
+        return self._process_image(pixels, False, mode, iv, workers)
+
+    def decipher_image(self, pixels: np.ndarray, mode: DesMode = DesMode.ecb, iv: int = 0, workers: int = 1) -> np.ndarray:
+        """
+        Decrypts the pixels of an image encrypted with cipher_image.
+
+        :param pixels: The encrypted pixels as a uint8 array
+        :param mode: The mode of operation
+        :param iv: The 64-bit IV used to encrypt the image (ignored in ECB)
+        :param workers: The number of worker processes for the parallelizable modes
+        :return: The decrypted pixels as a uint8 array
+        """
+        return self._process_image(pixels, True, mode, iv, workers)
+
+    def _strip_iv(self, mode: DesMode, iv: int, index: int, block_offset: int) -> int:
+        """
+        Gets the IV of a strip processed on its own, so no two strips share a keystream or a first CBC block.
+
+        :param mode: The mode of operation
+        :param iv: The 64-bit IV of the image
+        :param index: The index of the strip
+        :param block_offset: The number of blocks processed in the previous strips
+        :return: The 64-bit IV of the strip
+        """
+        if mode == DesMode.ctr:
+            # The counter continues where the previous strip stopped
+            return (iv + block_offset) & 0xFFFFFFFFFFFFFFFF
+        if mode in (DesMode.cbc, DesMode.ofb):
+            # The IVs of the strips are the encryption of consecutive values, unpredictable without the key
+            return self.cipher_int_block((iv + index) & 0xFFFFFFFFFFFFFFFF)
+        return iv
+
+    def _process_strips(self, strips: Iterable[np.ndarray], decrypt: bool, mode: DesMode, iv: int,
+                        workers: int) -> Iterator[np.ndarray]:
+        """
+        Processes every strip of an image on its own, with the IV of the strip.
+
+        :param strips: The pixels of the strips as uint8 arrays
+        :param decrypt: Whether to decrypt instead of encrypt
+        :param mode: The mode of operation
+        :param iv: The 64-bit IV of the image (ignored in ECB)
+        :param workers: The number of worker processes for the parallelizable modes
+        :return: A generator of the processed strips
+        """
+        block_offset = 0
+        for index, strip in enumerate(strips):
+            yield self._process_image(strip, decrypt, mode, self._strip_iv(mode, iv, index, block_offset), workers)
+            block_offset += strip.size // 8
 
-        # Call decipher_block to perform decryption
-        hex_text = "".join(self.decipher_block(hex_string) for hex_string in hex_blocks)
+    def _process_image_file(self, input_path: str, output_path: str, decrypt: bool, mode: DesMode, iv: int,
+                            workers: int, max_memory: int, chained: bool) -> None:
+        """
+        Processes an image in strips of rows and writes the output image strip by strip.
+
+        :param input_path: The path of the input image
+        :param output_path: The path of the output image (PGM, PPM or PAM, depending on the channels)
+        :param decrypt: Whether to decrypt instead of encrypt
+        :param mode: The mode of operation
+        :param iv: The 64-bit IV (ignored in ECB)
+        :param workers: The number of worker processes for the parallelizable modes
+        :param max_memory: The approximate number of bytes used by the strips
+        :param chained: Whether the mode of operation runs across the whole image or restarts on every strip
+        """
+        text_util = TextUtil()
+        image_size, image_mode = text_util.read_image_header(input_path)
+        row_bytes = image_size[0] * len(image_mode)
+        strip_rows = max(1, max_memory // (IMAGE_STRIP_COPIES * row_bytes))
+        strips = text_util.read_image_strips(input_path, strip_rows)
+
+        if chained:
+            # The image is a single message: blocks can span strips and only the last bytes are left unprocessed
+            stream = self.stream(mode=mode, iv=iv, decrypt=decrypt, workers=workers, pad=False, header=False)
+            output = stream.process_chunks(strips)
+        else:
+            # Every strip is processed on its own, as cipher_image does with a whole image, with its own IV
+            output = self._process_strips(strips, decrypt, mode, iv, workers)
+
+        text_util.write_image_strips(output_path, image_size, image_mode, output)
+
+    def cipher_image_file(self, input_path: str, output_path: str, mode: DesMode = DesMode.ecb, iv: int = 0,
+                          workers: int = 1, max_memory: int = IMAGE_MAX_MEMORY, chained: bool = True) -> None:
+        """
+        Encrypts an image of any size in strips of rows, keeping the memory below a budget.
+        The input must be uncompressed (PGM, PPM or PAM), as it is read strip by strip.
+        In ECB and CBC the result is the same as cipher_image (CTR and OFB also encrypt the last bytes of the image).
+
+        :param input_path: The path of the plaintext image
+        :param output_path: The path of the encrypted image (PGM, PPM or PAM, depending on the channels)
+        :param mode: The mode of operation
+        :param iv: The 64-bit IV (ignored in ECB), the same one must be used to decipher the image
+        :param workers: The number of worker processes for the parallelizable modes
+        :param max_memory: The approximate number of bytes used by the strips
+        :param chained: Whether the mode of operation runs across the whole image or restarts on every strip (the
+        strips depend on max_memory, so the same one must be used to decipher the image)
+        :raises ValueError: If the input image is compressed (e.g. JPEG or PNG)
+        """
+        self._process_image_file(input_path, output_path, False, mode, iv, workers, max_memory, chained)
 
-        return hex_text
+    def decipher_image_file(self, input_path: str, output_path: str, mode: DesMode = DesMode.ecb, iv: int = 0,
+                            workers: int = 1, max_memory: int = IMAGE_MAX_MEMORY, chained: bool = True) -> None:
+        """
+        Decrypts an image encrypted with cipher_image_file in strips of rows, keeping the memory below a budget.
+
+        :param input_path: The path of the encrypted image
+        :param output_path: The path of the decrypted image (PGM, PPM or PAM, depending on the channels)
+        :param mode: The mode of operation
+        :param iv: The 64-bit IV used to encrypt the image (ignored in ECB)
+        :param workers: The number of worker processes for the parallelizable modes
+        :param max_memory: The approximate number of bytes used by the strips
+        :param chained: Whether the image was encrypted as a single message or strip by strip
+        """
+        self._process_image_file(input_path, output_path, True, mode, iv, workers, max_memory, chained)
@@ -1,7 +1,9 @@
 import random
 import string
 
-from typing import List
+from typing import List, Union
+
+import numpy as np
 
 from src.ciphers.des import const
 
@@ -66,7 +68,52 @@ class DesCipherHelper:
 
         return full_blocks
 
-    
+    @staticmethod
+    def pad_bytes(data: Union[bytes, bytearray, memoryview]) -> bytes:
+        """
+        Get the last block of the data with PKCS#7 padding (1 to 8 bytes, each holding the padding length).
+
+        :param data: The input data.
+        :return: The remaining bytes after the last full block plus the padding (always 8 bytes).
+        """
+        remaining = bytes(memoryview(data)[len(data) - len(data) % 8:])
+        padding_length = 8 - len(remaining)
+        return remaining + bytes([padding_length] * padding_length)
+
+    @staticmethod
+    def unpad_bytes(data: bytes) -> bytes:
+        """
+        Remove the PKCS#7 padding from the data.
+
+        :param data: The padded data.
+        :return: The data without the padding.
+        :raises ValueError: If the padding is not valid.
+        """
+        padding_length = data[-1] if data else 0
+        if not 1 <= padding_length <= 8 or data[-padding_length:] != bytes([padding_length] * padding_length):
+            raise ValueError("Invalid padding")
+        return data[:-padding_length]
+
+    @staticmethod
+    def bytes_to_uint64_blocks(data: Union[bytes, bytearray, memoryview]) -> np.ndarray:
+        """
+        Interpret data (with a length multiple of 8) as big-endian 64-bit blocks.
+
+        :param data: The input data.
+        :return: The blocks as a uint64 NumPy array.
+        """
+        return np.frombuffer(data, dtype=">u8").astype(np.uint64)
+
+    @staticmethod
+    def uint64_blocks_to_bytes(blocks: np.ndarray) -> bytes:
+        """
+        Convert an array of 64-bit blocks to big-endian bytes.
+
+        :param blocks: The blocks as a uint64 NumPy array.
+        :return: The bytes of the blocks.
+        """
+        return blocks.astype(">u8").tobytes()
+
     @staticmethod
     def hex_to_bin(hex_string: str) -> str:
         """
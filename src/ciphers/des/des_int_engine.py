@@ -0,0 +1,96 @@
+from typing import List
+
+from src.ciphers.des.des_key_context import DesKeyContext
+from src.ciphers.des.des_tables import get_des_tables
+
+
+class DesIntEngine:
+    """
+    DES core that represents blocks, halves and round keys as Python integers.
+    Permutations, expansion and S-boxes are resolved with the shared lookup tables and bitwise operations.
+    """
+
+    def __init__(self, key_context: DesKeyContext) -> None:
+        """
+        Constructor method that takes the round keys from the key context.
+
+        :param key_context: The key schedule of the key
+        """
+        # Shared lookup tables
+        self._tables = get_des_tables()
+
+        # Round keys as 48-bit integers for encryption and decryption
+        self._round_keys = key_context.round_keys
+        self._round_keys_reverse = key_context.round_keys_reverse
+
+    def schedule(self, decrypt: bool = False) -> List[int]:
+        """
+        Returns the round keys in the representation used by this engine.
+
+        :param decrypt: Whether to return the reverse round keys
+        :return: List of round keys as integers
+        """
+        return self._round_keys_reverse if decrypt else self._round_keys
+
+    def process_block(self, block: int, *schedules: List[int]) -> int:
+        """
+        Processes a 64-bit block using the DES algorithm.
+        Several schedules can be given to chain DES operations (e.g. Triple DES): the intermediate
+        final/initial permutations cancel each other, so only the rounds run between schedules.
+
+        :param block: The input block as an integer
+        :param schedules: Lists of round keys as integers, applied in order
+        :return: The processed block as an integer
+        """
+        ip0, ip1, ip2, ip3, ip4, ip5, ip6, ip7 = self._tables.initial_permutation
+        fp0, fp1, fp2, fp3, fp4, fp5, fp6, fp7 = self._tables.final_permutation
+        e0, e1, e2, e3 = self._tables.expansion
+        sp0, sp1, sp2, sp3, sp4, sp5, sp6, sp7 = self._tables.sp
+
+        # Initial Permutation
+        block = (ip0[block >> 56] | ip1[(block >> 48) & 0xFF] | ip2[(block >> 40) & 0xFF] | ip3[(block >> 32) & 0xFF] |
+                 ip4[(block >> 24) & 0xFF] | ip5[(block >> 16) & 0xFF] | ip6[(block >> 8) & 0xFF] | ip7[block & 0xFF])
+
+        # Split the block into left and right halves
+        left, right = block >> 32, block & 0xFFFFFFFF
+
+        for round_keys in schedules:
+            # Iterate through 16 rounds, swapping the halves after each one
+            for round_key in round_keys:
+                # Expansion D-box and XOR with the round key
+                xor_result = (e0[right >> 24] | e1[(right >> 16) & 0xFF] | e2[(right >> 8) & 0xFF] | e3[right & 0xFF]) ^ round_key
+
+                # S-boxes and Straight Permutation
+                sbox_result = (sp0[xor_result >> 42] | sp1[(xor_result >> 36) & 0x3F] | sp2[(xor_result >> 30) & 0x3F] |
+                               sp3[(xor_result >> 24) & 0x3F] | sp4[(xor_result >> 18) & 0x3F] | sp5[(xor_result >> 12) & 0x3F] |
+                               sp6[(xor_result >> 6) & 0x3F] | sp7[xor_result & 0x3F])
+
+                left, right = right, left ^ sbox_result
+
+            # The last swap is undone
+            left, right = right, left
+
+        # Combination
+        block = (left << 32) | right
+
+        # Final Permutation
+        return (fp0[block >> 56] | fp1[(block >> 48) & 0xFF] | fp2[(block >> 40) & 0xFF] | fp3[(block >> 32) & 0xFF] |
+                fp4[(block >> 24) & 0xFF] | fp5[(block >> 16) & 0xFF] | fp6[(block >> 8) & 0xFF] | fp7[block & 0xFF])
+
+    def encrypt_block(self, block: int) -> int:
+        """
+        Encrypts a 64-bit block.
+
+        :param block: The plaintext block as an integer
+        :return: The ciphertext block as an integer
+        """
+        return self.process_block(block, self._round_keys)
+
+    def decrypt_block(self, block: int) -> int:
+        """
+        Decrypts a 64-bit block.
+
+        :param block: The ciphertext block as an integer
+        :return: The plaintext block as an integer
+        """
+        return self.process_block(block, self._round_keys_reverse)
@@ -0,0 +1,93 @@
+from functools import lru_cache
+from typing import Any, Callable
+
+from src.ciphers.des import const
+from src.ciphers.des.des_tables import DesTables
+
+# Number of key contexts kept in memory
+KEY_CACHE_SIZE = 256
+
+
+class DesKeyContext:
+    """
+    Key schedule of a DES key, ready to be shared by the engines.
+    It holds the forward and reverse round keys in every representation, plus data precomputed by the engines.
+    Instances are picklable, so worker processes can receive them instead of recomputing the schedule.
+    """
+
+    __slots__ = ("key", "round_keys", "round_keys_reverse", "round_keys_binary", "round_keys_binary_reverse", "engine_data")
+
+    def __init__(self, key_hex: str) -> None:
+        """
+        Constructor method that generates the round keys.
+
+        :param key_hex: The key as a 16-character hexadecimal string
+        :raises ValueError: If the key is not a 64-bit hexadecimal string
+        """
+        try:
+            key = int(key_hex, 16)
+        except ValueError:
+            raise ValueError(f"Invalid DES key: {key_hex}")
+        if len(key_hex) != 16:
+            raise ValueError(f"Invalid DES key: {key_hex}")
+
+        self.key = key_hex.upper()
+
+        # Round keys as 48-bit integers
+        self.round_keys = self.generate_round_keys(key)
+        self.round_keys_reverse = self.round_keys[::-1]
+
+        # Round keys as binary strings (as returned by DesCipherHelper.generate_keys)
+        self.round_keys_binary = [format(round_key, "048b") for round_key in self.round_keys]
+        self.round_keys_binary_reverse = self.round_keys_binary[::-1]
+
+        # Data precomputed by the engines for this key
+        self.engine_data = {}
+
+    @staticmethod
+    def generate_round_keys(key: int) -> list:
+        """
+        Generates the round keys for the DES algorithm using integers.
+
+        :param key: The 64-bit key
+        :return: List of round keys as 48-bit integers
+        """
+        # Get 56-bit key from 64-bit using the parity bits
+        key = DesTables.permute(key, const.key_permutation_table, 64)
+
+        # Splitting
+        left_part, right_part = key >> 28, key & 0xFFFFFFF
+
+        round_keys = []
+        for shift in const.key_shift_table:
+            # Left circular shifts of the 28-bit halves
+            left_part = ((left_part << shift) | (left_part >> (28 - shift))) & 0xFFFFFFF
+            right_part = ((right_part << shift) | (right_part >> (28 - shift))) & 0xFFFFFFF
+
+            # Compression of key from 56 to 48 bits
+            round_keys.append(DesTables.permute((left_part << 28) | right_part, const.key_compression_table, 56))
+
+        return round_keys
+
+    def get_engine_data(self, name: str, build: Callable[["DesKeyContext"], Any]) -> Any:
+        """
+        Returns the data precomputed by an engine for this key, building it the first time.
+
+        :param name: The name of the engine
+        :param build: A function that builds the data from the key context
+        :return: The precomputed data
+        """
+        if name not in self.engine_data:
+            self.engine_data[name] = build(self)
+        return self.engine_data[name]
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def get_key_context(key_hex: str) -> DesKeyContext:
+    """
+    Returns the key context of a key, reusing the most recently used ones.
+
+    :param key_hex: The key as a 16-character hexadecimal string
+    :return: The DesKeyContext instance
+    """
+    return DesKeyContext(key_hex)
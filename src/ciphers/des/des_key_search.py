@@ -0,0 +1,285 @@
+import math
+import os
+import time
+from typing import List, Optional, Tuple
+
+from src.ciphers.des.des_cipher_helper import DesCipherHelper
+from src.ciphers.des.des_int_engine import DesIntEngine
+from src.ciphers.des.des_key_context import DesKeyContext, get_key_context
+from src.util.logger import setup_logging
+from src.util.process_pool import imap_bounded
+from src.util.text_util import TextUtil
+
+# Set up the logging configuration
+logger = setup_logging()
+
+# Character used in key patterns for unknown digits
+UNKNOWN_DIGIT = "?"
+
+# Minimum number of seconds between progress reports at INFO level (every task is reported at DEBUG level)
+PROGRESS_INTERVAL = 30.0
+
+
+class DesKeySearch:
+    """
+    Known-plaintext key search over the keys produced by DesCipherHelper._generate_random_key.
+    Those keys are permutations of the 16 hexadecimal digits, so the keyspace is 16! instead of 2^56.
+
+    The key schedule only moves bits around, so the round keys of a key are the XOR of the round keys of each
+    of its digits: they are built incrementally while the permutations are enumerated. Keys that only differ
+    in parity bits have the same schedule, so only one of them is tested.
+    """
+
+    def __init__(self, pairs: List[Tuple[str, str]], pattern: str = UNKNOWN_DIGIT * 16) -> None:
+        """
+        Constructor method that prepares the search.
+
+        :param pairs: List of (plaintext, ciphertext) blocks as 16-character hexadecimal strings
+        :param pattern: The known digits of the key, with "?" for the unknown ones
+        :raises ValueError: If the pairs or the pattern are not valid
+        """
+        if not pairs:
+            raise ValueError("At least one plaintext/ciphertext pair is required")
+        self._pairs = [(int(plaintext, 16), int(ciphertext, 16)) for plaintext, ciphertext in pairs]
+
+        # Known and unknown digits of the key
+        self.pattern = pattern.upper()
+        digits = DesCipherHelper._generate_seed()
+        known_digits = [char for char in self.pattern if char != UNKNOWN_DIGIT]
+        if len(self.pattern) != 16 or len(set(known_digits)) != len(known_digits) or not set(known_digits) <= set(digits):
+            raise ValueError(f"Invalid key pattern: {pattern}")
+        self._free_positions = [position for position, char in enumerate(self.pattern) if char == UNKNOWN_DIGIT]
+        self._free_digits = [int(digit, 16) for digit in digits if digit not in known_digits]
+
+        # Round keys contributed by each digit at each position
+        self._contributions = [[DesKeyContext.generate_round_keys(digit << (60 - 4 * position)) for digit in range(16)]
+                               for position in range(16)]
+
+        # Round keys of the known digits
+        self._base_schedule = [0] * 16
+        for position, char in enumerate(self.pattern):
+            if char != UNKNOWN_DIGIT:
+                self._base_schedule = self._xor(self._base_schedule, self._contributions[position][int(char, 16)])
+
+        # Only the rounds of the engine are used, the key of the context is irrelevant
+        self._engine = DesIntEngine(get_key_context("0" * 16))
+
+    @staticmethod
+    def _xor(schedule: List[int], contribution: List[int]) -> List[int]:
+        """
+        Adds the contribution of a digit to a partial key schedule.
+
+        :param schedule: The partial round keys
+        :param contribution: The round keys of the digit
+        :return: The updated round keys
+        """
+        return [round_key ^ digit_key for round_key, digit_key in zip(schedule, contribution)]
+
+    @property
+    def keyspace(self) -> int:
+        """
+        Number of keys matching the pattern.
+        """
+        return math.factorial(len(self._free_digits))
+
+    def prefixes(self, prefix_length: int) -> List[str]:
+        """
+        Splits the search into the assignments of the first free positions.
+
+        :param prefix_length: The number of free positions assigned by every prefix
+        :return: List of prefixes as hexadecimal strings
+        """
+        prefixes = [""]
+        for _ in range(prefix_length):
+            prefixes = [prefix + format(digit, "X") for prefix in prefixes for digit in self._free_digits
+                        if format(digit, "X") not in prefix]
+        return prefixes
+
+    def _key(self, digits: List[int]) -> str:
+        """
+        Builds the key from the digits of the free positions.
+
+        :param digits: The digits of the free positions, in order
+        :return: The key as a hexadecimal string
+        """
+        key = list(self.pattern)
+        for position, digit in zip(self._free_positions, digits):
+            key[position] = format(digit, "X")
+        return "".join(key)
+
+    def search_prefix(self, prefix: str) -> Tuple[List[str], int]:
+        """
+        Tests all the keys starting with a prefix.
+
+        :param prefix: The digits of the first free positions
+        :return: A tuple with the keys found and the number of keys tested
+        """
+        process_block = self._engine.process_block
+        (plaintext, ciphertext), other_pairs = self._pairs[0], self._pairs[1:]
+        free_positions = self._free_positions
+        contributions = self._contributions
+        found = []
+        tested = 0
+
+        # Digits placed at odd positions (whose last bit is a parity bit), only free digits are interchangeable
+        placed = [int(digit, 16) for digit in prefix]
+        schedule = self._base_schedule
+        for position, digit in zip(free_positions, placed):
+            schedule = self._xor(schedule, contributions[position][digit])
+        odd_placed = {digit for position, digit in zip(free_positions, placed) if position % 2}
+        remaining = [digit for digit in self._free_digits if digit not in placed]
+
+        def search(depth: int, schedule: List[int], remaining: List[int]) -> None:
+            nonlocal tested
+            if not remaining:
+                tested += 1
+                # Early rejection: the other pairs are only checked when the first one matches
+                if process_block(plaintext, schedule) == ciphertext and all(
+                        process_block(other_plaintext, schedule) == other_ciphertext
+                        for other_plaintext, other_ciphertext in other_pairs):
+                    found.append(self._key(placed))
+                return
+
+            position = free_positions[depth]
+            for digit in remaining:
+                # Keys with the odd digit of a pair placed first are equivalent to the ones with the even digit first
+                if position % 2 and not digit % 2 and digit ^ 1 in odd_placed:
+                    continue
+                if position % 2:
+                    odd_placed.add(digit)
+                placed.append(digit)
+                search(depth + 1, self._xor(schedule, contributions[position][digit]),
+                       [other for other in remaining if other != digit])
+                placed.pop()
+                if position % 2:
+                    odd_placed.discard(digit)
+
+        search(len(prefix), schedule, remaining)
+        return found, tested
+
+    def _default_prefix_length(self, workers: int) -> int:
+        """
+        Gets a prefix length that gives every worker many tasks (for load balancing and checkpoints).
+
+        :param workers: The number of worker processes
+        :return: The prefix length
+        """
+        prefix_length, tasks = 0, 1
+        while tasks < 64 * workers and prefix_length < len(self._free_digits) - 1:
+            tasks *= len(self._free_digits) - prefix_length
+            prefix_length += 1
+        return prefix_length
+
+    def _load_checkpoint(self, checkpoint_path: Optional[str]) -> dict:
+        """
+        Loads the progress of a previous run of the same search.
+
+        :param checkpoint_path: The path of the checkpoint file
+        :return: The checkpoint data
+        :raises ValueError: If the checkpoint belongs to another search
+        """
+        checkpoint = {"pattern": self.pattern, "pairs": [[format(plaintext, "016X"), format(ciphertext, "016X")]
+                                                         for plaintext, ciphertext in self._pairs],
+                      "prefix_length": None, "completed": [], "tested": 0, "found": []}
+        if checkpoint_path and os.path.isfile(checkpoint_path):
+            previous = TextUtil().read_json_from_file(filename=checkpoint_path)
+            if previous["pattern"] != checkpoint["pattern"] or previous["pairs"] != checkpoint["pairs"]:
+                raise ValueError(f"Checkpoint {checkpoint_path} belongs to another search")
+            checkpoint = previous
+            logger.info(f"Resuming from {checkpoint_path}: {len(checkpoint['completed'])} prefixes completed")
+        return checkpoint
+
+    @staticmethod
+    def _save_checkpoint(checkpoint_path: Optional[str], checkpoint: dict) -> None:
+        """
+        Saves the progress of the search, replacing the previous checkpoint atomically.
+
+        :param checkpoint_path: The path of the checkpoint file
+        :param checkpoint: The checkpoint data
+        """
+        if checkpoint_path:
+            TextUtil().write_json_to_file(filename=f"{checkpoint_path}.tmp", data=checkpoint)
+            os.replace(f"{checkpoint_path}.tmp", checkpoint_path)
+
+    def run(self, workers: int = os.cpu_count() or 1, prefix_length: Optional[int] = None,
+            checkpoint_path: Optional[str] = None, stop_on_first: bool = True) -> List[str]:
+        """
+        Runs the search across a pool of worker processes.
+
+        :param workers: The number of worker processes
+        :param prefix_length: The number of free positions assigned by every task (the one of the checkpoint when
+        resuming, or chosen automatically if not provided)
+        :param checkpoint_path: The path of the JSON file used to save and resume the progress
+        :param stop_on_first: Whether to stop as soon as a key is found
+        :return: The keys found (equivalent keys that only differ in parity bits are not listed)
+        :raises ValueError: If the checkpoint belongs to another search or uses another prefix length
+        """
+        # The completed prefixes of a checkpoint only match the tasks of the same prefix length
+        checkpoint = self._load_checkpoint(checkpoint_path)
+        saved_prefix_length = checkpoint.get("prefix_length")
+        if prefix_length is None:
+            prefix_length = self._default_prefix_length(workers) if saved_prefix_length is None else saved_prefix_length
+        elif saved_prefix_length is not None and prefix_length != saved_prefix_length:
+            raise ValueError(f"Checkpoint {checkpoint_path} uses prefixes of length {saved_prefix_length}, not {prefix_length}")
+        checkpoint["prefix_length"] = prefix_length
+        completed = set(checkpoint["completed"])
+        prefixes = [prefix for prefix in self.prefixes(prefix_length) if prefix not in completed]
+        if checkpoint["found"] and stop_on_first:
+            logger.info(f"Key found: {', '.join(checkpoint['found'])}")
+            return checkpoint["found"]
+
+        logger.info(f"Keyspace: {self.keyspace:,} keys, {len(prefixes)} tasks pending, {workers} workers")
+        start = time.perf_counter()
+        last_report = start
+        tested = 0
+        progress = None
+        # Bounded number of tasks in flight, so stopping does not wait for all of them
+        tasks = ((prefix,) for prefix in prefixes)
+        for done in imap_bounded(DesKeySearch.search_prefix, tasks, workers, self):
+            for (prefix,), (found, prefix_tested) in done:
+                tested += prefix_tested
+                checkpoint["tested"] += prefix_tested
+                checkpoint["completed"].append(prefix)
+                checkpoint["found"].extend(found)
+                for key in found:
+                    logger.info(f"Key found: {key}")
+
+            # Progress and throughput, throttled so long searches do not flood the output
+            now = time.perf_counter()
+            progress = (f"{len(checkpoint['completed'])}/{len(completed) + len(prefixes)} tasks, "
+                        f"{checkpoint['tested']:,} keys tested, {tested / (now - start):,.0f} keys/s")
+            if now - last_report >= PROGRESS_INTERVAL:
+                logger.info(progress)
+                last_report = now
+            else:
+                logger.debug(progress)
+            self._save_checkpoint(checkpoint_path, checkpoint)
+
+            if checkpoint["found"] and stop_on_first:
+                break
+
+        if progress is not None:
+            logger.info(progress)
+        return checkpoint["found"]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description="Recover a DesCipher key from known plaintext/ciphertext blocks.")
+    parser.add_argument("--plaintext", help="Known plaintext blocks (16 hex digits each).", nargs="+", required=True)
+    parser.add_argument("--ciphertext", help="Ciphertext blocks matching the plaintext blocks.", nargs="+", required=True)
+    parser.add_argument("--pattern", help="Known digits of the key, with '?' for unknown ones.", default=UNKNOWN_DIGIT * 16)
+    parser.add_argument("--workers", help="Number of worker processes.", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--prefix_length", help="Number of key digits assigned per task.", type=int)
+    parser.add_argument("--checkpoint", help="Path to the JSON file used to save and resume the progress.")
+    args = parser.parse_args()
+
+    if len(args.plaintext) != len(args.ciphertext):
+        parser.error("--plaintext and --ciphertext must have the same number of blocks")
+
+    key_search = DesKeySearch(pairs=list(zip(args.plaintext, args.ciphertext)), pattern=args.pattern)
+    keys = key_search.run(workers=args.workers, prefix_length=args.prefix_length, checkpoint_path=args.checkpoint)
+    if not keys:
+        logger.warning("No key found")
@@ -0,0 +1,268 @@
+from abc import ABC, abstractmethod
+from enum import Enum
+from functools import partial
+
+import numpy as np
+
+from src.util.process_pool import map_tasks
+
+# Minimum number of blocks handled by each worker process, smaller inputs are processed in place
+MIN_BLOCKS_PER_WORKER = 1 << 14
+
+
+class DesMode(Enum):
+    ecb = 1
+    cbc = 2
+    ctr = 3
+    ofb = 4
+
+
+def des_mode_type(mode_str: str) -> DesMode:
+    """
+    Converts a string into a DesMode enum member.
+
+    :param mode_str: The string representation of the DesMode enum.
+    :return: The corresponding DesMode enum member.
+    :raises: ValueError if an invalid DesMode value is provided.
+    """
+    try:
+        return DesMode[mode_str]
+    except KeyError:
+        raise ValueError(f"Invalid DesMode value: {mode_str}")
+
+
+def _process_chunk(cipher, blocks: np.ndarray, decrypt: bool) -> np.ndarray:
+    """
+    Encrypts or decrypts a chunk of blocks in a worker process.
+
+    :param cipher: The block cipher of the worker process
+    :param blocks: Array of uint64 blocks
+    :param decrypt: Whether to decrypt instead of encrypt
+    :return: Array with the processed blocks
+    """
+    if decrypt:
+        return cipher.decipher_blocks(blocks)
+    return cipher.cipher_blocks(blocks)
+
+
+def process_blocks_parallel(cipher, blocks: np.ndarray, decrypt: bool = False, workers: int = 1) -> np.ndarray:
+    """
+    Encrypts or decrypts independent blocks (ECB), splitting the range across worker processes.
+    The chunks are reassembled in order.
+
+    :param cipher: The block cipher (e.g. DesCipher)
+    :param blocks: Array of uint64 blocks
+    :param decrypt: Whether to decrypt instead of encrypt
+    :param workers: The number of worker processes
+    :return: Array with the processed blocks
+    """
+    workers = min(workers, len(blocks) // MIN_BLOCKS_PER_WORKER)
+    if workers <= 1:
+        return cipher.decipher_blocks(blocks) if decrypt else cipher.cipher_blocks(blocks)
+
+    tasks = [(chunk, decrypt) for chunk in np.array_split(blocks, workers)]
+    return np.concatenate(map_tasks(_process_chunk, tasks, workers, cipher))
+
+
+class BlockMode(ABC):
+    """
+    Base class of the block cipher modes of operation.
+    Modes keep their chaining state between calls, so a message can be processed in consecutive parts.
+    """
+
+    # Whether the mode turns the block cipher into a stream cipher (no padding required)
+    is_stream = False
+
+    def __init__(self, cipher, iv: int = 0, workers: int = 1) -> None:
+        """
+        Constructor method that initializes the mode.
+
+        :param cipher: The block cipher (e.g. DesCipher)
+        :param iv: The initialization vector (or the initial counter for CTR) as a 64-bit integer
+        :param workers: The number of worker processes for the parallelizable operations
+        """
+        self._cipher = cipher
+        self._state = iv
+        self._workers = workers
+
+    @abstractmethod
+    def encrypt(self, blocks: np.ndarray) -> np.ndarray:
+        """
+        Encrypts the next blocks of the message.
+
+        :param blocks: Array of uint64 plaintext blocks
+        :return: Array of uint64 ciphertext blocks
+        """
+
+    @abstractmethod
+    def decrypt(self, blocks: np.ndarray) -> np.ndarray:
+        """
+        Decrypts the next blocks of the message.
+
+        :param blocks: Array of uint64 ciphertext blocks
+        :return: Array of uint64 plaintext blocks
+        """
+
+
+class EcbMode(BlockMode):
+    """
+    Electronic Codebook: every block is processed independently.
+    If the cipher has a block cache, repeated blocks are only processed once.
+    """
+
+    def _process(self, blocks: np.ndarray, decrypt: bool) -> np.ndarray:
+        """
+        Processes independent blocks, through the block cache of the cipher when it has one.
+
+        :param blocks: Array of uint64 blocks
+        :param decrypt: Whether to decrypt instead of encrypt
+        :return: Array with the processed blocks
+        """
+        process = partial(process_blocks_parallel, self._cipher, decrypt=decrypt, workers=self._workers)
+        block_cache = getattr(self._cipher, "block_cache", None)
+        if block_cache is None:
+            return process(blocks)
+        return block_cache.process_blocks(blocks, process, decrypt=decrypt)
+
+    def encrypt(self, blocks: np.ndarray) -> np.ndarray:
+        """
+        Encrypts the next blocks of the message.
+
+        :param blocks: Array of uint64 plaintext blocks
+        :return: Array of uint64 ciphertext blocks
+        """
+        return self._process(blocks, decrypt=False)
+
+    def decrypt(self, blocks: np.ndarray) -> np.ndarray:
+        """
+        Decrypts the next blocks of the message.
+
+        :param blocks: Array of uint64 ciphertext blocks
+        :return: Array of uint64 plaintext blocks
+        """
+        return self._process(blocks, decrypt=True)
+
+
+class CbcMode(BlockMode):
+    """
+    Cipher Block Chaining: every plaintext block is XORed with the previous ciphertext block.
+    Encryption is sequential, decryption is parallel.
+    """
+
+    def encrypt(self, blocks: np.ndarray) -> np.ndarray:
+        """
+        Encrypts the next blocks of the message.
+
+        :param blocks: Array of uint64 plaintext blocks
+        :return: Array of uint64 ciphertext blocks
+        """
+        result = []
+        previous = self._state
+        for block in blocks.tolist():
+            previous = self._cipher.cipher_int_block(block ^ previous)
+            result.append(previous)
+        self._state = previous
+        return np.array(result, dtype=np.uint64)
+
+    def decrypt(self, blocks: np.ndarray) -> np.ndarray:
+        """
+        Decrypts the next blocks of the message.
+
+        :param blocks: Array of uint64 ciphertext blocks
+        :return: Array of uint64 plaintext blocks
+        """
+        if not len(blocks):
+            return np.empty(0, dtype=np.uint64)
+        previous = np.concatenate((np.array([self._state], dtype=np.uint64), blocks[:-1]))
+        result = process_blocks_parallel(self._cipher, blocks, decrypt=True, workers=self._workers) ^ previous
+        self._state = int(blocks[-1])
+        return result
+
+
+class CtrMode(BlockMode):
+    """
+    Counter: the blocks are XORed with the encryption of consecutive counter values.
+    Encryption and decryption are the same parallel operation.
+    """
+
+    is_stream = True
+
+    def keystream(self, num_blocks: int) -> np.ndarray:
+        """
+        Generates the next keystream blocks and advances the counter.
+
+        :param num_blocks: The number of blocks
+        :return: Array of uint64 keystream blocks
+        """
+        counters = np.arange(num_blocks, dtype=np.uint64) + np.uint64(self._state)
+        self._state = (self._state + num_blocks) & 0xFFFFFFFFFFFFFFFF
+        return process_blocks_parallel(self._cipher, counters, workers=self._workers)
+
+    def encrypt(self, blocks: np.ndarray) -> np.ndarray:
+        """
+        Encrypts the next blocks of the message.
+
+        :param blocks: Array of uint64 plaintext blocks
+        :return: Array of uint64 ciphertext blocks
+        """
+        return blocks ^ self.keystream(len(blocks))
+
+    def decrypt(self, blocks: np.ndarray) -> np.ndarray:
+        """
+        Decrypts the next blocks of the message.
+
+        :param blocks: Array of uint64 ciphertext blocks
+        :return: Array of uint64 plaintext blocks
+        """
+        return blocks ^ self.keystream(len(blocks))
+
+
+class OfbMode(BlockMode):
+    """
+    Output Feedback: the blocks are XORed with the repeated encryption of the IV.
+    Encryption and decryption are the same sequential operation.
+    """
+
+    is_stream = True
+
+    def keystream(self, num_blocks: int) -> np.ndarray:
+        """
+        Generates the next keystream blocks.
+
+        :param num_blocks: The number of blocks
+        :return: Array of uint64 keystream blocks
+        """
+        result = []
+        register = self._state
+        for _ in range(num_blocks):
+            register = self._cipher.cipher_int_block(register)
+            result.append(register)
+        self._state = register
+        return np.array(result, dtype=np.uint64)
+
+    def encrypt(self, blocks: np.ndarray) -> np.ndarray:
+        """
+        Encrypts the next blocks of the message.
+
+        :param blocks: Array of uint64 plaintext blocks
+        :return: Array of uint64 ciphertext blocks
+        """
+        return blocks ^ self.keystream(len(blocks))
+
+    def decrypt(self, blocks: np.ndarray) -> np.ndarray:
+        """
+        Decrypts the next blocks of the message.
+
+        :param blocks: Array of uint64 ciphertext blocks
+        :return: Array of uint64 plaintext blocks
+        """
+        return blocks ^ self.keystream(len(blocks))
+
+
+# Implementation of every mode
+MODES = {
+    DesMode.ecb: EcbMode,
+    DesMode.cbc: CbcMode,
+    DesMode.ctr: CtrMode,
+    DesMode.ofb: OfbMode,
+}
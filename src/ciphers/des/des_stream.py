@@ -0,0 +1,183 @@
+import mmap
+import os
+import secrets
+from typing import BinaryIO, Iterable, Iterator, Optional, Union
+
+import numpy as np
+
+from src.ciphers.des.des_cipher_helper import DesCipherHelper
+from src.ciphers.des.des_modes import MODES, DesMode
+from src.util.text_util import TextUtil
+
+# Default number of bytes read from the input on every step
+CHUNK_SIZE = 1 << 20
+
+
+class DesStream:
+    """
+    Incremental DES encryption/decryption of data given in chunks of any size.
+    Only the bytes of an incomplete block (and the last block when removing the padding) are kept between
+    chunks, together with the state of the mode of operation, so the memory does not depend on the input size.
+    """
+
+    def __init__(self, cipher, mode: DesMode = DesMode.ecb, iv: Optional[int] = None, decrypt: bool = False,
+                 workers: int = 1, pad: bool = True, header: bool = True) -> None:
+        """
+        Constructor method that initializes the stream.
+
+        :param cipher: The block cipher (e.g. DesCipher)
+        :param mode: The mode of operation
+        :param iv: The 64-bit IV for encryption, a random one is used if not provided (ignored in ECB and when decrypting
+        with a header)
+        :param decrypt: Whether to decrypt instead of encrypt
+        :param workers: The number of worker processes for the parallelizable modes
+        :param pad: Whether ECB and CBC use PKCS#7 padding, otherwise a trailing incomplete block is copied unchanged
+        :param header: Whether the IV is written before the ciphertext (otherwise it must be given to decrypt)
+        :raises ValueError: If the IV is required and not provided
+        """
+        self._cipher = cipher
+        self._decrypt = decrypt
+        self._workers = workers
+        self._mode_class = MODES[mode]
+        self._padded = pad and not self._mode_class.is_stream
+        self._pending = b""
+        self._block_mode = None
+        self._header = b""
+
+        # The IV travels before the ciphertext in every mode but ECB (unless the header is disabled)
+        if mode == DesMode.ecb:
+            self._block_mode = self._mode_class(cipher, 0, workers)
+        elif not decrypt or not header:
+            if iv is None and decrypt:
+                raise ValueError("The IV is required to decrypt without header")
+            iv = secrets.randbits(64) if iv is None else iv
+            self._header = iv.to_bytes(8, "big") if header else b""
+            self._block_mode = self._mode_class(cipher, iv, workers)
+
+    def _process(self, blocks: np.ndarray) -> bytes:
+        """
+        Encrypts or decrypts full blocks with the mode of operation.
+
+        :param blocks: Array of uint64 blocks
+        :return: The processed blocks as bytes
+        """
+        if self._decrypt:
+            return DesCipherHelper.uint64_blocks_to_bytes(self._block_mode.decrypt(blocks))
+        return DesCipherHelper.uint64_blocks_to_bytes(self._block_mode.encrypt(blocks))
+
+    def update(self, chunk: Union[bytes, bytearray, memoryview]) -> bytes:
+        """
+        Processes the next chunk of the input.
+
+        :param chunk: The next bytes of the input
+        :return: The output available so far
+        """
+        chunk = memoryview(chunk).cast("B")
+        output, self._header = self._header, b""
+
+        # Read the IV before the ciphertext
+        if self._block_mode is None:
+            missing = 8 - len(self._pending)
+            self._pending += bytes(chunk[:missing])
+            chunk = chunk[missing:]
+            if len(self._pending) < 8:
+                return output
+            self._block_mode = self._mode_class(self._cipher, int.from_bytes(self._pending, "big"), self._workers)
+            self._pending = b""
+
+        # Complete the pending block with the start of the chunk
+        missing = -len(self._pending) % 8
+        head = self._pending + bytes(chunk[:missing])
+        body = chunk[missing:]
+        if len(head) % 8:
+            self._pending = head
+            return output
+
+        # Full blocks of the body are read in place, an incomplete one is kept for the next chunk
+        full_length = len(body) - len(body) % 8
+        self._pending = bytes(body[full_length:])
+        blocks = np.concatenate((DesCipherHelper.bytes_to_uint64_blocks(head),
+                                 DesCipherHelper.bytes_to_uint64_blocks(body[:full_length])))
+
+        # The last block can hold the padding, so it waits until the end of the input
+        if self._decrypt and self._padded and not self._pending and len(blocks):
+            self._pending = DesCipherHelper.uint64_blocks_to_bytes(blocks[-1:])
+            blocks = blocks[:-1]
+
+        return output + self._process(blocks)
+
+    def finalize(self) -> bytes:
+        """
+        Processes the remaining bytes at the end of the input.
+
+        :return: The last bytes of the output
+        :raises ValueError: If the input is not a valid ciphertext
+        """
+        output, self._header = self._header, b""
+        pending, self._pending = self._pending, b""
+        if self._block_mode is None:
+            raise ValueError("Ciphertext is missing the IV")
+
+        if self._padded and self._decrypt:
+            if len(pending) != 8:
+                raise ValueError("Ciphertext length must be a non-zero multiple of 8 bytes")
+            return output + DesCipherHelper.unpad_bytes(self._process(DesCipherHelper.bytes_to_uint64_blocks(pending)))
+        if self._padded:
+            return output + self._process(DesCipherHelper.bytes_to_uint64_blocks(DesCipherHelper.pad_bytes(pending)))
+        if pending and self._mode_class.is_stream:
+            last_block = DesCipherHelper.bytes_to_uint64_blocks(pending.ljust(8, b"\x00"))
+            return output + self._process(last_block)[:len(pending)]
+        return output + pending
+
+    def process_chunks(self, chunks: Iterable[Union[bytes, bytearray, memoryview]]) -> Iterator[bytes]:
+        """
+        Processes an iterable of input chunks, yielding the output as it becomes available.
+
+        :param chunks: The chunks of the input
+        :return: A generator of output chunks
+        """
+        for chunk in chunks:
+            output = self.update(chunk)
+            if output:
+                yield output
+        output = self.finalize()
+        if output:
+            yield output
+
+    def process_stream(self, reader: BinaryIO, writer: BinaryIO, chunk_size: int = CHUNK_SIZE) -> None:
+        """
+        Reads the whole input from a file-like object and writes the output to another one.
+
+        :param reader: The binary file-like object to read from
+        :param writer: The binary file-like object to write to
+        :param chunk_size: The number of bytes read on every step
+        """
+        chunks = iter(lambda: reader.read(chunk_size), b"")
+        for output in self.process_chunks(chunks):
+            writer.write(output)
+
+    def process_file(self, input_path: str, output_path: str, chunk_size: int = CHUNK_SIZE) -> None:
+        """
+        Processes a file through a read-only memory map and writes the output to another file.
+
+        :param input_path: The path of the input file
+        :param output_path: The path of the output file
+        :param chunk_size: The number of bytes processed on every step
+        """
+        TextUtil()._create_directory_if_not_exists(output_path)
+
+        with open(input_path, "rb") as reader, open(output_path, "wb") as writer:
+            # Empty files can not be memory mapped
+            if os.fstat(reader.fileno()).st_size == 0:
+                self.process_stream(reader, writer, chunk_size)
+                return
+
+            with mmap.mmap(reader.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                # Chunks start at page boundaries, so processed pages can be dropped from memory
+                chunk_size = max(mmap.PAGESIZE, chunk_size - chunk_size % mmap.PAGESIZE)
+                for start in range(0, len(mapped), chunk_size):
+                    with memoryview(mapped)[start:start + chunk_size] as chunk:
+                        writer.write(self.update(chunk))
+                    if hasattr(mmap, "MADV_DONTNEED"):
+                        mapped.madvise(mmap.MADV_DONTNEED, start, min(chunk_size, len(mapped) - start))
+                writer.write(self.finalize())
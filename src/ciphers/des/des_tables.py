@@ -0,0 +1,95 @@
+import threading
+from typing import List, Optional, Tuple
+
+from src.ciphers.des import const
+
+# Tables shared by every DES instance, built on first use
+_TABLES = None
+_TABLES_LOCK = threading.Lock()
+
+
+class DesTables:
+    """
+    Precomputed lookup tables derived from the DES constants.
+    Permutations are split into byte-indexed tables and every S-box is fused with the straight permutation.
+    """
+
+    def __init__(self) -> None:
+        """
+        Constructor method that builds all the lookup tables.
+        """
+        # Initial and Final Permutation: 8 tables of 256 entries (one per input byte) with 64-bit outputs
+        self.initial_permutation = self.byte_tables(const.initial_permutation_table, 64)
+        self.final_permutation = self.byte_tables(const.final_permutation_table, 64)
+
+        # Expansion D-box: 4 tables of 256 entries (one per input byte) with 48-bit outputs
+        self.expansion = self.byte_tables(const.expansion_d_box_table, 32)
+
+        # S-box followed by Straight Permutation: 8 tables of 64 entries with 32-bit outputs
+        self.sp = self.sp_tables()
+
+    @staticmethod
+    def permute(value: int, table: List[int], width: int) -> int:
+        """
+        Permutes the bits of an integer based on the specified arrangement.
+
+        :param value: The input value
+        :param table: The arrangement table for permutation (1-based, bit 1 is the most significant bit)
+        :param width: The number of bits of the input value
+        :return: The permuted value
+        """
+        result = 0
+        for position in table:
+            result = (result << 1) | ((value >> (width - position)) & 1)
+        return result
+
+    @staticmethod
+    def byte_tables(table: List[int], width: int) -> Tuple[Tuple[int, ...], ...]:
+        """
+        Splits a permutation into one lookup table per input byte.
+        The permutation of a value is the OR of the lookups of each of its bytes.
+
+        :param table: The arrangement table for permutation
+        :param width: The number of bits of the input value (multiple of 8)
+        :return: A tuple with a 256-entry table for each input byte, most significant byte first
+        """
+        return tuple(
+            tuple(DesTables.permute(byte << (width - 8 * (byte_num + 1)), table, width) for byte in range(256))
+            for byte_num in range(width // 8)
+        )
+
+    @staticmethod
+    def sp_tables() -> Tuple[Tuple[int, ...], ...]:
+        """
+        Fuses each S-box with the straight permutation.
+        Entries are indexed by the raw 6-bit S-box input, so the row/column split is already applied.
+
+        :return: A tuple with a 64-entry table for each S-box
+        """
+        tables = []
+        for box_num, s_box in enumerate(const.s_box_table):
+            table = []
+            for chunk in range(64):
+                row = ((chunk >> 4) & 0b10) | (chunk & 1)
+                column = (chunk >> 1) & 0xF
+                sbox_result = s_box[row][column] << (28 - 4 * box_num)
+                table.append(DesTables.permute(sbox_result, const.straight_permutation_table, 32))
+            tables.append(tuple(table))
+        return tuple(tables)
+
+
+def get_des_tables() -> DesTables:
+    """
+    Returns the shared DES lookup tables, building them the first time they are requested.
+
+    :return: The DesTables instance
+    """
+    global _TABLES
+    tables: Optional[DesTables] = _TABLES
+    if tables is None:
+        # Use a lock to ensure the tables are only built once
+        with _TABLES_LOCK:
+            if _TABLES is None:
+                _TABLES = DesTables()
+            tables = _TABLES
+    return tables
@@ -0,0 +1,147 @@
+from typing import Optional
+
+import numpy as np
+
+from src.ciphers.des.des_cipher import DesCipher
+from src.ciphers.des.des_cipher_helper import DesCipherHelper
+from src.ciphers.des.des_key_context import get_key_context
+
+
+class TripleDesCipher(DesCipher):
+    """
+    This class represents the Triple DES algorithm (EDE): encrypt with K1, decrypt with K2, encrypt with K3.
+    The three stages share a single initial and final permutation, since the inner ones cancel each other.
+    Block, batch, bytes, modes and streaming APIs are inherited from DesCipher.
+    """
+
+    def __init__(self, engine: str = "int", batch_engine: str = "numpy", key: Optional[str] = None,
+                 num_keys: int = 3, block_cache_size: int = 0) -> None:
+        """
+        Constructor method that initializes the three DES keys.
+
+        :param engine: The DES core used to process single blocks ("string" or "int")
+        :param batch_engine: The DES core used to process arrays of blocks ("numpy" or "bitslice")
+        :param key: The key as a 32 (2-key, K3 = K1) or 48 (3-key) character hexadecimal string
+        (random keys are generated if not provided)
+        :param num_keys: The number of independent keys (2 or 3) when a random key is generated
+        :param block_cache_size: The number of blocks remembered by the ECB/single-block cache (0 disables it)
+        :raises ValueError: If the engine, the batch engine or the key is not supported
+        """
+        if key is None:
+            if num_keys not in (2, 3):
+                raise ValueError(f"Invalid number of Triple DES keys: {num_keys}")
+            seed = DesCipherHelper._generate_seed()
+            key = "".join(DesCipherHelper._generate_random_key(seed) for _ in range(num_keys))
+        if len(key) not in (32, 48):
+            raise ValueError(f"Invalid Triple DES key: {key}")
+
+        # Split the key: 2-key Triple DES uses K1 for the last stage
+        keys = [key[start:start + 16].upper() for start in range(0, len(key), 16)]
+        if len(keys) == 2:
+            keys.append(keys[0])
+
+        # The first key sets up the engines of the DesCipher
+        super().__init__(engine=engine, batch_engine=batch_engine, key=keys[0], block_cache_size=block_cache_size)
+        self._key = key.upper()
+        self._key_contexts = [get_key_context(stage_key) for stage_key in keys]
+
+        # One engine per key, the first one runs the three stages
+        engines = [self._engine] + [self.ENGINES[engine](context) if self.ENGINES[engine] else None
+                                    for context in self._key_contexts[1:]]
+        batch_engines = [self._batch_engine] + [self.BATCH_ENGINES[batch_engine](context)
+                                                for context in self._key_contexts[1:]]
+
+        # Encryption is E(K1), D(K2), E(K3), decryption is D(K3), E(K2), D(K1)
+        self._schedules = None
+        if self._engine is not None:
+            self._schedules = self._ede_schedules(engines)
+        self._batch_schedules = self._ede_schedules(batch_engines)
+
+    @staticmethod
+    def _ede_schedules(engines: list) -> tuple:
+        """
+        Gets the schedules of the three stages for encryption and decryption.
+
+        :param engines: The engines of K1, K2 and K3
+        :return: A tuple with the encryption and decryption schedules
+        """
+        first, second, third = engines
+        encrypt = (first.schedule(), second.schedule(decrypt=True), third.schedule())
+        decrypt = (third.schedule(decrypt=True), second.schedule(), first.schedule(decrypt=True))
+        return encrypt, decrypt
+
+    def cipher_block(self, plaintext_hex: str) -> str:
+        """
+        Encrypts the given plaintext using the Triple DES algorithm.
+
+        :param plaintext_hex: The input plaintext as a hexadecimal string
+        :return: The encrypted ciphertext as a hexadecimal string
+        """
+        if self._engine is not None and self.block_cache is not None:
+            return format(self.block_cache.process_block(int(plaintext_hex, 16), self.cipher_int_block), "016X")
+        if self._engine is not None:
+            return format(self.cipher_int_block(int(plaintext_hex, 16)), "016X")
+
+        # Reference implementation: three complete DES operations
+        first, second, third = self._key_contexts
+        block = self._process_block(plaintext_hex, first.round_keys_binary)
+        block = self._process_block(block, second.round_keys_binary_reverse)
+        return self._process_block(block, third.round_keys_binary)
+
+    def decipher_block(self, cipher_text: str) -> str:
+        """
+        Decrypts the given ciphertext using the Triple DES algorithm.
+
+        :param cipher_text: The input ciphertext as a hexadecimal string
+        :return: The decrypted plaintext as a hexadecimal string
+        """
+        if self._engine is not None and self.block_cache is not None:
+            return format(self.block_cache.process_block(int(cipher_text, 16), self.decipher_int_block, decrypt=True), "016X")
+        if self._engine is not None:
+            return format(self.decipher_int_block(int(cipher_text, 16)), "016X")
+
+        # Reference implementation: three complete DES operations
+        first, second, third = self._key_contexts
+        block = self._process_block(cipher_text, third.round_keys_binary_reverse)
+        block = self._process_block(block, second.round_keys_binary)
+        return self._process_block(block, first.round_keys_binary_reverse)
+
+    def cipher_int_block(self, block: int) -> int:
+        """
+        Encrypts a single 64-bit block given as an integer.
+
+        :param block: The plaintext block as an integer
+        :return: The ciphertext block as an integer
+        """
+        if self._engine is not None:
+            return self._engine.process_block(block, *self._schedules[0])
+        return int(self.cipher_block(format(block, "016X")), 16)
+
+    def decipher_int_block(self, block: int) -> int:
+        """
+        Decrypts a single 64-bit block given as an integer.
+
+        :param block: The ciphertext block as an integer
+        :return: The plaintext block as an integer
+        """
+        if self._engine is not None:
+            return self._engine.process_block(block, *self._schedules[1])
+        return int(self.decipher_block(format(block, "016X")), 16)
+
+    def cipher_blocks(self, blocks: np.ndarray) -> np.ndarray:
+        """
+        Encrypts an array of 64-bit blocks (ECB) using the batch engine.
+
+        :param blocks: The plaintext blocks as a uint64 NumPy array
+        :return: The ciphertext blocks as a uint64 NumPy array
+        """
+        return self._batch_engine.process_blocks(blocks, *self._batch_schedules[0])
+
+    def decipher_blocks(self, blocks: np.ndarray) -> np.ndarray:
+        """
+        Decrypts an array of 64-bit blocks (ECB) using the batch engine.
+
+        :param blocks: The ciphertext blocks as a uint64 NumPy array
+        :return: The plaintext blocks as a uint64 NumPy array
+        """
+        return self._batch_engine.process_blocks(blocks, *self._batch_schedules[1])
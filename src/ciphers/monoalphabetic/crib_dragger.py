@@ -0,0 +1,124 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from src.ciphers.monoalphabetic.ngram_model import ALPHABET, encode_text
+
+# Number of offsets checked at once, which bounds the memory of the temporary arrays
+CHUNK_OFFSETS = 1 << 16
+
+
+class CribDragger:
+    """
+    Known-plaintext attack on monoalphabetic substitution ciphers: a crib (a phrase known to be in the plain text) is
+    slid across the ciphertext, and the offsets where a substitution can turn the ciphertext into the crib are found
+    at once with NumPy. At a valid offset, equal crib symbols are ciphered by equal symbols and different crib symbols
+    by different ones, the characters out of the alphabet are unchanged, and the key agrees with the known replacements.
+    """
+
+    def __init__(self, ciphered_content: str, alphabet: str = ALPHABET) -> None:
+        """
+        Constructor method that encodes the ciphertext.
+
+        :param ciphered_content: The ciphered content as a string.
+        :param alphabet: The symbols of the alphabet.
+        """
+        self.alphabet = alphabet
+        self._ciphered_content = ciphered_content
+        self._code_points = np.frombuffer(ciphered_content.encode("utf-32-le"), dtype=np.uint32)
+        self._codes = encode_text(ciphered_content, alphabet)
+
+    def _replacements_to_arrays(self, replacements: Optional[Dict[str, str]]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Converts known replacements into lookup arrays.
+
+        :param replacements: The known replacements (ciphered character -> deciphered character).
+        :return: The deciphered symbol of every ciphered symbol and the ciphered symbol of every deciphered symbol
+        (-1 if unknown).
+        """
+        key = np.full(len(self.alphabet), -1, dtype=np.int64)
+        inverse = np.full(len(self.alphabet), -1, dtype=np.int64)
+        for cipher_char, plain_char in (replacements or {}).items():
+            if cipher_char in self.alphabet and plain_char in self.alphabet:
+                key[self.alphabet.index(cipher_char)] = self.alphabet.index(plain_char)
+                inverse[self.alphabet.index(plain_char)] = self.alphabet.index(cipher_char)
+        return key, inverse
+
+    def drag(self, crib: str, replacements: Optional[Dict[str, str]] = None) -> np.ndarray:
+        """
+        Finds the offsets of the ciphertext where the crib can be.
+
+        :param crib: The known plain text.
+        :param replacements: The known replacements the key must agree with (optional).
+        :return: An array with the valid offsets, in characters.
+        :raises ValueError: If the crib has no symbols of the alphabet
+        """
+        crib_codes = encode_text(crib, self.alphabet).astype(np.int64)
+        symbols = np.flatnonzero(crib_codes >= 0)
+        others = np.flatnonzero(crib_codes < 0)
+        if not len(symbols):
+            raise ValueError(f"Invalid crib: {crib!r}")
+        if len(crib) > len(self._codes):
+            return np.empty(0, dtype=np.int64)
+
+        # Position of the first occurrence of every crib symbol, and number of different symbols
+        crib_symbols = crib_codes[symbols]
+        _, first_index, inverse_index = np.unique(crib_symbols, return_index=True, return_inverse=True)
+        first = first_index[inverse_index]
+        num_distinct = len(first_index)
+        crib_code_points = np.frombuffer(crib.encode("utf-32-le"), dtype=np.uint32)[others]
+        key, inverse = self._replacements_to_arrays(replacements)
+
+        # The windows are views of the ciphertext, only the positions of a chunk of offsets are copied at a time
+        windows = sliding_window_view(self._codes, len(crib))
+        code_point_windows = sliding_window_view(self._code_points, len(crib))
+        offsets = []
+        for start in range(0, len(windows), CHUNK_OFFSETS):
+            chunk = windows[start:start + CHUNK_OFFSETS][:, symbols]
+
+            # Characters out of the alphabet are not substituted
+            valid = (chunk >= 0).all(axis=1)
+            if len(others):
+                valid &= (code_point_windows[start:start + CHUNK_OFFSETS][:, others] == crib_code_points).all(axis=1)
+            rows = np.flatnonzero(valid)
+            chunk = chunk[rows]
+
+            # Equal crib symbols are ciphered equally, and the number of different symbols matches (bijectivity)
+            valid = (chunk == chunk[:, first]).all(axis=1)
+            rows, chunk = rows[valid], chunk[valid]
+            sorted_chunk = np.sort(chunk, axis=1)
+            valid = (np.diff(sorted_chunk, axis=1) != 0).sum(axis=1) + 1 == num_distinct
+            rows, chunk = rows[valid], chunk[valid]
+
+            # The known replacements are kept in both directions
+            if replacements:
+                known_plain, known_cipher = key[chunk], inverse[crib_symbols]
+                valid = ((known_plain < 0) | (known_plain == crib_symbols)).all(axis=1) & \
+                    ((known_cipher < 0) | (known_cipher == chunk)).all(axis=1)
+                rows = rows[valid]
+
+            offsets.append(rows + start)
+        return np.concatenate(offsets) if offsets else np.empty(0, dtype=np.int64)
+
+    def replacements_at(self, crib: str, offset: int) -> Dict[str, str]:
+        """
+        Gets the replacements implied by the crib at an offset.
+
+        :param crib: The known plain text.
+        :param offset: The offset of the crib in the ciphertext, in characters.
+        :return: The replacements as a dictionary (ciphered character -> deciphered character).
+        """
+        return {cipher_char: plain_char for cipher_char, plain_char
+                in zip(self._ciphered_content[offset:offset + len(crib)], crib) if cipher_char in self.alphabet}
+
+    def find_replacements(self, crib: str, replacements: Optional[Dict[str, str]] = None) -> List[Tuple[int, Dict[str, str]]]:
+        """
+        Drags the crib and gets the key at every valid offset, merged with the known replacements.
+
+        :param crib: The known plain text.
+        :param replacements: The known replacements the key must agree with (optional).
+        :return: The valid offsets with their replacements.
+        """
+        return [(offset, {**(replacements or {}), **self.replacements_at(crib, offset)})
+                for offset in self.drag(crib, replacements).tolist()]
@@ -0,0 +1,160 @@
+from typing import Dict, Optional
+
+import numpy as np
+
+# Number of lines of the ciphered content shown on every page
+PAGE_LINES = 30
+
+# Maximum number of characters of a line shown on a row of the page (longer lines are split into several rows)
+PAGE_WIDTH = 120
+
+# ANSI color codes of the replaced characters and of the characters changed by a suggestion
+REPLACED_COLOR = "94"
+SUGGESTION_COLOR = "91"
+
+
+def color_text(text: str, color_code: str) -> str:
+    """
+    Colors the given text with the specified color code.
+
+    :param text: the text to color as a string
+    :param color_code: the color code as a string
+    :return: the colored text as a string
+    """
+    return f'\033[{color_code}m{text}\033[0m'
+
+
+class ManualDecodingSession:
+    """
+    State of a manual decoding: the character shown for every distinct character of the ciphered content.
+    Applying a suggestion only updates this mapping, and rendering translates the rows of the current page (lines
+    split at the page width), so the cost of every step does not depend on the length of the text or of its lines.
+    """
+
+    def __init__(self, ciphered_content: str, current_content: Optional[str] = None, page_lines: int = PAGE_LINES,
+                 page_width: int = PAGE_WIDTH) -> None:
+        """
+        Constructor method that initializes the mapping, from a previous decoding if given.
+
+        :param ciphered_content: the ciphered content as a string
+        :param current_content: a previous decoding of the ciphered content (optional)
+        :param page_lines: the number of rows shown on every page
+        :param page_width: the maximum number of characters of every row
+        :raises ValueError: If the number of lines per page or the page width is not positive
+        """
+        if page_lines <= 0:
+            raise ValueError(f"Invalid number of lines per page: {page_lines}")
+        if page_width <= 0:
+            raise ValueError(f"Invalid page width: {page_width}")
+        self._ciphered_content = ciphered_content
+        self._page_lines = page_lines
+        self._first_row = 0
+
+        # Start of every row (a line, or a part of a long line), to render a page without scanning the text
+        code_points = np.frombuffer(ciphered_content.encode("utf-32-le"), dtype=np.uint32)
+        line_breaks = np.flatnonzero(code_points == ord("\n"))
+        line_starts = np.concatenate(([0], line_breaks + 1))
+        line_lengths = np.append(line_breaks, len(code_points)) - line_starts
+        rows_per_line = np.maximum(1, -(-line_lengths // page_width))
+        first_rows = np.repeat(np.cumsum(rows_per_line) - rows_per_line, rows_per_line)
+        row_offsets = (np.arange(len(first_rows)) - first_rows) * page_width
+        self._row_starts = (np.repeat(line_starts, rows_per_line) + row_offsets).tolist()
+
+        # Characters of the ciphered content and the character shown for each one
+        self._symbols = sorted(set(ciphered_content))
+        self._shown = list(self._symbols)
+
+        # A previous decoding gives the shown character of every differing position
+        if current_content:
+            length = min(len(ciphered_content), len(current_content))
+            current_code_points = np.frombuffer(current_content[:length].encode("utf-32-le"), dtype=np.uint32)
+            changed = code_points[:length] != current_code_points
+            pairs = np.unique(np.stack((code_points[:length][changed], current_code_points[changed]), axis=1), axis=0)
+            positions = {symbol: index for index, symbol in enumerate(self._symbols)}
+            for cipher_code, shown_code in pairs.tolist():
+                self._shown[positions[chr(cipher_code)]] = chr(shown_code)
+
+    @property
+    def replacements(self) -> Dict[str, str]:
+        """
+        The replacements applied so far (ciphered character -> deciphered character).
+        """
+        return {symbol: shown for symbol, shown in zip(self._symbols, self._shown) if symbol != shown}
+
+    @property
+    def page(self) -> int:
+        """
+        The index of the current page.
+        """
+        return self._first_row // self._page_lines
+
+    @property
+    def num_pages(self) -> int:
+        """
+        The number of pages of the text.
+        """
+        return -(-len(self._row_starts) // self._page_lines)
+
+    def go_to_page(self, page: int) -> None:
+        """
+        Moves the viewport to a page (clamped to the existing ones).
+
+        :param page: the index of the page
+        """
+        self._first_row = min(max(page, 0), self.num_pages - 1) * self._page_lines
+
+    def _suggestion(self, old_string: str, new_string: str) -> Dict[str, str]:
+        """
+        Parses a suggestion that replaces the shown characters of a string with the ones of another.
+
+        :param old_string: the shown characters to replace
+        :param new_string: the new characters, in the same order
+        :return: the new character of every shown character
+        :raises ValueError: If the strings do not have the same length
+        """
+        if len(old_string) != len(new_string):
+            raise ValueError(f"Suggestion with different lengths: {old_string} {new_string}")
+        return dict(zip(old_string, new_string))
+
+    def apply(self, old_string: str, new_string: str) -> None:
+        """
+        Applies a suggestion, updating the character shown for every ciphered character (O(alphabet)).
+
+        :param old_string: the shown characters to replace
+        :param new_string: the new characters, in the same order
+        """
+        suggestion = self._suggestion(old_string, new_string)
+        self._shown = [suggestion.get(shown, shown) for shown in self._shown]
+
+    def render(self, old_string: Optional[str] = None, new_string: Optional[str] = None) -> str:
+        """
+        Renders the current page, with the replaced characters highlighted and an optional suggestion previewed.
+
+        :param old_string: the shown characters replaced by the suggestion (optional)
+        :param new_string: the new characters of the suggestion (optional)
+        :return: the page as a string with ANSI colors
+        """
+        suggestion = self._suggestion(old_string, new_string) if old_string is not None else {}
+
+        # Characters left unchanged are not in the table, so the translation only touches the highlighted ones
+        table = {}
+        for symbol, shown in zip(self._symbols, self._shown):
+            if shown in suggestion:
+                table[ord(symbol)] = color_text(suggestion[shown], SUGGESTION_COLOR)
+            elif shown != symbol:
+                table[ord(symbol)] = color_text(shown, REPLACED_COLOR)
+
+        # Rows that split a long line are shown on lines of their own
+        last_row = min(self._first_row + self._page_lines, len(self._row_starts))
+        ends = self._row_starts[self._first_row + 1:last_row + 1] + [len(self._ciphered_content)]
+        rows = [self._ciphered_content[start:end].translate(table)
+                for start, end in zip(self._row_starts[self._first_row:last_row], ends)]
+        return "".join(row if row.endswith("\n") else row + "\n" for row in rows[:-1]) + rows[-1]
+
+    def content(self) -> str:
+        """
+        Gets the whole decoded content.
+
+        :return: the ciphered content with the replacements applied
+        """
+        return self._ciphered_content.translate(str.maketrans(self.replacements))
@@ -1,6 +1,11 @@
 import random
 import string
-from tr import tr
+from typing import Iterable, Iterator, Union
+
+from src.util.text_util import TextUtil
+
+# Default number of bytes read from a file on every step
+CHUNK_SIZE = 1 << 20
 
 
 class MonoalphabeticCipher:
@@ -16,6 +21,13 @@ class MonoalphabeticCipher:
         self._seed = self._generate_seed()
         self._key = self._generate_random_key()
 
+        # Translation tables, built once per key (the seed and the key are ASCII, so bytes of UTF-8 text can be
+        # translated directly: multibyte characters are never touched)
+        self._cipher_table = str.maketrans(self._seed, self._key)
+        self._decipher_table = str.maketrans(self._key, self._seed)
+        self._cipher_bytes_table = bytes.maketrans(self._seed.encode("ascii"), self._key.encode("ascii"))
+        self._decipher_bytes_table = bytes.maketrans(self._key.encode("ascii"), self._seed.encode("ascii"))
+
     def _generate_seed(self) -> str:
         """
         Generates a seed for the cipher using all the ASCII printable characters.
@@ -45,8 +57,7 @@ class MonoalphabeticCipher:
         :return: The ciphered content as a string.
         """
         # Cipher the content using the random key
-        ciphered_content = tr(self._seed, self._key, content)
-        return ciphered_content
+        return content.translate(self._cipher_table)
 
     def decipher_content(self, ciphered_content: str) -> str:
         """
@@ -56,5 +67,89 @@ class MonoalphabeticCipher:
         :return: The deciphered content as a string.
         """
         # Decipher the ciphered content using the random key
-        deciphered_content = tr(self._key, self._seed, ciphered_content)
-        return deciphered_content
+        return ciphered_content.translate(self._decipher_table)
+
+    def cipher_bytes(self, content: Union[bytes, bytearray]) -> bytes:
+        """
+        Ciphers the given content (ASCII or UTF-8 encoded text) using the random key.
+
+        :param content: The content to be ciphered as bytes.
+        :return: The ciphered content as bytes.
+        """
+        return content.translate(self._cipher_bytes_table)
+
+    def decipher_bytes(self, ciphered_content: Union[bytes, bytearray]) -> bytes:
+        """
+        Deciphers the given ciphered content (ASCII or UTF-8 encoded text) using the random key.
+
+        :param ciphered_content: The ciphered content to be deciphered as bytes.
+        :return: The deciphered content as bytes.
+        """
+        return ciphered_content.translate(self._decipher_bytes_table)
+
+    def _translate_chunks(self, chunks: Iterable[Union[str, bytes]], decipher: bool) -> Iterator[Union[str, bytes]]:
+        """
+        Translates chunks of content one by one (characters are independent, so chunks can be split anywhere).
+
+        :param chunks: The chunks of the content, as strings or bytes.
+        :param decipher: Whether to decipher instead of cipher.
+        :return: A generator of translated chunks, of the same type as the input ones.
+        """
+        str_table = self._decipher_table if decipher else self._cipher_table
+        bytes_table = self._decipher_bytes_table if decipher else self._cipher_bytes_table
+        for chunk in chunks:
+            yield chunk.translate(str_table if isinstance(chunk, str) else bytes_table)
+
+    def cipher_chunks(self, chunks: Iterable[Union[str, bytes]]) -> Iterator[Union[str, bytes]]:
+        """
+        Ciphers content given in chunks using the random key.
+
+        :param chunks: The chunks of the content, as strings or bytes.
+        :return: A generator of ciphered chunks.
+        """
+        return self._translate_chunks(chunks, decipher=False)
+
+    def decipher_chunks(self, chunks: Iterable[Union[str, bytes]]) -> Iterator[Union[str, bytes]]:
+        """
+        Deciphers content given in chunks using the random key.
+
+        :param chunks: The chunks of the ciphered content, as strings or bytes.
+        :return: A generator of deciphered chunks.
+        """
+        return self._translate_chunks(chunks, decipher=True)
+
+    def _translate_file(self, input_path: str, output_path: str, decipher: bool, chunk_size: int) -> None:
+        """
+        Translates a file of any size in fixed-size chunks.
+
+        :param input_path: The path of the input file.
+        :param output_path: The path of the output file.
+        :param decipher: Whether to decipher instead of cipher.
+        :param chunk_size: The number of bytes read on every step.
+        """
+        TextUtil()._create_directory_if_not_exists(output_path)
+
+        with open(input_path, "rb") as reader, open(output_path, "wb") as writer:
+            chunks = iter(lambda: reader.read(chunk_size), b"")
+            for chunk in self._translate_chunks(chunks, decipher):
+                writer.write(chunk)
+
+    def cipher_file(self, input_path: str, output_path: str, chunk_size: int = CHUNK_SIZE) -> None:
+        """
+        Ciphers a text file of any size, chunk by chunk.
+
+        :param input_path: The path of the file to cipher.
+        :param output_path: The path of the ciphered file.
+        :param chunk_size: The number of bytes read on every step.
+        """
+        self._translate_file(input_path, output_path, decipher=False, chunk_size=chunk_size)
+
+    def decipher_file(self, input_path: str, output_path: str, chunk_size: int = CHUNK_SIZE) -> None:
+        """
+        Deciphers a text file of any size, chunk by chunk.
+
+        :param input_path: The path of the ciphered file.
+        :param output_path: The path of the deciphered file.
+        :param chunk_size: The number of bytes read on every step.
+        """
+        self._translate_file(input_path, output_path, decipher=True, chunk_size=chunk_size)
@@ -1,11 +1,38 @@
-import itertools
+import heapq
+import os
 import pandas as pd
 from collections import Counter
+from typing import Iterator, List, Optional, Tuple
 
+from src.ciphers.monoalphabetic.crib_dragger import CribDragger
+from src.ciphers.monoalphabetic.manual_session import PAGE_LINES, PAGE_WIDTH, ManualDecodingSession, color_text
 from src.ciphers.monoalphabetic.ngram_analyzer import NgramAnalyzer
-from src.util.nltk_util import Language, language_type
+from src.ciphers.monoalphabetic.ngram_model import ALPHABET, NgramModel, count_matrix_from_text, get_language_model
+from src.ciphers.monoalphabetic.substitution_solver import COOLING_SCHEDULES, COUNT_MATRIX_ORDER, \
+    RESTARTS, TOP_KEYS, CountMatrixScorer, HillClimbingSolver, MultiRestartSolver, NgramScorer, SimulatedAnnealingSolver, \
+    key_to_replacements, parse_time_limit, replacements_to_key
+from src.ciphers.monoalphabetic.word_pattern_solver import WordPatternSolver, build_word_pattern_index
+from src.util.cache_data import cache_data
+from src.util.logger import setup_logging
+from src.util.nltk_util import Language, get_long_text, language_type
 from src.util.text_util import TextUtil
 
+# Set up the logging configuration
+logger = setup_logging()
+
+# Default number of decoders of break_cipher saved to files
+POSSIBLE_DECODERS = 5
+
+# Scorers of the automatic solver: the n-grams of the ciphertext, or its n-gram counts reduced to a dense array
+SCORERS = ("text", "counts")
+
+# Searches of the automatic solver: parallel hill climbing restarts, simulated annealing with a time budget,
+# or dictionary words matched by letter pattern
+SOLVERS = ("restarts", "annealing", "words")
+
+# Default wall-clock budget of the simulated annealing, in seconds
+TIME_LIMIT = 5.0
+
 
 class MonoalphabeticCipherBreaker:
     """
@@ -80,36 +107,90 @@ class MonoalphabeticCipherBreaker:
         df_top = df_ngrams.head(num_top).to_dict()["ngram"]
         return df_top
 
-    def _get_decoder(self, ngrams_language, ngrams_ciphered) -> list:
+    @staticmethod
+    def _filter_keyed_ngrams(df_ngrams: pd.DataFrame) -> pd.DataFrame:
         """
-        Gets a decoder by pairing the language n-grams with the ciphered n-grams.
+        Filters the n-grams with at least one character of the cipher alphabet.
 
-        :param ngrams_language: the language n-grams as a dictionary
-        :param ngrams_ciphered: the ciphered n-grams as a dictionary
-        :return: the decoder as a list of tuples
+        :param df_ngrams: the DataFrame of n-grams as a pandas DataFrame
+        :return: the filtered DataFrame, with its index reset
+        """
+        keyed = df_ngrams["ngram"].map(lambda ngram: any(char in ALPHABET for char in ngram))
+        return df_ngrams[keyed].reset_index(drop=True)
+
+    def _extend_replacements(self, replacements: dict, replaced: set, cipher_value: str, lang_value: str) -> Optional[list]:
+        """
+        Adds the replacements of a pair of n-grams, unless they contradict the current ones.
+
+        :param replacements: the current replacements (ciphered character -> deciphered character), updated in place
+        :param replaced: the deciphered characters already used, updated in place
+        :param cipher_value: the ciphered n-gram
+        :param lang_value: the language n-gram
+        :return: the ciphered characters added, or None if the pair is not consistent (nothing is added then)
+        """
+        added = []
+        for cipher_char, lang_char in zip(cipher_value, lang_value):
+            if cipher_char in replacements:
+                consistent = replacements[cipher_char] == lang_char
+            else:
+                # Replacements are one to one, and the cipher leaves the characters out of its alphabet unchanged
+                consistent = lang_char not in replaced and \
+                             (lang_char in ALPHABET if cipher_char in ALPHABET else lang_char == cipher_char)
+                if consistent:
+                    replacements[cipher_char] = lang_char
+                    replaced.add(lang_char)
+                    added.append(cipher_char)
+            if not consistent:
+                self._remove_replacements(replacements, replaced, added)
+                return None
+        return added
+
+    @staticmethod
+    def _remove_replacements(replacements: dict, replaced: set, added: list) -> None:
+        """
+        Removes replacements added by _extend_replacements.
+
+        :param replacements: the current replacements, updated in place
+        :param replaced: the deciphered characters already used, updated in place
+        :param added: the ciphered characters to remove
         """
-        # Pair the language n-grams with the ciphered n-grams
-        decoder = [(cipher_value, language_value) for cipher_value, language_value in zip(ngrams_ciphered, ngrams_language)]
-        return decoder
+        for cipher_char in added:
+            replaced.discard(replacements.pop(cipher_char))
 
-    def _get_possible_decoders(self, ngrams_language, ngrams_ciphered) -> list:
+    def _get_possible_decoders(self, ngrams_language, ngrams_ciphered) -> Iterator[dict]:
         """
-        Gets all possible decoders by generating all permutations of the language n-grams.
+        Lazily generates the decoders that pair the ciphered n-grams with different language n-grams (or leave them unpaired).
+        Pairings are built one n-gram at a time, and the branches whose replacements contradict each other are pruned.
 
         :param ngrams_language: the language n-grams as a dictionary
         :param ngrams_ciphered: the ciphered n-grams as a dictionary
-        :return: the possible decoders as a list of lists of tuples
+        :return: a generator of decoders as replacement dictionaries (ciphered character -> deciphered character)
         """
-        # Convert the n-grams dictionaries to lists
         ngrams_language_values = list(ngrams_language.values())
         ngrams_ciphered_values = list(ngrams_ciphered.values())
-
-        # Generate all permutations of the language n-grams
-        perms = list(itertools.permutations(ngrams_language_values))
-
-        # Pair each permutation with the ciphered n-grams
-        possible_decoders = [[(cipher, lang) for cipher, lang in zip(ngrams_ciphered_values, perm)] for perm in perms]
-        return possible_decoders
+        used = [False] * len(ngrams_language_values)
+        replacements = {}
+        replaced = set()
+
+        def search(depth: int) -> Iterator[dict]:
+            if depth == len(ngrams_ciphered_values):
+                yield dict(replacements)
+                return
+            for index, lang_value in enumerate(ngrams_language_values):
+                if used[index]:
+                    continue
+                added = self._extend_replacements(replacements, replaced, ngrams_ciphered_values[depth], lang_value)
+                if added is None:
+                    continue
+                used[index] = True
+                yield from search(depth + 1)
+                used[index] = False
+                self._remove_replacements(replacements, replaced, added)
+
+            # The ciphered n-gram can also stay unpaired (its language n-gram may not be among the most frequent)
+            yield from search(depth + 1)
+
+        return search(0)
 
     def perform_replacement(self, replacements):
         """
@@ -123,37 +204,178 @@ class MonoalphabeticCipherBreaker:
         ciphered_content = self._ciphered_content.translate(translation_table)
         return ciphered_content
 
-    def break_cipher(self) -> None:
+    def break_cipher(self, num_top: int = 3, ngram_type: str = "trigrams", num_language: Optional[int] = None,
+                     top_k: int = POSSIBLE_DECODERS) -> List[Tuple[dict, float]]:
+        """
+        Breaks the cipher by pairing the most frequent n-grams, and saves the best deciphered contents to files.
+        The candidates are scored in memory (the other letters are paired by frequency), keeping only the best ones.
+
+        :param num_top: the number of most frequent ciphered n-grams paired
+        :param ngram_type: the type of n-grams paired ("unigrams", "bigrams", or "trigrams")
+        :param num_language: the number of most frequent language n-grams they can be paired with (num_top by default)
+        :param top_k: the number of best decoders saved
+        :return: the best decoders as replacement dictionaries with their scores, from best to worst
+        """
+        if num_language is None:
+            num_language = num_top
+
+        # Get the most frequent n-grams from the language and ciphered content (punctuation alone tells nothing of the key)
+        df_language, df_ciphered = {
+            "unigrams": (self._df_language_unigrams, self._df_ciphered_unigrams),
+            "bigrams": (self._df_language_bigrams, self._df_ciphered_bigrams),
+            "trigrams": (self._df_language_trigrams, self._df_ciphered_trigrams),
+        }[ngram_type]
+        top_ngrams_language = self._get_most_frequent_chars(df_ngrams=self._filter_keyed_ngrams(df_language), num_top=num_language)
+        top_ngrams_ciphered = self._get_most_frequent_chars(df_ngrams=self._filter_keyed_ngrams(df_ciphered), num_top=num_top)
+
+        # Score every decoder on the n-gram counts of the ciphertext, reduced once, keeping the best ones with
+        # different keys in a bounded min-heap
+        scorer = self._get_scorer("counts")
+        initial_key = scorer.initial_key()
+        best = []
+        num_decoders = 0
+        for num_decoders, replacements in enumerate(self._get_possible_decoders(top_ngrams_language, top_ngrams_ciphered), 1):
+            key = replacements_to_key(replacements, initial_key, scorer.alphabet)
+            score = scorer.score(key)
+            key = key.tobytes()
+            if any(key == other_key for _, _, other_key, _ in best):
+                continue
+            if len(best) < top_k:
+                heapq.heappush(best, (score, num_decoders, key, replacements))
+            elif score > best[0][0]:
+                heapq.heapreplace(best, (score, num_decoders, key, replacements))
+        logger.info(f"{num_decoders} consistent decoders scored")
+
+        # Save the best results
+        decoders = [(replacements, score) for score, _, _, replacements in sorted(best, key=lambda item: item[:2], reverse=True)]
+        for rank, (replacements, _) in enumerate(decoders):
+            self._util_text.write_text_to_file(filename=f"results/{self._language_name}/possible_decoders/decoder_{rank}.txt",
+                                               content=self.perform_replacement(replacements))
+        return decoders
+
+    def _get_ngram_model(self) -> NgramModel:
+        """
+        Gets the n-gram log-probability model of the language, memory-mapped from .npy files built the first time.
+
+        :return: the NgramModel instance
+        """
+        return get_language_model(language=self._language)
+
+    def _get_scorer(self, scorer: str):
+        """
+        Gets the scorer of the decodings for the automatic solver.
+
+        :param scorer: the scorer name, one of SCORERS
+        :return: the NgramScorer or CountMatrixScorer instance
+        :raises ValueError: if the scorer is not supported
+        """
+        if scorer == "text":
+            return NgramScorer(model=self._get_ngram_model(), ciphered_content=self._ciphered_content)
+        if scorer == "counts":
+            # The trigram counts are reduced once from the ciphered content itself (the analyzer caches them by
+            # language, not by content), so the search does not depend on the text length
+            counts = count_matrix_from_text(self._ciphered_content, COUNT_MATRIX_ORDER)
+            return CountMatrixScorer(model=self._get_ngram_model(), counts=counts)
+        raise ValueError(f"Invalid scorer: {scorer}")
+
+    def break_cipher_automatically(self, seed: Optional[int] = None, scorer: str = "text") -> dict:
+        """
+        Breaks the cipher without user interaction, hill climbing on the n-gram log-probability of the decodings.
+        The trigram counts stall in local optima more often than the quadgrams of the text, so the "counts" scorer
+        runs restarts in this process until one is confident.
+
+        :param seed: the seed of the random search (optional)
+        :param scorer: the scorer of the decodings, one of SCORERS ("counts" pays off for long ciphertexts only)
+        :return: the decoder as a replacement dictionary (ciphered character -> deciphered character)
         """
-        Breaks the cipher and saves deciphered content to files.
+        if scorer == "counts":
+            return self.break_cipher_with_restarts(workers=1, top_k=1, seed=seed, scorer=scorer)[0][0]
+
+        scorer = self._get_scorer(scorer)
+        key, _ = HillClimbingSolver(scorer=scorer, seed=seed).solve()
+        return key_to_replacements(key, scorer.alphabet)
+
+    def break_cipher_with_restarts(self, restarts: int = RESTARTS, workers: int = os.cpu_count() or 1,
+                                   top_k: int = TOP_KEYS, confidence: Optional[float] = None,
+                                   seed: Optional[int] = None, scorer: str = "text") -> List[Tuple[dict, float]]:
         """
-        # Get the most frequent trigrams, bigrams, and unigrams from the language and ciphered content
-        top_trigrams_language = self._get_most_frequent_chars(df_ngrams=self._df_language_trigrams, num_top=3)
-        top_trigrams_ciphered = self._get_most_frequent_chars(df_ngrams=self._df_ciphered_trigrams, num_top=3)
+        Breaks the cipher without user interaction, running independent hill climbs across worker processes.
+
+        :param restarts: the maximum number of hill climbs
+        :param workers: the number of worker processes
+        :param top_k: the number of best decoders returned
+        :param confidence: the average score per n-gram that stops the search early (the calibrated one of the scorer
+                           if None, math.inf runs every restart)
+        :param seed: the seed of the random search (optional)
+        :param scorer: the scorer of the decodings, one of SCORERS
+        :return: the best decoders as replacement dictionaries with their scores, from best to worst
+        """
+        scorer = self._get_scorer(scorer)
+        results = MultiRestartSolver(scorer=scorer, restarts=restarts, seed=seed).solve(workers=workers, top_k=top_k,
+                                                                                         confidence=confidence)
+        return [(key_to_replacements(key, scorer.alphabet), score) for key, score in results]
 
-        # Generate all possible decoders for the trigrams
-        decoders_trigrams = self._get_possible_decoders(top_trigrams_language, top_trigrams_ciphered)
+    def break_cipher_annealing(self, time_limit: float = TIME_LIMIT, schedule: str = "exponential",
+                               seed: Optional[int] = None, scorer: str = "text") -> Tuple[dict, float]:
+        """
+        Breaks the cipher without user interaction with simulated annealing, in a fixed time.
+        An interruption (Ctrl+C) returns the best decoder found so far.
+
+        :param time_limit: the wall-clock budget in seconds
+        :param schedule: the cooling schedule, one of COOLING_SCHEDULES
+        :param seed: the seed of the random search (optional)
+        :param scorer: the scorer of the decodings, one of SCORERS
+        :return: the best decoder as a replacement dictionary with its score
+        """
+        scorer = self._get_scorer(scorer)
+        key, score = SimulatedAnnealingSolver(scorer=scorer, schedule=schedule, seed=seed).solve(time_limit=time_limit)
+        return key_to_replacements(key, scorer.alphabet), score
 
-        for num_decoder, decoder in enumerate(decoders_trigrams):
-            ciphered_content = self._ciphered_content
-            replacements = {}
+    def _get_word_pattern_index(self) -> dict:
+        """
+        Gets the index from letter patterns to the words of the language (cached after the first build).
 
-            # Generate replacement dictionary for each pair of ciphered and language values
-            for cipher_value, lang_value in decoder:
-                cipher_value_letters = list(cipher_value)
-                lang_value_letters = list(lang_value)
+        :return: the words of every pattern, from most to least frequent
+        """
+        return cache_data(lambda: build_word_pattern_index(get_long_text(language=self._language)),
+                          f"{self._language_name}_word_patterns", True)
 
-                for num in range(0, len(cipher_value_letters)):
-                    replacements[cipher_value_letters[num]] = lang_value_letters[num]
+    def break_cipher_with_words(self) -> dict:
+        """
+        Breaks the cipher without user interaction, assigning dictionary words with the same letter pattern to the
+        ciphertext words. Letters that appear in no matched word are not replaced.
 
-            # Apply the replacements to the ciphered content
-            translation_table = str.maketrans(replacements)
-            ciphered_content = ciphered_content.translate(translation_table)
+        :return: the decoder as a replacement dictionary (ciphered character -> deciphered character)
+        """
+        return WordPatternSolver(index=self._get_word_pattern_index(), ciphered_content=self._ciphered_content).solve()
+
+    def drag_crib(self, crib: str, replacements: Optional[dict] = None) -> List[Tuple[int, dict]]:
+        """
+        Slides a known phrase across the ciphered content, finding the offsets where the substitution can produce it.
 
-            # Check if all the words in top_trigrams_language appear in ciphered_content
-            if all(word in ciphered_content for word in top_trigrams_language.values()):
-                # Save the result
-                self._util_text.write_text_to_file(filename=f"results/{self._language_name}/possible_decoders/decoder_{num_decoder}.txt", content=ciphered_content)
+        :param crib: the known plain text
+        :param replacements: the known replacements the key must agree with (optional)
+        :return: the valid offsets with the replacements they imply (merged with the known ones)
+        """
+        return CribDragger(ciphered_content=self._ciphered_content).find_replacements(crib=crib, replacements=replacements)
+
+    def get_crib_replacements(self, cribs: List[str], replacements: Optional[dict] = None) -> dict:
+        """
+        Gets the replacements implied by known phrases, dragging each one with the replacements of the previous ones.
+        When a phrase fits at several offsets, only the replacements shared by all of them are kept.
+
+        :param cribs: the known plain texts
+        :param replacements: the known replacements the phrases must agree with, e.g. of a previous decoding (optional)
+        :return: the replacement dictionary (ciphered character -> deciphered character)
+        """
+        replacements = dict(replacements or {})
+        for crib in cribs:
+            matches = self.drag_crib(crib=crib, replacements=replacements)
+            logger.info(f"Crib {crib!r} fits at {len(matches)} offsets")
+            if matches:
+                shared = set(matches[0][1].items()).intersection(*(match.items() for _, match in matches[1:]))
+                replacements = dict(shared)
+        return replacements
 
     def color_text(self, text: str, color_code: str) -> str:
         """
@@ -163,90 +385,61 @@ class MonoalphabeticCipherBreaker:
         :param color_code: the color code as a string
         :return: the colored text as a string
         """
-        return f'\033[{color_code}m{text}\033[0m'
+        return color_text(text, color_code)
 
-    def break_cipher_manually(self, ciphered_content: str = None) -> str:
+    def break_cipher_manually(self, ciphered_content: str = None, page_lines: int = PAGE_LINES,
+                              page_width: int = PAGE_WIDTH) -> str:
         """
         Breaks the cipher manually by allowing the user to provide replacement suggestions.
+        Only a page of the text is shown at a time, and the suggestions update a per-character mapping.
 
         :param ciphered_content: the ciphered content to be manually broken as a string (optional)
+        :param page_lines: the number of lines shown on every page
+        :param page_width: the maximum number of characters of every line shown (longer lines are split)
         :return: the deciphered content as a string
         """
-        # Use the attribute value if ciphered_content is not provided
-        if ciphered_content is None:
-            ciphered_content = self._ciphered_content
-
-        # Initialize the replacement dictionary
-        replacement_dict = {}
-
-        # Populate the replacement dictionary with initial differences
-        for i, char in enumerate(ciphered_content):
-            if i < len(self._ciphered_content) and char != self._ciphered_content[i]:
-                replacement_dict[self._ciphered_content[i]] = char
+        # The session starts from the differences between the given content and the ciphered content
+        session = ManualDecodingSession(ciphered_content=self._ciphered_content, current_content=ciphered_content,
+                                        page_lines=page_lines, page_width=page_width)
 
         while True:
-            # Highlight the differences in blue
-            highlighted_content = ""
-            for i, char in enumerate(ciphered_content):
-                if i < len(self._ciphered_content) and char != self._ciphered_content[i]:
-                    highlighted_content += self.color_text(char, '94')
-                else:
-                    highlighted_content += char
-
-            # Print the current ciphered content with differences highlighted
-            print(f"\n{highlighted_content}")
-
-            # Get the user's replacement suggestion
-            user_input = input("\nEnter the string you want to replace and the new value (e.g. 'A B'), or type 'done' to finish: ")
+            # Print the current page with the replaced characters highlighted in blue
+            print(f"\n{session.render()}")
+            print(f"\n[Page {session.page + 1}/{session.num_pages}]")
+
+            # Get the user's replacement suggestion or a page command
+            user_input = input("\nEnter the string you want to replace and the new value (e.g. 'A B'), 'n'/'p' or a page number "
+                               "to move through the text, or type 'done' to finish: ").strip()
             if user_input.lower() == 'done':
-                self._util_text.write_json_to_file(filename="decoder.json", data=replacement_dict)
+                self._util_text.write_json_to_file(filename="decoder.json", data=session.replacements)
                 break
+            if user_input.lower() in ('n', 'p'):
+                session.go_to_page(session.page + (1 if user_input.lower() == 'n' else -1))
+                continue
+            if user_input.isdigit():
+                session.go_to_page(int(user_input) - 1)
+                continue
 
             try:
                 # Parse the old and new strings from the user input
                 old_string, new_string = user_input.split()
 
-                # Apply the replacement suggestion to the ciphered content
-                old_string_letters = list(old_string)
-                new_string_letters = list(new_string)
-
-                temp_deciphered_content = ciphered_content
-                for num in range(0, len(old_string_letters)):
-                    temp_deciphered_content = temp_deciphered_content.replace(old_string_letters[num], self.color_text(new_string_letters[num], '91'))
-
-                # Print the deciphered text with the current suggestion
+                # Print the page with the current suggestion in red
                 print("\nDeciphered text with current suggestion:")
-                print(temp_deciphered_content)
+                print(session.render(old_string=old_string, new_string=new_string))
                 print()
 
                 # Ask the user if they want to apply the suggestion
                 apply_suggestion = input("\nDo you want to apply this suggestion? (yes/no): ")
                 if apply_suggestion.lower() == 'yes':
-                    # Apply the replacement suggestion to a copy of the ciphered content
-                    replacements = {}
-                    old_string_letters = list(old_string)
-                    new_string_letters = list(new_string)
-                    for num in range(0, len(old_string_letters)):
-                        replacements[old_string_letters[num]] = new_string_letters[num]
-
-                    # Apply the replacements to the ciphered content
-                    translation_table = str.maketrans(replacements)
-                    temp_deciphered_content = ciphered_content.translate(translation_table)
-
-                    # Update the replacement dictionary
-                    for i, old_char in enumerate(old_string):
-                        if i < len(new_string):
-                            replacement_dict[old_char] = new_string[i]
-
-                    # Update the original ciphered content with the applied changes
-                    ciphered_content = temp_deciphered_content
+                    session.apply(old_string=old_string, new_string=new_string)
 
             except ValueError:
                 # Handle invalid input
                 print("\nInvalid input. Please enter the string you want to replace and the new value separated by a space.")
                 continue
 
-        return ciphered_content
+        return session.content()
 
 
 if __name__ == "__main__":
@@ -261,6 +454,16 @@ if __name__ == "__main__":
     parser.add_argument("--hack_by_file", help="Path to the JSON file containing the replacements.")
     parser.add_argument("--current_decoding_file", help="Path to file with current decoding.")
     parser.add_argument("--language", help="Language for the text (eng or spa).", required=True, type=language_type, choices=list(Language))
+    parser.add_argument("--crib", help="Known plain text to seed the manual decoding (can be repeated).", action="append", default=[])
+    parser.add_argument("--auto", help="Break the cipher automatically instead of manually.", action="store_true")
+    parser.add_argument("--num_top", help="Number of most frequent n-grams paired to find the possible decoders.", type=int, default=3)
+    parser.add_argument("--ngram_type", help="Type of n-grams paired to find the possible decoders.", choices=["unigrams", "bigrams", "trigrams"], default="trigrams")
+    parser.add_argument("--scorer", help="Scorer of the automatic solver.", choices=SCORERS, default="text")
+    parser.add_argument("--solver", help="Search of the automatic solver.", choices=SOLVERS, default="restarts")
+    parser.add_argument("--time_limit", "--time-limit", help="Time budget of the simulated annealing (e.g. 5s, 500ms, 2m).", type=parse_time_limit, default=TIME_LIMIT)
+    parser.add_argument("--schedule", help="Cooling schedule of the simulated annealing.", choices=list(COOLING_SCHEDULES), default="exponential")
+    parser.add_argument("--restarts", help="Maximum number of hill climbs of the automatic solver.", type=int, default=RESTARTS)
+    parser.add_argument("--workers", help="Number of worker processes of the automatic solver.", type=int, default=os.cpu_count() or 1)
     args = parser.parse_args()
 
     # Read the content of the file specified by the command line argument
@@ -272,27 +475,47 @@ if __name__ == "__main__":
     # Store n-grams
     cipher_breaker.store_ngrams()
 
-    # Break the cipher
-    cipher_breaker.break_cipher()
+    # Break the cipher (the possible decoders help the manual modes)
+    if not args.auto:
+        cipher_breaker.break_cipher(num_top=args.num_top, ngram_type=args.ngram_type)
+
+    # Check if the --auto option was used
+    if args.auto:
+        # Search the decoder with the n-gram model of the language
+        if args.solver == "annealing":
+            replacements, _ = cipher_breaker.break_cipher_annealing(time_limit=args.time_limit, schedule=args.schedule, scorer=args.scorer)
+        elif args.solver == "words":
+            replacements = cipher_breaker.break_cipher_with_words()
+        else:
+            # Keep the best restart
+            decoders = cipher_breaker.break_cipher_with_restarts(restarts=args.restarts, workers=args.workers, scorer=args.scorer)
+            replacements = decoders[0][0]
+        util_text.write_json_to_file(filename="decoder.json", data=replacements)
+        deciphered_content = cipher_breaker.perform_replacement(replacements=replacements)
 
     # Check if the --hack_by_file option was used
-    if args.hack_by_file:
+    elif args.hack_by_file:
         # Read the JSON file containing the replacements
         replacements = util_text.read_json_from_file(filename=args.hack_by_file)
         # Perform the replacements and get the deciphered content
         deciphered_content = cipher_breaker.perform_replacement(replacements=replacements)
     else:
-        if args.current_decoding_file:
+        if args.current_decoding_file or args.crib:
             current_decoding_file = args.current_decoding_file
         else:
             # Ask the user for the path of the content to send to break_cipher_manually
             current_decoding_file = input("Enter the path of the file to use for manual decryption, or press Enter to start from scratch: ")
 
         # Use the user input as the argument to break_cipher_manually if it is not empty, otherwise use ciphered_text
+        # (decoded with the replacements of the cribs, if any, on top of the ones of the current decoding)
         if current_decoding_file:
             manual_ciphered_text = util_text.read_file(filename=current_decoding_file)
         else:
-            manual_ciphered_text = ciphered_text
+            manual_ciphered_text = None
+        if args.crib:
+            current_replacements = ManualDecodingSession(ciphered_content=ciphered_text, current_content=manual_ciphered_text).replacements
+            manual_ciphered_text = cipher_breaker.perform_replacement(
+                replacements=cipher_breaker.get_crib_replacements(cribs=args.crib, replacements=current_replacements))
 
         # Allow the user to break the cipher manually
         deciphered_content = cipher_breaker.break_cipher_manually(ciphered_content=manual_ciphered_text)
@@ -0,0 +1,240 @@
+import os
+import string
+from typing import Dict
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from src.util.cache_data import CACHE_FOLDER
+from src.util.logger import setup_logging
+from src.util.nltk_util import Language, get_long_text, language_type
+
+# Set up the logging configuration
+logger = setup_logging()
+
+# Symbols substituted by MonoalphabeticCipher (any other character is left unchanged)
+ALPHABET = string.ascii_letters + string.digits
+
+# Order of the n-grams used to score decodings (quadgrams)
+DEFAULT_ORDER = 4
+
+# Count given to the n-grams never seen in the language text
+FLOOR_COUNT = 0.01
+
+# File with the alphabet of a saved model, next to one {order}gram.npy table per order
+ALPHABET_FILE = "alphabet.txt"
+
+
+def encode_text(text: str, alphabet: str = ALPHABET) -> np.ndarray:
+    """
+    Converts a text into an array of symbol indices.
+
+    :param text: The text as a string.
+    :param alphabet: The symbols of the alphabet.
+    :return: An int16 array with the index of every character in the alphabet, or -1 if it is not in it.
+    """
+    lookup = np.full(128, -1, dtype=np.int16)
+    lookup[[ord(char) for char in alphabet]] = np.arange(len(alphabet))
+
+    code_points = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+    codes = np.full(len(code_points), -1, dtype=np.int16)
+    in_ascii = code_points < 128
+    codes[in_ascii] = lookup[code_points[in_ascii]]
+    return codes
+
+
+def ngram_windows(codes: np.ndarray, order: int) -> np.ndarray:
+    """
+    Gets the n-grams of an encoded text that only contain symbols of the alphabet.
+
+    :param codes: The encoded text, as returned by encode_text.
+    :param order: The length of the n-grams.
+    :return: An array of shape (number of n-grams, order) with the symbol indices of every n-gram.
+    """
+    if len(codes) < order:
+        return np.empty((0, order), dtype=np.int64)
+    windows = sliding_window_view(codes, order)
+    return windows[(windows >= 0).all(axis=1)].astype(np.int64)
+
+
+def ngram_indices(grams: np.ndarray, alphabet_size: int) -> np.ndarray:
+    """
+    Converts n-grams of symbol indices into flat indices of an (alphabet_size ** order) table.
+
+    :param grams: An array of shape (number of n-grams, order).
+    :param alphabet_size: The number of symbols of the alphabet.
+    :return: An int64 array with the flat index of every n-gram.
+    """
+    return grams @ (alphabet_size ** np.arange(grams.shape[-1] - 1, -1, -1, dtype=np.int64))
+
+
+def count_matrix_from_text(text: str, order: int, alphabet: str = ALPHABET) -> np.ndarray:
+    """
+    Counts the n-grams of a text into a dense array.
+
+    :param text: The text as a string.
+    :param order: The length of the n-grams.
+    :param alphabet: The symbols of the alphabet.
+    :return: An int64 array of shape (alphabet size,) * order with the number of occurrences of every n-gram.
+    """
+    counts = np.bincount(ngram_indices(ngram_windows(encode_text(text, alphabet), order), len(alphabet)),
+                         minlength=len(alphabet) ** order)
+    return counts.reshape((len(alphabet),) * order)
+
+
+class NgramModel:
+    """
+    This class represents the n-gram log-probabilities of a language, used to score candidate decodings.
+    The tables of every order are dense float32 arrays indexed by the flat index of the n-gram.
+    """
+
+    def __init__(self, log_probs: Dict[int, np.ndarray], alphabet: str = ALPHABET) -> None:
+        """
+        Constructor method that initializes the model with its tables.
+
+        :param log_probs: The log-probability tables by n-gram order.
+        :param alphabet: The symbols of the alphabet.
+        """
+        self.alphabet = alphabet
+        self.log_probs = log_probs
+        self.order = max(log_probs)
+
+    def __getstate__(self) -> dict:
+        """
+        Pickles memory-mapped tables as the directory of their files, so worker processes map the same copy.
+
+        :return: The state of the model.
+        """
+        filenames = [getattr(table, "filename", None) for table in self.log_probs.values()]
+        if all(filenames):
+            return {"alphabet": self.alphabet, "directory": os.path.dirname(filenames[0]), "order": self.order}
+        return {"alphabet": self.alphabet, "log_probs": self.log_probs}
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Restores a model from its state, memory-mapping the tables again if they were.
+
+        :param state: The state of the model.
+        """
+        if "directory" in state:
+            self.__init__(NgramModel.load(state["directory"], state["order"]).log_probs, state["alphabet"])
+        else:
+            self.__init__(state["log_probs"], state["alphabet"])
+
+    @classmethod
+    def from_text(cls, text: str, order: int = DEFAULT_ORDER, alphabet: str = ALPHABET) -> "NgramModel":
+        """
+        Builds the model from the n-gram counts of a text (n-grams across other characters are not counted).
+
+        :param text: The language text as a string.
+        :param order: The highest n-gram order of the model.
+        :param alphabet: The symbols of the alphabet.
+        :return: The NgramModel instance.
+        """
+        codes = encode_text(text, alphabet)
+        log_probs = {}
+        for ngram_order in range(1, order + 1):
+            counts = np.bincount(ngram_indices(ngram_windows(codes, ngram_order), len(alphabet)),
+                                 minlength=len(alphabet) ** ngram_order)
+            total = max(counts.sum(), 1)
+            log_probs[ngram_order] = np.log(np.maximum(counts, FLOOR_COUNT) / total).astype(np.float32)
+        return cls(log_probs, alphabet)
+
+    def save(self, directory: str) -> None:
+        """
+        Saves the tables as .npy files (written to temporary files first, so readers never see a partial table).
+
+        :param directory: The directory of the model.
+        """
+        os.makedirs(directory, exist_ok=True)
+        for ngram_order, table in self.log_probs.items():
+            path = os.path.join(directory, f"{ngram_order}gram.npy")
+            with open(f"{path}.tmp", "wb") as file:
+                np.save(file, np.ascontiguousarray(table, dtype=np.float32))
+            os.replace(f"{path}.tmp", path)
+
+        # The alphabet is written last, marking the model as complete
+        with open(os.path.join(directory, f"{ALPHABET_FILE}.tmp"), "w", encoding="utf-8") as file:
+            file.write(self.alphabet)
+        os.replace(os.path.join(directory, f"{ALPHABET_FILE}.tmp"), os.path.join(directory, ALPHABET_FILE))
+
+    @classmethod
+    def load(cls, directory: str, order: int = DEFAULT_ORDER, mmap: bool = True) -> "NgramModel":
+        """
+        Loads the tables saved in a directory. Memory-mapped tables are read-only and shared by every process
+        that maps the same files.
+
+        :param directory: The directory of the model.
+        :param order: The highest n-gram order to load.
+        :param mmap: Whether to memory-map the tables instead of reading them.
+        :return: The NgramModel instance.
+        """
+        with open(os.path.join(directory, ALPHABET_FILE), encoding="utf-8") as file:
+            alphabet = file.read()
+        log_probs = {ngram_order: np.load(os.path.join(directory, f"{ngram_order}gram.npy"),
+                                          mmap_mode="r" if mmap else None)
+                     for ngram_order in range(1, order + 1)}
+        return cls(log_probs, alphabet)
+
+    @staticmethod
+    def is_saved(directory: str, order: int = DEFAULT_ORDER) -> bool:
+        """
+        Checks whether a complete model is saved in a directory.
+
+        :param directory: The directory of the model.
+        :param order: The highest n-gram order required.
+        :return: True if the alphabet and the tables of every order exist.
+        """
+        return all(os.path.isfile(os.path.join(directory, name))
+                   for name in [ALPHABET_FILE] + [f"{ngram_order}gram.npy" for ngram_order in range(1, order + 1)])
+
+
+def get_language_model_directory(language: Language) -> str:
+    """
+    Gets the directory where the n-gram model of a language is saved.
+
+    :param language: The language of the model.
+    :return: The path of the directory.
+    """
+    return os.path.join(CACHE_FOLDER, f"{language.name}_ngram_model")
+
+
+def build_language_model(language: Language, order: int = DEFAULT_ORDER, alphabet: str = ALPHABET) -> str:
+    """
+    Counts the n-grams of the long text of a language and saves the model as .npy files.
+
+    :param language: The language of the model.
+    :param order: The highest n-gram order of the model.
+    :param alphabet: The symbols of the alphabet.
+    :return: The directory of the model.
+    """
+    directory = get_language_model_directory(language)
+    logger.info(f"Building the {language.name} n-gram model in {directory}")
+    NgramModel.from_text(get_long_text(language=language), order, alphabet).save(directory)
+    return directory
+
+
+def get_language_model(language: Language, order: int = DEFAULT_ORDER) -> NgramModel:
+    """
+    Gets the memory-mapped n-gram model of a language, building it the first time.
+
+    :param language: The language of the model.
+    :param order: The highest n-gram order of the model.
+    :return: The NgramModel instance.
+    """
+    directory = get_language_model_directory(language)
+    if not NgramModel.is_saved(directory, order):
+        build_language_model(language, order)
+    return NgramModel.load(directory, order)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description="Build the n-gram log-probability model of a language.")
+    parser.add_argument("--language", help="Language of the model (eng or spa).", required=True, type=language_type, choices=list(Language))
+    parser.add_argument("--order", help="Highest n-gram order of the model.", type=int, default=DEFAULT_ORDER)
+    args = parser.parse_args()
+
+    build_language_model(args.language, args.order)
@@ -0,0 +1,573 @@
+import heapq
+import itertools
+import math
+import os
+import random
+import re
+import signal
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from src.ciphers.monoalphabetic.ngram_model import NgramModel, encode_text, ngram_indices, ngram_windows
+from src.util.logger import setup_logging
+from src.util.process_pool import imap_bounded
+
+# Set up the logging configuration
+logger = setup_logging()
+
+# Order of the count arrays scored by CountMatrixScorer (a swap visits order * alphabet^(order - 1) entries,
+# about 23 thousand for trigrams of 62 symbols, but 1.4 million for quadgrams)
+COUNT_MATRIX_ORDER = 3
+
+# Default number of independent hill climbs of MultiRestartSolver
+RESTARTS = 32
+
+# Default number of best distinct keys returned by MultiRestartSolver
+TOP_KEYS = 5
+
+# Average log-probability per n-gram above which a decoding is taken as solved, by order of the n-grams (English
+# plain text scores about -6.5 to -7 per trigram and -7 to -8.5 per quadgram, while the local optima of wrong keys
+# stay below -10 and -12)
+CONFIDENCE_SCORES = {3: -8.5, 4: -9.0}
+
+# Number of random swaps applied to the frequency-based key at the start of every restart but the first one
+# (enough to reach other local optima, while a fully random key is rarely solved)
+RESTART_SWAPS = 10
+
+# Temperatures of SimulatedAnnealingSolver at the start and at the end of the search, per n-gram of the ciphertext
+# (wrong keys are left around 0.03, and the search settles in the basin of the right key around 0.005)
+INITIAL_TEMPERATURE = 0.03
+FINAL_TEMPERATURE = 0.005
+
+# Cooling schedules of SimulatedAnnealingSolver: temperature from the initial and final ones and the progress (0 to 1)
+COOLING_SCHEDULES = {
+    "exponential": lambda initial, final, progress: initial * (final / initial) ** progress,
+    "linear": lambda initial, final, progress: initial + (final - initial) * progress,
+    "cosine": lambda initial, final, progress: final + (initial - final) * (1 + math.cos(math.pi * progress)) / 2,
+}
+
+# Number of swaps of SimulatedAnnealingSolver between checks of the clock
+CLOCK_INTERVAL = 256
+
+# Units of the time limits, in seconds
+TIME_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+
+def parse_time_limit(time_limit: str) -> float:
+    """
+    Parses a time limit such as "5s", "500ms", "2m" or "1h" (seconds if there is no unit).
+
+    :param time_limit: The time limit as a string.
+    :return: The time limit in seconds.
+    :raises ValueError: If the time limit is not valid
+    """
+    match = re.fullmatch(r"\s*(\d+(?:\.\d*)?|\.\d+)\s*(ms|s|m|h)?\s*", time_limit)
+    if not match or float(match.group(1)) <= 0:
+        raise ValueError(f"Invalid time limit: {time_limit}")
+    return float(match.group(1)) * TIME_UNITS[match.group(2) or "s"]
+
+
+def key_to_replacements(key: np.ndarray, alphabet: str) -> Dict[str, str]:
+    """
+    Converts a decryption key into the replacement dictionary used by MonoalphabeticCipherBreaker.
+
+    :param key: The decryption key, mapping the index of every ciphered symbol to a deciphered symbol.
+    :param alphabet: The symbols of the alphabet.
+    :return: The replacements as a dictionary (ciphered character -> deciphered character).
+    """
+    return {alphabet[cipher_symbol]: alphabet[plain_symbol] for cipher_symbol, plain_symbol in enumerate(key.tolist())}
+
+
+def replacements_to_key(replacements: Dict[str, str], key: np.ndarray, alphabet: str) -> np.ndarray:
+    """
+    Fixes the replacements of some symbols in a decryption key, keeping it a permutation.
+
+    :param replacements: The replacements as a dictionary (ciphered character -> deciphered character).
+    :param key: The decryption key that gives the replacements of the other symbols.
+    :param alphabet: The symbols of the alphabet.
+    :return: The new decryption key (characters out of the alphabet are ignored).
+    """
+    key = key.copy()
+    for cipher_char, plain_char in replacements.items():
+        if cipher_char in alphabet and plain_char in alphabet:
+            cipher_symbol, plain_symbol = alphabet.index(cipher_char), alphabet.index(plain_char)
+            # The symbol that was deciphered as plain_symbol takes the previous replacement instead
+            other = int(np.flatnonzero(key == plain_symbol)[0])
+            key[other], key[cipher_symbol] = key[cipher_symbol], plain_symbol
+    return key
+
+
+class LogProbScorer(ABC):
+    """
+    Base class of the log-probability fitness of the decodings of a ciphertext.
+    Scorers are pickled without their tables, which are restored from the model, so worker processes map the tables
+    of memory-mapped models again instead of receiving a copy.
+    """
+
+    def __init__(self, model: NgramModel, order: int) -> None:
+        """
+        Constructor method that loads the tables of the model.
+
+        :param model: The n-gram model of the language.
+        :param order: The order of the n-grams scored.
+        """
+        self.alphabet = model.alphabet
+        self.model = model
+        self.order = order
+        self.confidence_score = CONFIDENCE_SCORES.get(order)
+        self._load_tables()
+
+    def _load_tables(self) -> None:
+        """
+        Gets the log-probability tables of the model used to score.
+        """
+        self._log_probs = self.model.log_probs[self.order]
+        self._unigram_log_probs = self.model.log_probs[1]
+
+    def __getstate__(self) -> dict:
+        """
+        Pickles the scorer without the tables, which are restored from the model (memory-mapped models are
+        pickled as the directory of their files).
+
+        :return: The state of the scorer
+        """
+        state = self.__dict__.copy()
+        del state["_log_probs"], state["_unigram_log_probs"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Restores the scorer from its state.
+
+        :param state: The state of the scorer
+        """
+        self.__dict__.update(state)
+        self._load_tables()
+
+    def initial_key(self) -> np.ndarray:
+        """
+        Gets a key that pairs the ciphered symbols with the language symbols by frequency.
+
+        :return: The decryption key as an array.
+        """
+        key = np.empty(len(self.alphabet), dtype=np.int64)
+        key[np.argsort(-self.symbol_counts, kind="stable")] = np.argsort(-self._unigram_log_probs, kind="stable")
+        return key
+
+    @abstractmethod
+    def score(self, key: np.ndarray) -> float:
+        """
+        Computes the log-probability of the ciphertext deciphered with a key.
+
+        :param key: The decryption key as an array.
+        :return: The score (higher is better).
+        """
+
+    @abstractmethod
+    def swap_delta(self, key: np.ndarray, first: int, second: int) -> float:
+        """
+        Computes the change of score when the deciphered symbols of two ciphered symbols are swapped.
+
+        :param key: The decryption key as an array.
+        :param first: The index of the first ciphered symbol.
+        :param second: The index of the second ciphered symbol.
+        :return: The score of the swapped key minus the score of the key.
+        """
+
+
+class NgramScorer(LogProbScorer):
+    """
+    Log-probability fitness of the decodings of a ciphertext.
+    The distinct n-grams of the ciphertext are indexed by symbol, so the change of score when two symbols
+    of the key are swapped is computed only on the n-grams that contain them.
+    """
+
+    def __init__(self, model: NgramModel, ciphered_content: str) -> None:
+        """
+        Constructor method that extracts the n-grams of the ciphertext.
+
+        :param model: The n-gram model of the language.
+        :param ciphered_content: The ciphered content as a string.
+        """
+        super().__init__(model, model.order)
+        alphabet_size = len(self.alphabet)
+
+        # Distinct n-grams of the ciphertext with their number of occurrences
+        codes = encode_text(ciphered_content, self.alphabet)
+        self.symbol_counts = np.bincount(codes[codes >= 0], minlength=alphabet_size)
+        grams = ngram_windows(codes, model.order)
+        self._grams, counts = np.unique(grams, axis=0, return_counts=True)
+        self._counts = counts.astype(np.float64)
+        self.ngram_count = int(counts.sum())
+
+        # Distinct n-grams where every symbol appears
+        self._rows = [np.flatnonzero((self._grams == symbol).any(axis=1)) for symbol in range(alphabet_size)]
+
+    def score(self, key: np.ndarray) -> float:
+        """
+        Computes the log-probability of the ciphertext deciphered with a key.
+
+        :param key: The decryption key as an array.
+        :return: The score (higher is better).
+        """
+        return float(self._log_probs[ngram_indices(key[self._grams], len(self.alphabet))] @ self._counts)
+
+    def swap_delta(self, key: np.ndarray, first: int, second: int) -> float:
+        """
+        Computes the change of score when the deciphered symbols of two ciphered symbols are swapped.
+
+        :param key: The decryption key as an array.
+        :param first: The index of the first ciphered symbol.
+        :param second: The index of the second ciphered symbol.
+        :return: The score of the swapped key minus the score of the key.
+        """
+        rows = np.union1d(self._rows[first], self._rows[second])
+        if not len(rows):
+            return 0.0
+
+        grams = self._grams[rows]
+        old = key[grams]
+        new = old.copy()
+        new[grams == first] = key[second]
+        new[grams == second] = key[first]
+        alphabet_size = len(self.alphabet)
+        return float((self._log_probs[ngram_indices(new, alphabet_size)] -
+                      self._log_probs[ngram_indices(old, alphabet_size)]) @ self._counts[rows])
+
+
+class CountMatrixScorer(LogProbScorer):
+    """
+    Log-probability fitness of the decodings of a ciphertext reduced to a dense n-gram count array.
+    Scoring a key is a dot product between the nonzero counts and the permuted language table, and the change of score
+    when two symbols are swapped only visits the slices that contain them, O(order * alphabet^(order - 1)),
+    so the cost does not depend on the length of the ciphertext.
+    """
+
+    def __init__(self, model: NgramModel, counts: np.ndarray) -> None:
+        """
+        Constructor method that takes the n-gram counts of the ciphertext.
+
+        :param model: The n-gram model of the language.
+        :param counts: The counts of the ciphertext n-grams, of shape (alphabet size,) * order.
+        """
+        super().__init__(model, counts.ndim)
+        self._counts = counts.astype(np.float64)
+        self.ngram_count = int(counts.sum())
+
+        # The n-grams that appear in the ciphertext, so a whole key is scored on them only
+        nonzero = np.flatnonzero(counts)
+        self._nonzero_grams = np.stack(np.unravel_index(nonzero, counts.shape), axis=1)
+        self._nonzero_counts = self._counts.reshape(-1)[nonzero]
+
+        # Occurrences of every symbol, at any position of the n-grams
+        self.symbol_counts = sum(self._counts.sum(axis=tuple(other for other in range(self.order) if other != axis))
+                                 for axis in range(self.order))
+
+        # The counts of the symbols missing from the ciphertext are zero, so their slices are skipped
+        self._present = np.flatnonzero(self.symbol_counts)
+
+    def _load_tables(self) -> None:
+        """
+        Gets the log-probability tables of the model used to score, with one axis per position of the n-grams.
+        """
+        super()._load_tables()
+        self._log_probs = self._log_probs.reshape((len(self.alphabet),) * self.order)
+
+    def score(self, key: np.ndarray) -> float:
+        """
+        Computes the log-probability of the ciphertext deciphered with a key.
+
+        :param key: The decryption key as an array.
+        :return: The score (higher is better).
+        """
+        indices = ngram_indices(key[self._nonzero_grams], len(self.alphabet))
+        return float(self._log_probs.reshape(-1)[indices] @ self._nonzero_counts)
+
+    def swap_delta(self, key: np.ndarray, first: int, second: int) -> float:
+        """
+        Computes the change of score when the deciphered symbols of two ciphered symbols are swapped.
+
+        :param key: The decryption key as an array.
+        :param first: The index of the first ciphered symbol.
+        :param second: The index of the second ciphered symbol.
+        :return: The score of the swapped key minus the score of the key.
+        """
+        swapped = np.array([first, second])
+        others = np.setdiff1d(self._present, swapped)
+        everything = self._present
+        new_key = key.copy()
+        new_key[first], new_key[second] = key[second], key[first]
+
+        # The n-grams with a swapped symbol are split by the first position where it appears
+        delta = 0.0
+        for axis in range(self.order):
+            indices = [others] * axis + [swapped] + [everything] * (self.order - axis - 1)
+            counts = self._counts[np.ix_(*indices)]
+            old = self._log_probs[np.ix_(*(key[index] for index in indices))]
+            new = self._log_probs[np.ix_(*(new_key[index] for index in indices))]
+            delta += float((counts * (new - old)).sum())
+        return delta
+
+
+class HillClimbingSolver:
+    """
+    Automatic solver for monoalphabetic substitution ciphers.
+    Starting from a key, it applies every swap of two symbols that improves the score until none does.
+    """
+
+    def __init__(self, scorer: LogProbScorer, seed: Optional[int] = None) -> None:
+        """
+        Constructor method that initializes the solver.
+
+        :param scorer: The scorer of the ciphertext.
+        :param seed: The seed of the random order of the swaps.
+        """
+        self._scorer = scorer
+        self._random = random.Random(seed)
+
+        # Swaps between two symbols that do not appear in the ciphertext never change the score
+        present = scorer.symbol_counts > 0
+        self._swaps = [(first, second) for first, second in itertools.combinations(range(len(scorer.alphabet)), 2)
+                       if present[first] or present[second]]
+
+    def solve(self, key: Optional[np.ndarray] = None) -> Tuple[np.ndarray, float]:
+        """
+        Improves a key until no swap increases its score (a local optimum).
+
+        :param key: The initial decryption key (the frequency-based key is used if not provided).
+        :return: A tuple with the best key and its score.
+        """
+        key = self._scorer.initial_key() if key is None else key.copy()
+        score = self._scorer.score(key)
+
+        improved = True
+        while improved:
+            improved = False
+            self._random.shuffle(self._swaps)
+            for first, second in self._swaps:
+                delta = self._scorer.swap_delta(key, first, second)
+                if delta > 0:
+                    key[first], key[second] = key[second], key[first]
+                    score += delta
+                    improved = True
+
+        return key, score
+
+
+class MultiRestartSolver:
+    """
+    Runs independent hill climbs across a pool of worker processes to escape the local optima of a single climb.
+    Every restart but the first one starts from the frequency-based key with random swaps, seeded per restart, and
+    visits the swaps in its own random order. It stops as soon as a decoding reaches the confidence score.
+    """
+
+    def __init__(self, scorer: LogProbScorer, restarts: int = RESTARTS,
+                 seed: Optional[int] = None) -> None:
+        """
+        Constructor method that initializes the solver.
+
+        :param scorer: The scorer of the ciphertext.
+        :param restarts: The maximum number of hill climbs.
+        :param seed: The seed of the restarts.
+        :raises ValueError: If the number of restarts is not positive
+        """
+        if restarts <= 0:
+            raise ValueError(f"Invalid number of restarts: {restarts}")
+        self._scorer = scorer
+        random_seeds = random.Random(seed)
+        self._seeds = [random_seeds.getrandbits(32) for _ in range(restarts)]
+
+        # Keys that only differ in symbols missing from the ciphertext give the same decoding
+        self._present = np.flatnonzero(scorer.symbol_counts)
+
+    @staticmethod
+    def run_restart(scorer: LogProbScorer, restart: int, seed: int) -> Tuple[np.ndarray, float]:
+        """
+        Runs one hill climb, from the frequency-based key for the first restart and from a perturbed one otherwise.
+
+        :param scorer: The scorer of the ciphertext.
+        :param restart: The index of the restart.
+        :param seed: The seed of the initial key and of the random order of the swaps.
+        :return: A tuple with the best key and its score.
+        """
+        key = scorer.initial_key()
+        if restart:
+            random_swaps = random.Random(seed)
+            present = np.flatnonzero(scorer.symbol_counts).tolist()
+            for _ in range(RESTART_SWAPS if len(present) > 1 else 0):
+                first, second = random_swaps.sample(present, 2)
+                key[first], key[second] = key[second], key[first]
+        return HillClimbingSolver(scorer=scorer, seed=seed).solve(key)
+
+    def _is_confident(self, score: float, confidence: Optional[float]) -> bool:
+        """
+        Checks whether a score is high enough to take its decoding as solved.
+
+        :param score: The score of a key.
+        :param confidence: The average score per n-gram to stop early (None never stops, e.g. for a scorer of an
+        order without a calibrated confidence score).
+        :return: True if the average score per n-gram reaches the confidence score.
+        """
+        return confidence is not None and score >= confidence * max(self._scorer.ngram_count, 1)
+
+    def _add_result(self, best: List[Tuple[float, bytes, np.ndarray]], key: np.ndarray, score: float,
+                    top_k: int) -> None:
+        """
+        Keeps the best distinct keys in a min-heap.
+
+        :param best: The heap of (score, decoding key bytes, key).
+        :param key: The key found by a restart.
+        :param score: The score of the key.
+        :param top_k: The number of keys kept.
+        """
+        decoding = key[self._present].tobytes()
+        if any(decoding == other for _, other, _ in best):
+            return
+        if len(best) < top_k:
+            heapq.heappush(best, (score, decoding, key))
+        elif score > best[0][0]:
+            heapq.heapreplace(best, (score, decoding, key))
+
+    def solve(self, workers: int = os.cpu_count() or 1, top_k: int = TOP_KEYS,
+              confidence: Optional[float] = None) -> List[Tuple[np.ndarray, float]]:
+        """
+        Runs the restarts until all of them finish or one reaches the confidence score.
+
+        :param workers: The number of worker processes (1 runs the restarts in this process).
+        :param top_k: The number of best distinct keys returned.
+        :param confidence: The average score per n-gram to stop early (the confidence_score of the scorer if None,
+        math.inf runs every restart).
+        :return: The best keys with their scores, from best to worst.
+        """
+        # The scores per n-gram depend on the order of the n-grams, so the default threshold comes from the scorer
+        if confidence is None:
+            confidence = self._scorer.confidence_score
+        best = []
+
+        if workers == 1:
+            for restart, seed in enumerate(self._seeds):
+                key, score = self.run_restart(self._scorer, restart, seed)
+                self._add_result(best, key, score, top_k)
+                if self._is_confident(score, confidence):
+                    logger.info(f"Confident decoding found after {restart + 1} restarts")
+                    break
+        else:
+            # Bounded number of restarts in flight, so stopping does not wait for all of them
+            finished = 0
+            for done in imap_bounded(MultiRestartSolver.run_restart, enumerate(self._seeds), workers, self._scorer):
+                for _, (key, score) in done:
+                    self._add_result(best, key, score, top_k)
+                finished += len(done)
+                if any(self._is_confident(score, confidence) for _, (_, score) in done):
+                    logger.info(f"Confident decoding found after {finished} restarts")
+                    break
+
+        return [(key, score) for score, _, key in sorted(best, key=lambda item: item[0], reverse=True)]
+
+
+class SimulatedAnnealingSolver:
+    """
+    Automatic solver for monoalphabetic substitution ciphers that also accepts worse swaps, with a probability that
+    decreases as the temperature cools down, to escape local optima. The search runs for a fixed time or number of
+    swaps and always holds the best key found, which is returned when the budget ends or on SIGINT.
+    """
+
+    def __init__(self, scorer: LogProbScorer, schedule: Union[str, Callable] = "exponential",
+                 initial_temperature: float = INITIAL_TEMPERATURE, final_temperature: float = FINAL_TEMPERATURE,
+                 seed: Optional[int] = None) -> None:
+        """
+        Constructor method that initializes the solver.
+
+        :param scorer: The scorer of the ciphertext.
+        :param schedule: The cooling schedule, one of COOLING_SCHEDULES or a function with the same arguments.
+        :param initial_temperature: The temperature at the start, per n-gram of the ciphertext.
+        :param final_temperature: The temperature at the end, per n-gram of the ciphertext.
+        :param seed: The seed of the random search.
+        :raises ValueError: If the schedule or the temperatures are not valid
+        """
+        if not callable(schedule) and schedule not in COOLING_SCHEDULES:
+            raise ValueError(f"Invalid cooling schedule: {schedule}")
+        if not 0 < final_temperature <= initial_temperature:
+            raise ValueError(f"Invalid temperatures: {initial_temperature}, {final_temperature}")
+        self._scorer = scorer
+        self._schedule = schedule if callable(schedule) else COOLING_SCHEDULES[schedule]
+        self._random = random.Random(seed)
+
+        # Longer ciphertexts change the score more on every swap, so the temperature grows with them
+        scale = max(scorer.ngram_count, 1)
+        self._initial_temperature = initial_temperature * scale
+        self._final_temperature = final_temperature * scale
+
+        # Swaps between two symbols that do not appear in the ciphertext never change the score
+        present = scorer.symbol_counts > 0
+        self._swaps = [(first, second) for first, second in itertools.combinations(range(len(scorer.alphabet)), 2)
+                       if present[first] or present[second]]
+        self._interrupted = False
+
+    def _interrupt(self, signum, frame) -> None:
+        """
+        Handles SIGINT, stopping the search at the next swap.
+        """
+        self._interrupted = True
+
+    def solve(self, key: Optional[np.ndarray] = None, time_limit: Optional[float] = None,
+              max_swaps: Optional[int] = None) -> Tuple[np.ndarray, float]:
+        """
+        Anneals a key until the time limit or the number of swaps is reached, or the search is interrupted.
+
+        :param key: The initial decryption key (the frequency-based key is used if not provided).
+        :param time_limit: The wall-clock budget in seconds.
+        :param max_swaps: The maximum number of swaps tried.
+        :return: A tuple with the best key found and its score.
+        :raises ValueError: If neither the time limit nor the number of swaps is given
+        """
+        if time_limit is None and max_swaps is None:
+            raise ValueError("A time limit or a maximum number of swaps is required")
+
+        key = self._scorer.initial_key() if key is None else key.copy()
+        score = self._scorer.score(key)
+        best_key, best_score = key.copy(), score
+        if not self._swaps:
+            return best_key, best_score
+
+        # SIGINT stops the search instead of raising KeyboardInterrupt (only the main thread can handle signals)
+        self._interrupted = False
+        handle_signal = threading.current_thread() is threading.main_thread()
+        previous_handler = signal.signal(signal.SIGINT, self._interrupt) if handle_signal else None
+
+        try:
+            start = time.perf_counter()
+            progress = 0.0
+            temperature = self._initial_temperature
+            swaps = 0
+            while not self._interrupted:
+                # Progress of the budget, with the clock checked every few swaps
+                if swaps % CLOCK_INTERVAL == 0:
+                    progress = 0.0 if max_swaps is None else swaps / max_swaps
+                    if time_limit is not None:
+                        progress = max(progress, (time.perf_counter() - start) / time_limit)
+                    if progress >= 1:
+                        break
+                    temperature = self._schedule(self._initial_temperature, self._final_temperature, progress)
+                elif max_swaps is not None and swaps >= max_swaps:
+                    break
+                swaps += 1
+
+                first, second = self._swaps[self._random.randrange(len(self._swaps))]
+                delta = self._scorer.swap_delta(key, first, second)
+                if delta >= 0 or self._random.random() < math.exp(delta / temperature):
+                    key[first], key[second] = key[second], key[first]
+                    score += delta
+                    if score > best_score:
+                        best_key, best_score = key.copy(), score
+        finally:
+            if handle_signal:
+                signal.signal(signal.SIGINT, previous_handler)
+
+        if self._interrupted:
+            logger.info(f"Annealing interrupted after {swaps} swaps")
+        return best_key, best_score
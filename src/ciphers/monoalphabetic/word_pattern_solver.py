@@ -0,0 +1,150 @@
+import re
+import string
+from collections import Counter
+from typing import Dict, List
+
+import numpy as np
+
+from src.ciphers.monoalphabetic.ngram_model import ALPHABET, encode_text
+
+# Symbols of the word patterns, given to the letters of a word in order of first appearance ("that" -> "ABCA")
+PATTERN_SYMBOLS = string.ascii_uppercase + string.ascii_lowercase + string.digits
+
+# Words are the runs of symbols substituted by the cipher
+WORD_REGEX = re.compile(f"[{re.escape(ALPHABET)}]+")
+
+# Minimum number of occurrences of a word in the language text to be indexed (drops typos and rare names)
+MIN_WORD_COUNT = 2
+
+# Number of the most frequent ciphertext words (weighted by length) used by the solver
+MAX_WORDS = 60
+
+# Maximum number of candidate words tried for every ciphertext word, from most to least frequent
+MAX_BRANCHES = 20
+
+# Maximum number of nodes of the backtracking search
+MAX_NODES = 2000
+
+
+def word_pattern(word: str) -> str:
+    """
+    Gets the letter pattern of a word, shared by all the words that a substitution can turn it into.
+
+    :param word: The word as a string.
+    :return: The pattern, e.g. "ABCA" for "that".
+    """
+    first_positions = {}
+    return "".join(PATTERN_SYMBOLS[first_positions.setdefault(char, len(first_positions))] for char in word)
+
+
+def build_word_pattern_index(text: str, min_count: int = MIN_WORD_COUNT) -> Dict[str, List[str]]:
+    """
+    Builds the index from letter patterns to the words of a language text.
+
+    :param text: The language text as a string.
+    :param min_count: The minimum number of occurrences of an indexed word.
+    :return: The words of every pattern, from most to least frequent.
+    """
+    index = {}
+    for word, count in Counter(WORD_REGEX.findall(text)).most_common():
+        if count < min_count:
+            break
+        index.setdefault(word_pattern(word), []).append(word)
+    return index
+
+
+class WordPatternSolver:
+    """
+    Constraint solver for monoalphabetic substitution ciphers that assigns dictionary words to the ciphertext words.
+    The backtracking search assigns first the word with the fewest candidates consistent with the partial key,
+    and bounds the branches by the ciphertext characters they can still cover. Words without consistent candidates
+    (e.g. names missing from the dictionary) are left out instead of failing the search.
+    """
+
+    def __init__(self, index: Dict[str, List[str]], ciphered_content: str, alphabet: str = ALPHABET,
+                 max_words: int = MAX_WORDS) -> None:
+        """
+        Constructor method that gets the candidates of the ciphertext words.
+
+        :param index: The words of the language by pattern, as built by build_word_pattern_index.
+        :param ciphered_content: The ciphered content as a string.
+        :param alphabet: The symbols of the alphabet.
+        :param max_words: The number of ciphertext words used, from the ones that cover more characters.
+        """
+        self.alphabet = alphabet
+        word_counts = Counter(WORD_REGEX.findall(ciphered_content))
+        words = sorted((word for word in word_counts if word_pattern(word) in index),
+                       key=lambda word: word_counts[word] * len(word), reverse=True)[:max_words]
+
+        # Symbols of every ciphertext word, symbols of its candidates, and characters covered when it is solved
+        self._codes = [encode_text(word, alphabet).astype(np.int64) for word in words]
+        self._candidates = [encode_text("".join(index[word_pattern(word)]), alphabet).astype(np.int64).reshape(-1, len(word))
+                            for word in words]
+        self._weights = [word_counts[word] * len(word) for word in words]
+
+    def _consistent(self, word: int, key: np.ndarray, used: np.ndarray) -> np.ndarray:
+        """
+        Gets the candidates of a word that agree with a partial key.
+
+        :param word: The index of the ciphertext word.
+        :param key: The partial decryption key (-1 for the symbols not assigned).
+        :param used: Whether every deciphered symbol is already assigned.
+        :return: The indices of the consistent candidates, from most to least frequent.
+        """
+        assigned = key[self._codes[word]]
+        known = assigned >= 0
+        candidates = self._candidates[word]
+        consistent = (candidates[:, known] == assigned[known]).all(axis=1) & \
+            ~used[candidates[:, ~known]].any(axis=1)
+        return np.flatnonzero(consistent)
+
+    def solve(self, max_nodes: int = MAX_NODES, max_branches: int = MAX_BRANCHES) -> Dict[str, str]:
+        """
+        Searches the partial key that turns the most ciphertext characters into dictionary words.
+
+        :param max_nodes: The maximum number of nodes of the search.
+        :param max_branches: The maximum number of candidates tried for every word.
+        :return: The replacements found as a dictionary (ciphered character -> deciphered character).
+        """
+        key = np.full(len(self.alphabet), -1, dtype=np.int64)
+        used = np.zeros(len(self.alphabet), dtype=bool)
+        total_weight = sum(self._weights)
+        best = {"weight": -1, "key": key.copy()}
+        nodes = 0
+
+        def search(remaining: List[int], weight: int) -> None:
+            nonlocal nodes
+            nodes += 1
+            if weight > best["weight"]:
+                best["weight"], best["key"] = weight, key.copy()
+
+            # Words left without consistent candidates are dropped from the branch
+            options = []
+            for word in remaining:
+                consistent = self._consistent(word, key, used)
+                if len(consistent):
+                    options.append((len(consistent), word, consistent))
+            bound = weight + sum(self._weights[word] for _, word, _ in options)
+            if not options or bound <= best["weight"] or nodes >= max_nodes or best["weight"] == total_weight:
+                return
+
+            # Most constrained word first
+            _, word, consistent = min(options, key=lambda option: option[0])
+            rest = [other for _, other, _ in options if other != word]
+            codes = self._codes[word]
+            for candidate in consistent[:max_branches]:
+                plain = self._candidates[word][candidate]
+                new_codes, positions = np.unique(codes[key[codes] < 0], return_index=True)
+                new_plain = plain[key[codes] < 0][positions]
+                key[new_codes], used[new_plain] = new_plain, True
+                search(rest, weight + self._weights[word])
+                key[new_codes], used[new_plain] = -1, False
+                if nodes >= max_nodes or best["weight"] == total_weight:
+                    return
+
+            # The word can also be a name or a word missing from the dictionary
+            search(rest, weight)
+
+        search(list(range(len(self._codes))), 0)
+        return {self.alphabet[cipher_symbol]: self.alphabet[plain_symbol]
+                for cipher_symbol, plain_symbol in enumerate(best["key"].tolist()) if plain_symbol >= 0}
@@ -1,24 +1,75 @@
+import mmap
+import os
 import random
 import string
-from tr import tr
+from typing import Iterable, Iterator, List, Union
+
+import numpy as np
+
+from src.util.process_pool import map_tasks
+from src.util.text_util import TextUtil
+
+# Size of the gather tables of the numpy engine (characters outside the ASCII range are never substituted)
+ALPHABET_SIZE = 128
+
+# Default number of bytes read from a file on every step
+CHUNK_SIZE = 1 << 20
+
+# Minimum number of bytes handled by each worker process, smaller files are processed in place
+MIN_BYTES_PER_WORKER = 1 << 22
 
 
 class PolyalphabeticCipher:
     """
     This class represents the Polyalphabetic Substitution Cipher system.
     It provides methods to cipher and decipher content using a set of random keys.
+    The key of every character depends only on its position, so any part of a content (or file) can be
+    processed on its own given its offset.
     """
 
-    def __init__(self, num_mappings=5) -> None:
+    # Available translation engines
+    ENGINES = ("translate", "numpy")
+
+    def __init__(self, num_mappings=5, engine: str = "translate") -> None:
         """
         Constructor method that initializes the class with a set of random keys.
 
         :param num_mappings: The number of substitution mappings to use.
+        :param engine: The translation engine: "translate" (str.translate per phase) or "numpy" (table gathers).
+        :raises ValueError: If the engine is not supported.
         """
+        if engine not in self.ENGINES:
+            raise ValueError(f"Invalid polyalphabetic engine: {engine}")
+        self._engine = engine
         self._num_mappings = num_mappings
         self._seed = self._generate_seed()
         self._keys = [self._generate_random_key() for _ in range(num_mappings)]
 
+        # One translation table per key, for every phase of the content
+        self._cipher_tables = [str.maketrans(self._seed, key) for key in self._keys]
+        self._decipher_tables = [str.maketrans(key, self._seed) for key in self._keys]
+
+        # The same mappings as (num_mappings x ALPHABET_SIZE) code point tables
+        self._cipher_array = self._build_array(self._cipher_tables)
+        self._decipher_array = self._build_array(self._decipher_tables)
+
+        # The same mappings for bytes (ASCII or UTF-8 encoded text, where the position is counted in bytes)
+        self._cipher_bytes_tables = [bytes.maketrans(self._seed.encode("ascii"), key.encode("ascii")) for key in self._keys]
+        self._decipher_bytes_tables = [bytes.maketrans(key.encode("ascii"), self._seed.encode("ascii")) for key in self._keys]
+
+    @staticmethod
+    def _build_array(tables: List[dict]) -> np.ndarray:
+        """
+        Converts translation tables into a gather table indexed by phase and code point.
+
+        :param tables: The translation tables of every phase.
+        :return: A uint32 array of shape (num_mappings, ALPHABET_SIZE).
+        """
+        array = np.tile(np.arange(ALPHABET_SIZE, dtype=np.uint32), (len(tables), 1))
+        for phase, table in enumerate(tables):
+            array[phase, list(table.keys())] = list(table.values())
+        return array
+
     def _generate_seed(self) -> str:
         """
         Generates a seed for the cipher using all the ASCII printable characters.
@@ -40,30 +91,237 @@ class PolyalphabeticCipher:
         random.shuffle(seed)
         return "".join(seed)
 
-    def cipher_content(self, content: str) -> str:
+    @staticmethod
+    def _to_code_points(content: str) -> np.ndarray:
+        """
+        Views the characters of a string as an array of code points.
+
+        :param content: The content as a string.
+        :return: A uint32 array with a code point per character.
+        """
+        return np.frombuffer(content.encode("utf-32-le"), dtype=np.uint32)
+
+    @staticmethod
+    def _from_code_points(code_points: np.ndarray) -> str:
+        """
+        Converts an array of code points back into a string.
+
+        :param code_points: A uint32 array with a code point per character.
+        :return: The content as a string.
+        """
+        return code_points.tobytes().decode("utf-32-le")
+
+    def _translate_phases(self, content: str, tables: List[dict], offset: int) -> str:
+        """
+        Translates every phase of the content (the characters that share a key) as a strided slice,
+        and interleaves the results back.
+
+        :param content: The content as a string.
+        :param tables: The translation tables of every phase.
+        :param offset: The position of the first character of the content.
+        :return: The translated content as a string.
+        """
+        result = np.empty(len(content), dtype=np.uint32)
+        for phase, table in enumerate(tables):
+            first = (phase - offset) % self._num_mappings
+            result[first::self._num_mappings] = self._to_code_points(content[first::self._num_mappings].translate(table))
+        return self._from_code_points(result)
+
+    def _gather_phases(self, content: str, array: np.ndarray, offset: int) -> str:
+        """
+        Translates the content with a gather on the code point table of every phase.
+
+        :param content: The content as a string.
+        :param array: The code point tables of every phase.
+        :param offset: The position of the first character of the content.
+        :return: The translated content as a string.
+        """
+        result = self._to_code_points(content).copy()
+        for phase in range(self._num_mappings):
+            code_points = result[(phase - offset) % self._num_mappings::self._num_mappings]
+            in_alphabet = code_points < ALPHABET_SIZE
+            code_points[in_alphabet] = array[phase][code_points[in_alphabet]]
+        return self._from_code_points(result)
+
+    def _translate_bytes(self, data: Union[bytes, bytearray, memoryview], tables: List[bytes], offset: int) -> bytes:
+        """
+        Translates every phase of the data as a strided slice of bytes.
+
+        :param data: The data as bytes.
+        :param tables: The byte translation tables of every phase.
+        :param offset: The position of the first byte of the data.
+        :return: The translated data as bytes.
+        """
+        data = bytes(data) if isinstance(data, memoryview) else data
+        result = bytearray(len(data))
+        for phase, table in enumerate(tables):
+            first = (phase - offset) % self._num_mappings
+            result[first::self._num_mappings] = data[first::self._num_mappings].translate(table)
+        return bytes(result)
+
+    def cipher_content(self, content: str, offset: int = 0) -> str:
         """
         Ciphers the given content using the set of random keys.
 
         :param content: The content to be ciphered as a string.
+        :param offset: The position of the first character when the content is part of a longer one.
         :return: The ciphered content as a string.
         """
         # Cipher the content using the set of random keys
-        ciphered_content = ""
-        for idx, char in enumerate(content):
-            key = self._keys[idx % self._num_mappings]
-            ciphered_content += tr(self._seed, key, char)
-        return ciphered_content
+        if self._engine == "numpy":
+            return self._gather_phases(content, self._cipher_array, offset)
+        return self._translate_phases(content, self._cipher_tables, offset)
 
-    def decipher_content(self, ciphered_content: str) -> str:
+    def decipher_content(self, ciphered_content: str, offset: int = 0) -> str:
         """
         Deciphers the given ciphered content using the set of random keys.
 
         :param ciphered_content: The ciphered content to be deciphered as a string.
+        :param offset: The position of the first character when the content is part of a longer one.
         :return: The deciphered content as a string.
         """
         # Decipher the ciphered content using the set of random keys
-        deciphered_content = ""
-        for idx, char in enumerate(ciphered_content):
-            key = self._keys[idx % self._num_mappings]
-            deciphered_content += tr(key, self._seed, char)
-        return deciphered_content
+        if self._engine == "numpy":
+            return self._gather_phases(ciphered_content, self._decipher_array, offset)
+        return self._translate_phases(ciphered_content, self._decipher_tables, offset)
+
+    def cipher_bytes(self, data: Union[bytes, bytearray, memoryview], offset: int = 0) -> bytes:
+        """
+        Ciphers the given data (ASCII or UTF-8 encoded text), counting the positions in bytes.
+        For ASCII text the result is the same as cipher_content.
+
+        :param data: The data to be ciphered as bytes.
+        :param offset: The position of the first byte when the data is part of a longer one.
+        :return: The ciphered data as bytes.
+        """
+        return self._translate_bytes(data, self._cipher_bytes_tables, offset)
+
+    def decipher_bytes(self, data: Union[bytes, bytearray, memoryview], offset: int = 0) -> bytes:
+        """
+        Deciphers the given data (ASCII or UTF-8 encoded text), counting the positions in bytes.
+
+        :param data: The data to be deciphered as bytes.
+        :param offset: The position of the first byte when the data is part of a longer one.
+        :return: The deciphered data as bytes.
+        """
+        return self._translate_bytes(data, self._decipher_bytes_tables, offset)
+
+    def _translate_chunks(self, chunks: Iterable[Union[str, bytes]], decipher: bool,
+                          offset: int) -> Iterator[Union[str, bytes]]:
+        """
+        Translates consecutive chunks of a content, carrying the position from one chunk to the next.
+
+        :param chunks: The chunks of the content, as strings (positions in characters) or bytes (positions in bytes).
+        :param decipher: Whether to decipher instead of cipher.
+        :param offset: The position of the first chunk.
+        :return: A generator of translated chunks, of the same type as the input ones.
+        """
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                yield self.decipher_content(chunk, offset) if decipher else self.cipher_content(chunk, offset)
+            else:
+                yield self.decipher_bytes(chunk, offset) if decipher else self.cipher_bytes(chunk, offset)
+            offset += len(chunk)
+
+    def cipher_chunks(self, chunks: Iterable[Union[str, bytes]], offset: int = 0) -> Iterator[Union[str, bytes]]:
+        """
+        Ciphers a content given in chunks of any size.
+
+        :param chunks: The chunks of the content, as strings or bytes.
+        :param offset: The position of the first chunk when resuming a stream.
+        :return: A generator of ciphered chunks.
+        """
+        return self._translate_chunks(chunks, False, offset)
+
+    def decipher_chunks(self, chunks: Iterable[Union[str, bytes]], offset: int = 0) -> Iterator[Union[str, bytes]]:
+        """
+        Deciphers a content given in chunks of any size.
+
+        :param chunks: The chunks of the ciphered content, as strings or bytes.
+        :param offset: The position of the first chunk when resuming a stream.
+        :return: A generator of deciphered chunks.
+        """
+        return self._translate_chunks(chunks, True, offset)
+
+    def _translate_range(self, input_path: str, output_path: str, start: int, end: int, decipher: bool,
+                         chunk_size: int) -> None:
+        """
+        Translates a byte range of a file into the same range of another (already sized) file.
+
+        :param input_path: The path of the input file.
+        :param output_path: The path of the output file.
+        :param start: The offset of the first byte of the range.
+        :param end: The offset after the last byte of the range.
+        :param decipher: Whether to decipher instead of cipher.
+        :param chunk_size: The number of bytes read on every step.
+        """
+        with open(input_path, "rb") as reader, open(output_path, "r+b") as writer:
+            reader.seek(start)
+            writer.seek(start)
+            chunks = iter(lambda: reader.read(min(chunk_size, end - reader.tell())), b"")
+            for chunk in self._translate_chunks(chunks, decipher, start):
+                writer.write(chunk)
+
+    def _translate_file(self, input_path: str, output_path: str, decipher: bool, workers: int, chunk_size: int) -> None:
+        """
+        Translates a file of any size, splitting it into byte ranges across worker processes.
+
+        :param input_path: The path of the input file.
+        :param output_path: The path of the output file.
+        :param decipher: Whether to decipher instead of cipher.
+        :param workers: The number of worker processes.
+        :param chunk_size: The number of bytes read on every step.
+        """
+        TextUtil()._create_directory_if_not_exists(output_path)
+
+        # The output is sized first, so every range can be written at its offset
+        size = os.path.getsize(input_path)
+        with open(output_path, "wb") as writer:
+            writer.truncate(size)
+
+        workers = min(workers, size // MIN_BYTES_PER_WORKER)
+        if workers <= 1:
+            self._translate_range(input_path, output_path, 0, size, decipher, chunk_size)
+            return
+
+        bounds = [size * worker // workers for worker in range(workers + 1)]
+        tasks = [(input_path, output_path, start, end, decipher, chunk_size) for start, end in zip(bounds, bounds[1:])]
+        map_tasks(PolyalphabeticCipher._translate_range, tasks, workers, self)
+
+    def cipher_file(self, input_path: str, output_path: str, workers: int = 1, chunk_size: int = CHUNK_SIZE) -> None:
+        """
+        Ciphers a text file of any size, counting the positions in bytes (as cipher_bytes).
+
+        :param input_path: The path of the file to cipher.
+        :param output_path: The path of the ciphered file.
+        :param workers: The number of worker processes, each one ciphering a range of the file.
+        :param chunk_size: The number of bytes read on every step.
+        """
+        self._translate_file(input_path, output_path, False, workers, chunk_size)
+
+    def decipher_file(self, input_path: str, output_path: str, workers: int = 1, chunk_size: int = CHUNK_SIZE) -> None:
+        """
+        Deciphers a text file of any size, counting the positions in bytes (as decipher_bytes).
+
+        :param input_path: The path of the ciphered file.
+        :param output_path: The path of the deciphered file.
+        :param workers: The number of worker processes, each one deciphering a range of the file.
+        :param chunk_size: The number of bytes read on every step.
+        """
+        self._translate_file(input_path, output_path, True, workers, chunk_size)
+
+    def decipher_file_range(self, input_path: str, start: int, length: int) -> bytes:
+        """
+        Deciphers a slice of a ciphered file without reading the rest of it (the file is memory mapped).
+
+        :param input_path: The path of the ciphered file.
+        :param start: The offset of the first byte of the slice.
+        :param length: The number of bytes of the slice.
+        :return: The deciphered slice as bytes.
+        """
+        with open(input_path, "rb") as reader:
+            # Empty files can not be memory mapped
+            if os.fstat(reader.fileno()).st_size == 0:
+                return b""
+            with mmap.mmap(reader.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return self.decipher_bytes(mapped[start:start + length], start)
@@ -0,0 +1,110 @@
+import argparse
+import time
+
+import numpy as np
+
+from src.ciphers import DesCipher
+from src.ciphers.des.des_block_cache import BLOCK_CACHE_SIZE
+from src.ciphers.des.des_modes import MODES, DesMode
+from src.util.logger import setup_logging
+from src.util.text_util import TextUtil
+
+
+# Set up the logging configuration
+logger = setup_logging()
+
+
+class DesBenchmark:
+    """
+    This class compares the throughput of the DES engines on the pixels of an image.
+    """
+
+    def __init__(self, image_path: str, sample_size: int) -> None:
+        """
+        Constructor method that loads the image pixels as 64-bit blocks.
+
+        :param image_path: The path to the image file.
+        :param sample_size: The number of blocks used for the per-block engines (the string engine is very slow).
+        """
+        self._cipher = DesCipher(engine="string")
+        image_bytes = TextUtil().read_image_pixels(image_path=image_path).reshape(-1)
+        self._blocks = self._cipher.des_helper.bytes_to_uint64_blocks(image_bytes[:len(image_bytes) - len(image_bytes) % 8])
+        self._sample = self._blocks[:sample_size]
+
+    def _time_per_block(self, process_block, blocks: np.ndarray) -> tuple:
+        """
+        Times a per-block function over the given blocks.
+
+        :param process_block: A function that processes a single block as a hexadecimal string.
+        :param blocks: The blocks to process.
+        :return: A tuple with the blocks per second and the processed blocks.
+        """
+        hex_blocks = [format(block, "016X") for block in blocks.tolist()]
+        start = time.perf_counter()
+        result = [process_block(hex_block) for hex_block in hex_blocks]
+        elapsed = time.perf_counter() - start
+        return len(blocks) / elapsed, np.array([int(block, 16) for block in result], dtype=np.uint64)
+
+    def _time_batch(self, batch_engine: str) -> tuple:
+        """
+        Times a batch engine over all the blocks of the image.
+
+        :param batch_engine: The name of the batch engine.
+        :return: A tuple with the blocks per second and the processed blocks.
+        """
+        engine = DesCipher.BATCH_ENGINES[batch_engine](self._cipher._key_context)
+        start = time.perf_counter()
+        result = engine.encrypt_blocks(self._blocks)
+        elapsed = time.perf_counter() - start
+        return len(self._blocks) / elapsed, result
+
+    def run(self) -> None:
+        """
+        Runs the benchmark and logs the throughput of every engine relative to _process_block.
+        """
+        logger.info(f"Blocks in the image: {len(self._blocks)}, per-block sample: {len(self._sample)}")
+
+        # Reference: the string-of-bits implementation
+        baseline, expected = self._time_per_block(self._cipher.cipher_block, self._sample)
+        logger.info(f"string (_process_block): {baseline:,.0f} blocks/s")
+
+        # Integer engine, block by block
+        int_engine = DesCipher.ENGINES["int"](self._cipher._key_context)
+        speed, result = self._time_per_block(lambda block: format(int_engine.encrypt_block(int(block, 16)), "016X"), self._sample)
+        self._report("int", speed, baseline, np.array_equal(result, expected))
+
+        # Batch engines over the whole image
+        for batch_engine in DesCipher.BATCH_ENGINES:
+            speed, result = self._time_batch(batch_engine)
+            self._report(batch_engine, speed, baseline, np.array_equal(result[:len(expected)], expected))
+
+        # ECB through the block cache, which only encrypts every distinct block once
+        cached_cipher = DesCipher(key=self._cipher._key, block_cache_size=BLOCK_CACHE_SIZE)
+        start = time.perf_counter()
+        result = MODES[DesMode.ecb](cached_cipher).encrypt(self._blocks)
+        speed = len(self._blocks) / (time.perf_counter() - start)
+        self._report("numpy + block cache", speed, baseline, np.array_equal(result[:len(expected)], expected))
+        logger.info(f"Block cache hit rate: {cached_cipher.block_cache.hit_rate:.1%}")
+
+    def _report(self, name: str, speed: float, baseline: float, matches: bool) -> None:
+        """
+        Logs the result of an engine.
+
+        :param name: The name of the engine.
+        :param speed: The blocks per second of the engine.
+        :param baseline: The blocks per second of the reference implementation.
+        :param matches: Whether the output matches the reference implementation.
+        """
+        if not matches:
+            logger.error(f"{name}: output does not match _process_block")
+        logger.info(f"{name}: {speed:,.0f} blocks/s ({speed / baseline:.1f}x)")
+
+
+if __name__ == "__main__":
+    # Parse command-line arguments
+    parser = argparse.ArgumentParser(description="Benchmark the DES engines on the pixels of an image.")
+    parser.add_argument("--image", help="Path to the image to encrypt", default="test_files/test_img.jpg")
+    parser.add_argument("--sample_size", help="Number of blocks for the per-block engines", type=int, default=2000)
+    args = parser.parse_args()
+
+    DesBenchmark(image_path=args.image, sample_size=args.sample_size).run()
@@ -13,8 +13,14 @@ logger = setup_logging()
 parser = argparse.ArgumentParser(description="Cipher and breaker playground")
 parser.add_argument("--filename", type=str, help="the name of the file to cipher", required=True)
 parser.add_argument("--language", help="Language for the text (eng or spa).", required=True, type=language_type, choices=list(Language))
+parser.add_argument("--image", type=str, help="the image to cipher with DES", default="test_files/test_img.jpg")
+parser.add_argument("--max_memory_mb", type=int, help="process the image in strips using at most this memory (in MB)")
 args = parser.parse_args()
 
+# Only uncompressed images can be read in strips, a JPEG or PNG would be decoded whole
+if args.max_memory_mb is not None and not TextUtil().is_raw_image(args.image):
+    parser.error("--max_memory_mb requires an uncompressed PGM/PPM/PAM image, convert the image first")
+
 # Extract arguments
 filename = args.filename
 language = args.language.name
@@ -61,19 +67,25 @@ text_util.write_text_to_file(filename=os.path.join(RESULTS_PATH, "poly_deciphere
 logger.info("Running DesCipher cipher")
 des_cipher = DesCipher()
 
-# Cipher and decipher the text
+# Cipher and decipher the file (streamed in chunks, so the file is never fully loaded)
 logger.debug("Running DesCipher cipher - Ciphering")
-ciphered_content_des = des_cipher.cipher_content(content=sample_text)
-text_util.write_text_to_file(filename=os.path.join(RESULTS_PATH, "des_ciphered.txt"), content=ciphered_content_des)
+des_cipher.cipher_file(input_path=filename, output_path=os.path.join(RESULTS_PATH, "des_ciphered.bin"))
 
 logger.debug("Running DesCipher cipher - Deciphering")
-deciphered_content_des = des_cipher.decipher_content(ciphered_content=ciphered_content_des)
-text_util.write_text_to_file(filename=os.path.join(RESULTS_PATH, "des_deciphered.txt"), content=deciphered_content_des)
+des_cipher.decipher_file(input_path=os.path.join(RESULTS_PATH, "des_ciphered.bin"), output_path=os.path.join(RESULTS_PATH, "des_deciphered.txt"))
 
-# Cipher and decipher the image
+# Cipher and decipher the image (the pixel buffer is encrypted directly, keeping its colors)
 logger.debug("Running DesCipher image cipher - Deciphering")
-image_bit_map, image_dimensions = text_util.extract_image_hex_bitmap_and_dimensions(image_path="test_files/test_img.jpg")
-ciphered_img_des = des_cipher.cipher_hex_img(content=image_bit_map)
-text_util.write_image_from_hex(filename=os.path.join(IMAGES_PATH, "des_ciphered.jpg"), hex_bitmap=ciphered_img_des, image_size=image_dimensions)
-deciphered_img_des = des_cipher.decipher_hex_img(ciphered_content=ciphered_img_des)
-text_util.write_image_from_hex(filename=os.path.join(IMAGES_PATH, "des_deciphered.jpg"), hex_bitmap=deciphered_img_des, image_size=image_dimensions)
+if args.max_memory_mb is None:
+    # PNG is lossless and keeps any alpha channel, so the ciphered image can be deciphered from its file
+    image_pixels = text_util.read_image_pixels(image_path=args.image)
+    ciphered_img_des = des_cipher.cipher_image(pixels=image_pixels)
+    text_util.write_image_pixels(filename=os.path.join(IMAGES_PATH, "des_ciphered.png"), pixels=ciphered_img_des)
+    deciphered_img_des = des_cipher.decipher_image(pixels=ciphered_img_des)
+    text_util.write_image_pixels(filename=os.path.join(IMAGES_PATH, "des_deciphered.png"), pixels=deciphered_img_des)
+else:
+    # Large images are processed in strips and written as raw PGM/PPM/PAM files
+    max_memory = args.max_memory_mb << 20
+    ciphered_img_path = os.path.join(IMAGES_PATH, "des_ciphered.pnm")
+    des_cipher.cipher_image_file(input_path=args.image, output_path=ciphered_img_path, max_memory=max_memory)
+    des_cipher.decipher_image_file(input_path=ciphered_img_path, output_path=os.path.join(IMAGES_PATH, "des_deciphered.pnm"), max_memory=max_memory)
@@ -0,0 +1,83 @@
+import itertools
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Callable, Iterable, Iterator, List, Tuple
+
+# Number of tasks kept in flight per worker process by imap_bounded (enough to keep every worker busy, while
+# stopping only waits for the few tasks already submitted)
+TASKS_PER_WORKER = 2
+
+# State shared by the tasks of the worker process (set by the pool initializer)
+_worker_state = None
+
+
+def _init_worker(state: Any) -> None:
+    """
+    Initializes a worker process with the state of its tasks, so it is only sent once per process.
+
+    :param state: The object passed as first argument to every task (e.g. a cipher or a scorer)
+    """
+    global _worker_state
+    _worker_state = state
+
+
+def _run_task(func: Callable, args: tuple) -> Any:
+    """
+    Runs a task in a worker process with the state of the process.
+
+    :param func: The function of the task, called as func(state, *args)
+    :param args: The remaining arguments of the function
+    :return: The result of the function
+    """
+    return func(_worker_state, *args)
+
+
+def _process_pool(workers: int, state: Any) -> ProcessPoolExecutor:
+    """
+    Creates a pool of worker processes initialized with a state.
+
+    :param workers: The number of worker processes
+    :param state: The object passed as first argument to every task
+    :return: The pool of worker processes
+    """
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(state,))
+
+
+def map_tasks(func: Callable, tasks: Iterable[tuple], workers: int, state: Any) -> List[Any]:
+    """
+    Runs every task across a pool of worker processes and returns the results in the order of the tasks.
+
+    :param func: A picklable function called as func(state, *args) for every task
+    :param tasks: The arguments of every task
+    :param workers: The number of worker processes
+    :param state: The object passed as first argument to every task, sent once per process
+    :return: The results of the tasks
+    """
+    with _process_pool(workers, state) as executor:
+        return list(executor.map(_run_task, itertools.repeat(func), tasks))
+
+
+def imap_bounded(func: Callable, tasks: Iterable[tuple], workers: int, state: Any) -> Iterator[List[Tuple[tuple, Any]]]:
+    """
+    Runs tasks across a pool of worker processes, keeping a bounded number of them in flight, and yields the tasks
+    as they complete. Closing the generator (e.g. breaking out of the loop) cancels the tasks not started yet, so
+    stopping does not wait for all of them.
+
+    :param func: A picklable function called as func(state, *args) for every task
+    :param tasks: The arguments of every task (consumed lazily)
+    :param workers: The number of worker processes
+    :param state: The object passed as first argument to every task, sent once per process
+    :return: The (args, result) pairs of every group of tasks completed together
+    """
+    tasks = iter(tasks)
+    with _process_pool(workers, state) as executor:
+        futures = {executor.submit(_run_task, func, args): args
+                   for args in itertools.islice(tasks, TASKS_PER_WORKER * workers)}
+        try:
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                yield [(futures.pop(future), future.result()) for future in done]
+                futures.update({executor.submit(_run_task, func, args): args
+                                for args in itertools.islice(tasks, len(done))})
+        finally:
+            for future in futures:
+                future.cancel()
@@ -1,9 +1,17 @@
 import json
 import os
+from typing import Iterable, Iterator, Optional, Union
 
+import numpy as np
 import pandas as pd
 from PIL import Image
 
+# Pillow modes of the supported images, by number of channels
+IMAGE_MODES = {1: "L", 3: "RGB", 4: "RGBA"}
+
+# Magic number of the raw images written strip by strip (PGM, PPM and PAM for RGBA)
+RAW_IMAGE_FORMATS = {"L": b"P5", "RGB": b"P6", "RGBA": b"P7"}
+
 class TextUtil:
     """
     This class represents a general utility class for text file operations.
@@ -76,6 +84,165 @@ class TextUtil:
         # Save the image to the specified file path
         img.save(filename)
 
+    def read_image_pixels(self, image_path: str) -> np.ndarray:
+        """
+        Reads the pixels of an image as a NumPy array, keeping its channels (grayscale, RGB or RGBA).
+
+        :param image_path: The path to the image file.
+        :return: A uint8 array of shape (height, width) or (height, width, channels).
+        """
+        with Image.open(image_path) as img:
+            # The pixel buffer of Pillow is exported once, without per-pixel conversions
+            return np.asarray(self._convert_image(img))
+
+    def _get_supported_mode(self, img: Image.Image) -> str:
+        """
+        Private function to get the closest supported mode (grayscale, RGB or RGBA) of an image.
+
+        :param img: The Pillow image
+        :return: The mode as a string
+        """
+        if img.mode in IMAGE_MODES.values():
+            return img.mode
+        return "RGBA" if "A" in img.mode or "transparency" in img.info else "RGB"
+
+    def _convert_image(self, img: Image.Image) -> Image.Image:
+        """
+        Private function to convert an image to the closest supported mode (palette, CMYK... are not supported).
+
+        :param img: The Pillow image
+        :return: The image in a supported mode
+        """
+        mode = self._get_supported_mode(img)
+        return img if img.mode == mode else img.convert(mode)
+
+    def _get_raw_image_layout(self, image_path: str) -> Optional[tuple]:
+        """
+        Private function to get the layout of an image whose pixels are stored uncompressed in a single block
+        (e.g. PGM, PPM or the PAM files written by write_image_strips), so rows can be read straight from the file.
+
+        :param image_path: The path to the image file.
+        :return: A tuple with the image dimensions (width, height), the mode and the offset of the pixels, or None
+        """
+        with open(image_path, "rb") as file:
+            # PAM (RGBA) files are not supported by Pillow, their header is parsed here
+            if file.read(3) == RAW_IMAGE_FORMATS["RGBA"] + b"\n":
+                fields = {}
+                for line in iter(file.readline, b""):
+                    if line.strip() == b"ENDHDR":
+                        break
+                    key, _, value = line.decode("ascii").partition(" ")
+                    fields[key] = value.strip()
+                return (int(fields["WIDTH"]), int(fields["HEIGHT"])), IMAGE_MODES[int(fields["DEPTH"])], file.tell()
+
+        with Image.open(image_path) as img:
+            if img.mode not in IMAGE_MODES.values() or len(img.tile) != 1:
+                return None
+            codec, _, offset, args = img.tile[0]
+            args = (args,) if isinstance(args, str) else tuple(args)
+            raw_mode, stride, orientation = args + (0, 1)[len(args) - 1:]
+            if codec != "raw" or raw_mode != img.mode or stride not in (0, img.size[0] * len(img.getbands())) or orientation != 1:
+                return None
+            return img.size, img.mode, offset
+
+    def read_image_header(self, image_path: str) -> tuple:
+        """
+        Reads the dimensions and the mode of an image without loading its pixels.
+
+        :param image_path: The path to the image file.
+        :return: A tuple containing the image dimensions (width, height) and the mode ("L", "RGB" or "RGBA").
+        """
+        layout = self._get_raw_image_layout(image_path)
+        if layout is not None:
+            return layout[:2]
+        with Image.open(image_path) as img:
+            return img.size, self._get_supported_mode(img)
+
+    def is_raw_image(self, image_path: str) -> bool:
+        """
+        Checks whether the pixels of an image are stored uncompressed (PGM, PPM or PAM), so it can be read in strips.
+
+        :param image_path: The path to the image file.
+        :return: True if read_image_strips can read the image.
+        """
+        return self._get_raw_image_layout(image_path) is not None
+
+    def read_image_strips(self, image_path: str, strip_rows: int) -> Iterator[np.ndarray]:
+        """
+        Reads the pixels of an uncompressed image (PGM, PPM or PAM) in strips of rows, as returned by read_image_pixels.
+        Only one strip is in memory at a time. Compressed formats such as JPEG or PNG can not be decoded by rows, so
+        they must be converted first (e.g. with write_image_pixels to a .pnm file).
+
+        :param image_path: The path to the image file.
+        :param strip_rows: The number of rows of every strip.
+        :return: A generator of uint8 arrays of shape (rows, width) or (rows, width, channels).
+        :raises ValueError: If the pixels of the image are not stored uncompressed
+        """
+        # The image is checked before the first strip is requested, so nothing is written for an invalid input
+        layout = self._get_raw_image_layout(image_path)
+        if layout is None:
+            raise ValueError(f"Image {image_path} is compressed, convert it to PGM/PPM/PAM to read it in strips")
+        return self._read_raw_image_strips(image_path, layout, strip_rows)
+
+    def _read_raw_image_strips(self, image_path: str, layout: tuple, strip_rows: int) -> Iterator[np.ndarray]:
+        """
+        Private function to read the rows of an uncompressed image straight from the file.
+
+        :param image_path: The path to the image file.
+        :param layout: The layout of the image, as returned by _get_raw_image_layout.
+        :param strip_rows: The number of rows of every strip.
+        :return: A generator of uint8 arrays of shape (rows, width) or (rows, width, channels).
+        """
+        (width, height), mode, offset = layout
+        shape = (width, len(mode)) if len(mode) > 1 else (width,)
+        with open(image_path, "rb") as file:
+            file.seek(offset)
+            for top in range(0, height, strip_rows):
+                rows = min(strip_rows, height - top)
+                yield np.frombuffer(file.read(rows * width * len(mode)), dtype=np.uint8).reshape((rows,) + shape)
+
+    def write_image_pixels(self, filename: str, pixels: np.ndarray) -> None:
+        """
+        Writes an image to the specified file from its pixels.
+
+        :param filename: The name of the file to be written as a string.
+        :param pixels: A uint8 array of shape (height, width) or (height, width, channels).
+        :return: None
+        """
+        self._create_directory_if_not_exists(filename)
+
+        # The image is created on top of the array buffer, without copying it
+        pixels = np.ascontiguousarray(pixels, dtype=np.uint8)
+        mode = IMAGE_MODES[pixels.shape[2] if pixels.ndim == 3 else 1]
+        img = Image.frombuffer(mode, (pixels.shape[1], pixels.shape[0]), pixels, "raw", mode, 0, 1)
+
+        # Save the image to the specified file path
+        img.save(filename)
+
+    def write_image_strips(self, filename: str, image_size: tuple, mode: str,
+                           strips: Iterable[Union[bytes, np.ndarray]]) -> None:
+        """
+        Writes an image incrementally as raw PGM (grayscale), PPM (RGB) or PAM (RGBA), so only one strip is in memory.
+
+        :param filename: The name of the file to be written as a string.
+        :param image_size: The size of the output image (width, height).
+        :param mode: The mode of the image ("L", "RGB" or "RGBA").
+        :param strips: The pixels of the image, row by row, in chunks of any size.
+        :return: None
+        """
+        self._create_directory_if_not_exists(filename)
+
+        width, height = image_size
+        if mode == "RGBA":
+            header = f"P7\nWIDTH {width}\nHEIGHT {height}\nDEPTH 4\nMAXVAL 255\nTUPLTYPE RGB_ALPHA\nENDHDR\n".encode("ascii")
+        else:
+            header = RAW_IMAGE_FORMATS[mode] + f"\n{width} {height}\n255\n".encode("ascii")
+
+        with open(filename, "wb") as file:
+            file.write(header)
+            for strip in strips:
+                file.write(strip)
+
     def write_dataframe_to_csv(self, filename: str, dataframe: pd.DataFrame) -> None:
         """
         Saves the provided Pandas DataFrame to the specified CSV file.
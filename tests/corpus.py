@@ -0,0 +1,6 @@
+from pydoc_data.topics import topics
+
+# English text shipped with Python: the language models are trained on most topics and tested on the others
+TOPICS = list(topics.values())
+TRAIN_TEXT = " ".join(TOPICS[:-40])
+TEST_TEXT = " ".join(TOPICS[-40:])[:3000]
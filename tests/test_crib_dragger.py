@@ -0,0 +1,43 @@
+import pytest
+
+from src.ciphers import MonoalphabeticCipher
+from src.ciphers.monoalphabetic import crib_dragger
+from src.ciphers.monoalphabetic.crib_dragger import CribDragger
+from tests.corpus import TEST_TEXT
+
+CRIB_OFFSET = 1000
+CRIB = TEST_TEXT[CRIB_OFFSET:CRIB_OFFSET + 40]
+
+
+@pytest.fixture(scope="module")
+def ciphered_text():
+    return MonoalphabeticCipher().cipher_content(TEST_TEXT)
+
+
+def test_drag_finds_the_crib(ciphered_text):
+    matches = CribDragger(ciphered_content=ciphered_text).find_replacements(CRIB)
+    assert CRIB_OFFSET in [offset for offset, _ in matches]
+    for offset, replacements in matches:
+        assert ciphered_text[offset:offset + len(CRIB)].translate(str.maketrans(replacements)) == CRIB
+
+
+def test_drag_across_chunks(ciphered_text, monkeypatch):
+    expected = CribDragger(ciphered_content=ciphered_text).drag(CRIB).tolist()
+    monkeypatch.setattr(crib_dragger, "CHUNK_OFFSETS", 7)
+    assert CribDragger(ciphered_content=ciphered_text).drag(CRIB).tolist() == expected
+
+
+def test_drag_with_known_replacements(ciphered_text):
+    dragger = CribDragger(ciphered_content=ciphered_text)
+    replacements = dragger.replacements_at(CRIB, CRIB_OFFSET)
+    assert CRIB_OFFSET in dragger.drag(CRIB, replacements).tolist()
+
+    # A replacement that contradicts the crib rules the offset out
+    cipher_char = next(char for char in ciphered_text[CRIB_OFFSET:] if char in replacements)
+    wrong = next(char for char in "QZXJ" if char != replacements[cipher_char])
+    assert CRIB_OFFSET not in dragger.drag(CRIB, {cipher_char: wrong}).tolist()
+
+
+def test_drag_rejects_crib_without_symbols(ciphered_text):
+    with pytest.raises(ValueError):
+        CribDragger(ciphered_content=ciphered_text).drag(" ,.")
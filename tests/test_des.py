@@ -0,0 +1,39 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from src.ciphers import DesCipher
+
+# Known-answer vector of DES (key, plaintext, ciphertext)
+KAT_KEY = "133457799BBCDFF1"
+KAT_PLAINTEXT = "0123456789ABCDEF"
+KAT_CIPHERTEXT = "85E813540F0AB405"
+
+ENGINE_PAIRS = list(itertools.product(DesCipher.ENGINES, DesCipher.BATCH_ENGINES))
+
+
+@pytest.mark.parametrize("engine, batch_engine", ENGINE_PAIRS)
+def test_known_answer_single_block(engine, batch_engine):
+    cipher = DesCipher(engine=engine, batch_engine=batch_engine, key=KAT_KEY)
+    assert cipher.cipher_block(KAT_PLAINTEXT) == KAT_CIPHERTEXT
+    assert cipher.decipher_block(KAT_CIPHERTEXT) == KAT_PLAINTEXT
+    assert cipher.cipher_int_block(int(KAT_PLAINTEXT, 16)) == int(KAT_CIPHERTEXT, 16)
+    assert cipher.decipher_int_block(int(KAT_CIPHERTEXT, 16)) == int(KAT_PLAINTEXT, 16)
+
+
+@pytest.mark.parametrize("engine, batch_engine", ENGINE_PAIRS)
+def test_known_answer_batch(engine, batch_engine):
+    cipher = DesCipher(engine=engine, batch_engine=batch_engine, key=KAT_KEY)
+    plaintext = np.full(67, int(KAT_PLAINTEXT, 16), dtype=np.uint64)
+    ciphertext = cipher.cipher_blocks(plaintext)
+    assert (ciphertext == np.uint64(int(KAT_CIPHERTEXT, 16))).all()
+    assert np.array_equal(cipher.decipher_blocks(ciphertext), plaintext)
+
+
+@pytest.mark.parametrize("batch_engine", DesCipher.BATCH_ENGINES)
+def test_batch_engines_match_int_engine(batch_engine):
+    cipher = DesCipher(engine="int", batch_engine=batch_engine, key=KAT_KEY)
+    blocks = np.random.default_rng(0).integers(0, 2 ** 64, size=100, dtype=np.uint64)
+    expected = [cipher.cipher_int_block(int(block)) for block in blocks]
+    assert cipher.cipher_blocks(blocks).tolist() == expected
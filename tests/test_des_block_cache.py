@@ -0,0 +1,87 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from src.ciphers import DesCipher
+from src.ciphers.des.des_block_cache import DesBlockCache
+from src.ciphers.des.des_modes import DesMode
+
+KEY = "133457799BBCDFF1"
+
+
+class CountingCipher:
+    """
+    Wraps a cipher, counting the blocks it actually processes.
+    """
+
+    def __init__(self):
+        self.cipher = DesCipher(key=KEY)
+        self.processed = 0
+
+    def cipher_blocks(self, blocks):
+        self.processed += len(blocks)
+        return self.cipher.cipher_blocks(blocks)
+
+    def decipher_blocks(self, blocks):
+        self.processed += len(blocks)
+        return self.cipher.decipher_blocks(blocks)
+
+
+def test_duplicates_are_processed_once():
+    counting, cache = CountingCipher(), DesBlockCache()
+    blocks = np.array([5, 7, 5, 5, 9, 7], dtype=np.uint64)
+    assert np.array_equal(cache.process_blocks(blocks, counting.cipher_blocks), counting.cipher.cipher_blocks(blocks))
+    assert counting.processed == 3
+    assert cache.stats() == {"requests": 6, "duplicates": 3, "cache_hits": 0, "processed": 3, "hit_rate": 0.5}
+
+
+def test_blocks_are_remembered_in_both_directions():
+    counting, cache = CountingCipher(), DesBlockCache()
+    blocks = np.arange(10, dtype=np.uint64)
+    ciphertext = cache.process_blocks(blocks, counting.cipher_blocks)
+
+    # The same blocks again, and their decryption, are found in the cache
+    assert np.array_equal(cache.process_blocks(blocks, counting.cipher_blocks), ciphertext)
+    assert np.array_equal(cache.process_blocks(ciphertext, counting.decipher_blocks, decrypt=True), blocks)
+    assert counting.processed == 10
+    assert cache.stats()["cache_hits"] == 20
+
+
+def test_least_recently_used_blocks_are_evicted():
+    counting, cache = CountingCipher(), DesBlockCache(max_size=4)
+    cache.process_blocks(np.arange(4, dtype=np.uint64), counting.cipher_blocks)
+    cache.process_blocks(np.array([0], dtype=np.uint64), counting.cipher_blocks)
+    cache.process_blocks(np.array([10], dtype=np.uint64), counting.cipher_blocks)
+
+    # Block 1 was the least recently used one, block 0 was used again
+    cache.process_blocks(np.array([0, 1], dtype=np.uint64), counting.cipher_blocks)
+    assert counting.processed == 6
+
+
+def test_cache_is_pickled_empty():
+    cache = DesBlockCache(max_size=8)
+    cache.process_block(1, DesCipher(key=KEY).cipher_int_block)
+    restored = pickle.loads(pickle.dumps(cache))
+    assert restored.max_size == 8
+    assert restored.stats()["requests"] == 0
+
+
+def test_cache_rejects_invalid_size():
+    with pytest.raises(ValueError):
+        DesBlockCache(max_size=0)
+
+
+def test_cached_cipher_matches_uncached():
+    cached, plain = DesCipher(key=KEY, block_cache_size=64), DesCipher(key=KEY)
+
+    # Uniform data, as the flat regions of an image
+    data = bytes(8) * 50 + bytes(range(8)) * 50
+    ciphertext = cached.cipher_bytes(data, mode=DesMode.ecb)
+    assert ciphertext == plain.cipher_bytes(data, mode=DesMode.ecb)
+    assert cached.decipher_bytes(ciphertext, mode=DesMode.ecb) == data
+    assert cached.block_cache.hit_rate > 0.9
+
+    assert cached.cipher_block("0123456789ABCDEF") == plain.cipher_block("0123456789ABCDEF")
+    assert cached.cipher_block("0123456789ABCDEF") == plain.cipher_block("0123456789ABCDEF")
+    assert cached.block_cache.cache_hits > 0
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from src.ciphers import DesCipher
+from src.ciphers.des.des_cipher import IMAGE_STRIP_COPIES
+from src.ciphers.des.des_modes import DesMode
+from src.util.text_util import IMAGE_MODES, TextUtil
+
+KEY = "133457799BBCDFF1"
+IV = 0x0F1E2D3C4B5A6978
+
+# Rows of every strip of the images read in strips
+STRIP_ROWS = 8
+
+
+def random_pixels(shape, seed=0):
+    return np.random.default_rng(seed).integers(0, 256, size=shape, dtype=np.uint8)
+
+
+def write_raw_image(path, pixels):
+    mode = IMAGE_MODES[pixels.shape[2] if pixels.ndim == 3 else 1]
+    TextUtil().write_image_strips(str(path), pixels.shape[1::-1], mode, [pixels.tobytes()])
+
+
+def read_raw_image(path):
+    # PAM files (RGBA) can not be opened by Pillow, so the image is read in strips
+    return np.concatenate(list(TextUtil().read_image_strips(str(path), STRIP_ROWS)))
+
+
+def strip_memory(pixels):
+    # Memory budget that makes strips of STRIP_ROWS rows
+    return STRIP_ROWS * IMAGE_STRIP_COPIES * pixels[0].size
+
+
+@pytest.mark.parametrize("mode", list(DesMode))
+@pytest.mark.parametrize("shape", [(16, 16), (13, 7, 3), (9, 11, 4)])
+def test_image_pixels_round_trip(tmp_path, mode, shape):
+    text_util, cipher = TextUtil(), DesCipher(key=KEY)
+    pixels = random_pixels(shape)
+    ciphered = cipher.cipher_image(pixels, mode=mode, iv=IV)
+    assert ciphered.shape == pixels.shape
+    assert not np.array_equal(ciphered, pixels)
+
+    # The ciphered image survives a lossless file, alpha channel included
+    text_util.write_image_pixels(str(tmp_path / "ciphered.png"), ciphered)
+    ciphered = text_util.read_image_pixels(str(tmp_path / "ciphered.png"))
+    assert np.array_equal(cipher.decipher_image(ciphered, mode=mode, iv=IV), pixels)
+
+
+def test_image_pixels_keep_last_bytes():
+    # 5 x 3 grayscale pixels: the last 7 bytes do not fill a block and are left unchanged
+    pixels = random_pixels((5, 3))
+    ciphered = DesCipher(key=KEY).cipher_image(pixels)
+    assert np.array_equal(ciphered.reshape(-1)[8:], pixels.reshape(-1)[8:])
+
+
+@pytest.mark.parametrize("mode", list(DesMode))
+@pytest.mark.parametrize("chained", [True, False])
+@pytest.mark.parametrize("shape", [(64, 64), (37, 21, 3), (19, 13, 4)])
+def test_image_file_round_trip(tmp_path, mode, chained, shape):
+    cipher = DesCipher(key=KEY)
+    pixels = random_pixels(shape)
+    write_raw_image(tmp_path / "plain.pnm", pixels)
+
+    cipher.cipher_image_file(str(tmp_path / "plain.pnm"), str(tmp_path / "ciphered.pnm"), mode=mode, iv=IV,
+                             max_memory=strip_memory(pixels), chained=chained)
+    cipher.decipher_image_file(str(tmp_path / "ciphered.pnm"), str(tmp_path / "deciphered.pnm"), mode=mode, iv=IV,
+                               max_memory=strip_memory(pixels), chained=chained)
+    assert not np.array_equal(read_raw_image(tmp_path / "ciphered.pnm"), pixels)
+    assert np.array_equal(read_raw_image(tmp_path / "deciphered.pnm"), pixels)
+
+
+@pytest.mark.parametrize("mode", [DesMode.cbc, DesMode.ctr, DesMode.ofb])
+def test_unchained_strips_do_not_share_keystream(tmp_path, mode):
+    cipher = DesCipher(key=KEY)
+
+    # Two identical strips: with a shared IV their ciphertexts would be identical too
+    pixels = np.tile(random_pixels((STRIP_ROWS, 64)), (2, 1))
+    write_raw_image(tmp_path / "plain.pgm", pixels)
+    cipher.cipher_image_file(str(tmp_path / "plain.pgm"), str(tmp_path / "ciphered.pgm"), mode=mode, iv=IV,
+                             max_memory=strip_memory(pixels), chained=False)
+
+    ciphered = read_raw_image(tmp_path / "ciphered.pgm")
+    assert not np.array_equal(ciphered[:STRIP_ROWS], ciphered[STRIP_ROWS:])
+
+
+def test_strips_of_compressed_image_are_rejected(tmp_path):
+    TextUtil().write_image_pixels(str(tmp_path / "plain.png"), random_pixels((16, 16, 3)))
+    with pytest.raises(ValueError):
+        TextUtil().read_image_strips(str(tmp_path / "plain.png"), STRIP_ROWS)
@@ -0,0 +1,69 @@
+import pytest
+
+from src.ciphers import DesCipher
+from src.ciphers.des.des_key_search import DesKeySearch
+from src.util.text_util import TextUtil
+
+KEY = "FEDCBA9876543210"
+PLAINTEXTS = ["0123456789ABCDEF", "1122334455667788"]
+
+# Six unknown digits: 720 keys, split in prefixes of a length that depends on the number of workers
+PATTERN = "FEDCBA9876??????"
+
+
+@pytest.fixture(scope="module")
+def pairs():
+    cipher = DesCipher(key=KEY)
+    return [(plaintext, cipher.cipher_block(plaintext)) for plaintext in PLAINTEXTS]
+
+
+def test_search_finds_the_key(pairs):
+    assert DesKeySearch(pairs=pairs, pattern="FEDCBA98765?????").run(workers=1) == [KEY]
+
+
+def test_search_rejects_invalid_pattern(pairs):
+    with pytest.raises(ValueError):
+        DesKeySearch(pairs=pairs, pattern="FFDCBA98765?????")
+
+
+def test_prefixes_cover_the_keyspace(pairs):
+    search = DesKeySearch(pairs=pairs, pattern=PATTERN)
+    assert search.keyspace == 720
+    assert len(search.prefixes(2)) == 30
+    assert sum(search.search_prefix(prefix)[1] for prefix in search.prefixes(2)) <= search.keyspace
+
+
+def test_resume_with_other_workers(pairs, tmp_path):
+    checkpoint_path = str(tmp_path / "search.json")
+    search = DesKeySearch(pairs=pairs, pattern=PATTERN)
+    assert search._default_prefix_length(1) != search._default_prefix_length(8)
+    assert search.run(workers=1, checkpoint_path=checkpoint_path, stop_on_first=False) == [KEY]
+    checkpoint = TextUtil().read_json_from_file(filename=checkpoint_path)
+
+    # The resumed search keeps the prefixes of the checkpoint, so nothing is searched again
+    assert search.run(workers=8, checkpoint_path=checkpoint_path, stop_on_first=False) == [KEY]
+    resumed = TextUtil().read_json_from_file(filename=checkpoint_path)
+    assert resumed["prefix_length"] == checkpoint["prefix_length"]
+    assert resumed["tested"] == checkpoint["tested"]
+    assert sorted(resumed["completed"]) == sorted(checkpoint["completed"])
+
+    with pytest.raises(ValueError):
+        search.run(workers=1, prefix_length=checkpoint["prefix_length"] + 1, checkpoint_path=checkpoint_path)
+
+
+def test_resume_after_interruption(pairs, tmp_path):
+    checkpoint_path = str(tmp_path / "search.json")
+    search = DesKeySearch(pairs=pairs, pattern=PATTERN)
+    search.run(workers=1, checkpoint_path=checkpoint_path, stop_on_first=False)
+    full = TextUtil().read_json_from_file(filename=checkpoint_path)
+
+    # Drop the second half of the tasks, as if the search had been interrupted
+    completed = full["completed"][:len(full["completed"]) // 2]
+    TextUtil().write_json_to_file(filename=checkpoint_path, data=dict(full, completed=completed, found=[], tested=0))
+
+    # Only the dropped tasks are searched again, so the key is found again only if its task was dropped
+    key_prefix = KEY[PATTERN.index("?"):PATTERN.index("?") + full["prefix_length"]]
+    expected = [] if key_prefix in completed else [KEY]
+    assert search.run(workers=2, checkpoint_path=checkpoint_path, stop_on_first=False) == expected
+    resumed = TextUtil().read_json_from_file(filename=checkpoint_path)
+    assert sorted(resumed["completed"]) == sorted(full["completed"])
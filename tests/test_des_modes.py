@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from src.ciphers import DesCipher
+from src.ciphers.des.des_modes import MIN_BLOCKS_PER_WORKER, MODES, DesMode, process_blocks_parallel
+
+KEY = "133457799BBCDFF1"
+IV = 0x0F1E2D3C4B5A6978
+
+# Lengths around the block size, to check the padding and the partial last blocks
+ODD_SIZES = [0, 1, 7, 8, 9, 15, 17, 1001]
+
+
+@pytest.mark.parametrize("mode", list(DesMode))
+@pytest.mark.parametrize("size", ODD_SIZES)
+def test_bytes_round_trip(mode, size):
+    cipher = DesCipher(key=KEY)
+    data = bytes(np.random.default_rng(size).integers(0, 256, size=size, dtype=np.uint8))
+    ciphertext = cipher.cipher_bytes(data, mode=mode, iv=IV)
+    if MODES[mode].is_stream:
+        assert len(ciphertext) == size + 8
+    assert cipher.decipher_bytes(ciphertext, mode=mode) == data
+
+
+@pytest.mark.parametrize("mode", list(DesMode))
+def test_mode_keeps_state_between_calls(mode):
+    cipher = DesCipher(key=KEY)
+    blocks = np.arange(11, dtype=np.uint64)
+    whole = MODES[mode](cipher, 42).encrypt(blocks)
+    block_mode = MODES[mode](cipher, 42)
+    parts = np.concatenate((block_mode.encrypt(blocks[:4]), block_mode.encrypt(blocks[4:])))
+    assert np.array_equal(parts, whole)
+    assert np.array_equal(MODES[mode](cipher, 42).decrypt(whole), blocks)
+
+
+def test_cbc_chains_the_blocks():
+    cipher = DesCipher(key=KEY)
+    blocks = np.arange(5, dtype=np.uint64)
+    expected, previous = [], IV
+    for block in blocks.tolist():
+        previous = cipher.cipher_int_block(block ^ previous)
+        expected.append(previous)
+    assert MODES[DesMode.cbc](cipher, IV).encrypt(blocks).tolist() == expected
+
+
+def test_parallel_blocks_match_in_place():
+    cipher = DesCipher(key=KEY)
+    blocks = np.random.default_rng(0).integers(0, 2 ** 64, size=2 * MIN_BLOCKS_PER_WORKER + 3, dtype=np.uint64)
+    ciphertext = process_blocks_parallel(cipher, blocks, workers=2)
+    assert np.array_equal(ciphertext, cipher.cipher_blocks(blocks))
+    assert np.array_equal(process_blocks_parallel(cipher, ciphertext, decrypt=True, workers=2), blocks)
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from src.ciphers import DesCipher
+from src.ciphers.des.des_modes import DesMode
+
+KEY = "133457799BBCDFF1"
+IV = 0x0F1E2D3C4B5A6978
+
+# Lengths around the block size, to check the padding and the partial last blocks
+ODD_SIZES = [0, 1, 7, 8, 9, 15, 17, 1001]
+
+
+def random_bytes(size):
+    return bytes(np.random.default_rng(size).integers(0, 256, size=size, dtype=np.uint8))
+
+
+@pytest.mark.parametrize("mode", list(DesMode))
+@pytest.mark.parametrize("size", ODD_SIZES)
+def test_stream_matches_bytes(mode, size):
+    cipher = DesCipher(key=KEY)
+    data = random_bytes(size)
+
+    # Chunks of sizes that do not align with the blocks
+    chunks = [data[start:start + 3] for start in range(0, len(data), 3)]
+    ciphertext = b"".join(cipher.stream(mode=mode, iv=IV).process_chunks(chunks))
+    assert ciphertext == cipher.cipher_bytes(data, mode=mode, iv=IV)
+
+    chunks = [ciphertext[start:start + 13] for start in range(0, len(ciphertext), 13)]
+    assert b"".join(cipher.stream(mode=mode, decrypt=True).process_chunks(chunks)) == data
+
+
+@pytest.mark.parametrize("mode", list(DesMode))
+def test_stream_without_header(mode):
+    cipher = DesCipher(key=KEY)
+    data = random_bytes(100)
+    ciphertext = b"".join(cipher.stream(mode=mode, iv=IV, header=False).process_chunks([data]))
+    deciphered = cipher.stream(mode=mode, iv=IV, decrypt=True, header=False).process_chunks([ciphertext])
+    assert b"".join(deciphered) == data
+
+
+@pytest.mark.parametrize("mode", list(DesMode))
+@pytest.mark.parametrize("size", [0, 1001])
+def test_file_round_trip(tmp_path, mode, size):
+    cipher = DesCipher(key=KEY)
+    data = random_bytes(size)
+    (tmp_path / "plain.bin").write_bytes(data)
+
+    # The output directories are created, and the chunks do not align with the blocks
+    cipher.cipher_file(str(tmp_path / "plain.bin"), str(tmp_path / "out" / "ciphered.bin"), mode=mode, iv=IV,
+                       chunk_size=100)
+    assert (tmp_path / "out" / "ciphered.bin").read_bytes() == cipher.cipher_bytes(data, mode=mode, iv=IV)
+    cipher.decipher_file(str(tmp_path / "out" / "ciphered.bin"), str(tmp_path / "deciphered.bin"), mode=mode,
+                         chunk_size=100)
+    assert (tmp_path / "deciphered.bin").read_bytes() == data
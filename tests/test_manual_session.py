@@ -0,0 +1,58 @@
+import pytest
+
+from src.ciphers.monoalphabetic.manual_session import ManualDecodingSession
+
+# Colored characters are wrapped in ANSI codes, removed to compare the text
+ANSI_CODES = ("\033[94m", "\033[91m", "\033[0m")
+
+
+def plain(text):
+    for code in ANSI_CODES:
+        text = text.replace(code, "")
+    return text
+
+
+def test_pages_split_at_lines():
+    content = "".join(f"line {index}\n" for index in range(25))
+    session = ManualDecodingSession(ciphered_content=content, page_lines=10)
+    assert session.num_pages == 3
+    assert session.render() == "".join(f"line {index}\n" for index in range(10))
+    session.go_to_page(2)
+    assert session.render() == "".join(f"line {index}\n" for index in range(20, 25))
+    session.go_to_page(7)
+    assert session.page == 2
+
+
+def test_long_lines_split_into_rows():
+    # A ciphertext without line breaks is split into rows of the page width
+    content = "abcdefghij" * 100
+    session = ManualDecodingSession(ciphered_content=content, page_lines=5, page_width=30)
+    assert session.num_pages == 7
+    assert session.render() == "\n".join(["abcdefghij" * 3] * 5)
+    session.go_to_page(6)
+    assert session.render() == "\n".join(["abcdefghij" * 3] * 3 + ["abcdefghij"])
+
+
+def test_apply_and_content():
+    session = ManualDecodingSession(ciphered_content="xyz xz\nzy")
+    session.apply("xz", "te")
+    assert session.replacements == {"x": "t", "z": "e"}
+    assert session.content() == "tye te\ney"
+    assert plain(session.render()) == "tye te\ney"
+    assert plain(session.render(old_string="y", new_string="h")) == "the te\neh"
+
+    with pytest.raises(ValueError):
+        session.apply("xy", "t")
+
+
+def test_resume_from_current_content():
+    session = ManualDecodingSession(ciphered_content="xyz xz", current_content="tyz tz")
+    assert session.replacements == {"x": "t"}
+    assert session.content() == "tyz tz"
+
+
+def test_invalid_page_size():
+    with pytest.raises(ValueError):
+        ManualDecodingSession(ciphered_content="abc", page_lines=0)
+    with pytest.raises(ValueError):
+        ManualDecodingSession(ciphered_content="abc", page_width=0)
@@ -0,0 +1,46 @@
+import string
+
+from src.ciphers import MonoalphabeticCipher
+
+# Characters substituted by the key
+ALPHABET = string.ascii_letters + string.digits
+
+# Text with characters outside the alphabet of the key, including multibyte UTF-8 ones
+CONTENT = "The quick brown fox jumps over 13 lazy dogs, déjà vu — ¿qué? 漢字\n"
+
+
+def test_content_round_trip():
+    cipher = MonoalphabeticCipher()
+    ciphered = cipher.cipher_content(CONTENT)
+    assert ciphered != CONTENT
+    assert cipher.decipher_content(ciphered) == CONTENT
+
+    # Only letters and digits are substituted
+    assert all((char in ALPHABET) == (ciphered_char in ALPHABET) for char, ciphered_char in zip(CONTENT, ciphered))
+    assert all(char == ciphered_char for char, ciphered_char in zip(CONTENT, ciphered) if char not in ALPHABET)
+
+
+def test_bytes_match_content():
+    cipher = MonoalphabeticCipher()
+    ciphered = cipher.cipher_bytes(CONTENT.encode("utf-8"))
+    assert ciphered == cipher.cipher_content(CONTENT).encode("utf-8")
+    assert cipher.decipher_bytes(ciphered) == CONTENT.encode("utf-8")
+
+
+def test_chunks_match_content():
+    cipher = MonoalphabeticCipher()
+    chunks = [CONTENT[start:start + 5] for start in range(0, len(CONTENT), 5)]
+    ciphered = list(cipher.cipher_chunks(chunks))
+    assert "".join(ciphered) == cipher.cipher_content(CONTENT)
+    assert "".join(cipher.decipher_chunks(ciphered)) == CONTENT
+
+
+def test_file_round_trip(tmp_path):
+    cipher = MonoalphabeticCipher()
+    (tmp_path / "plain.txt").write_bytes(CONTENT.encode("utf-8") * 100)
+
+    # Chunks that split the multibyte characters
+    cipher.cipher_file(str(tmp_path / "plain.txt"), str(tmp_path / "out" / "ciphered.txt"), chunk_size=7)
+    assert (tmp_path / "out" / "ciphered.txt").read_bytes() == cipher.cipher_content(CONTENT * 100).encode("utf-8")
+    cipher.decipher_file(str(tmp_path / "out" / "ciphered.txt"), str(tmp_path / "deciphered.txt"), chunk_size=7)
+    assert (tmp_path / "deciphered.txt").read_bytes() == (tmp_path / "plain.txt").read_bytes()
@@ -0,0 +1,39 @@
+import pytest
+
+from src.ciphers import MonoalphabeticCipher
+from src.ciphers.monoalphabetic import ngram_analyzer, ngram_model
+from src.ciphers.monoalphabetic.monoalphabetic_cipher_breaker import MonoalphabeticCipherBreaker
+from src.util.nltk_util import Language
+from tests.corpus import TEST_TEXT, TRAIN_TEXT
+
+
+@pytest.fixture
+def breaker(tmp_path, monkeypatch):
+    # The results and the cached models are written to the working directory, and the corpus replaces the NLTK one
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(ngram_analyzer, "get_long_text", lambda language: TRAIN_TEXT)
+    monkeypatch.setattr(ngram_model, "get_long_text", lambda language: TRAIN_TEXT)
+    return MonoalphabeticCipherBreaker(MonoalphabeticCipher().cipher_content(TEST_TEXT), Language.eng)
+
+
+@pytest.mark.parametrize("ngram_type, num_top", [("unigrams", 4), ("trigrams", 3)])
+def test_break_cipher_keeps_the_best_decoders(tmp_path, breaker, ngram_type, num_top):
+    decoders = breaker.break_cipher(num_top=num_top, ngram_type=ngram_type, top_k=3)
+    assert 1 <= len(decoders) <= 3
+    scores = [score for _, score in decoders]
+    assert scores == sorted(scores, reverse=True)
+
+    # Every decoder is a consistent substitution
+    for replacements, _ in decoders:
+        assert len(set(replacements.values())) == len(replacements)
+
+    # Only the kept decoders are saved, from best to worst
+    directory = tmp_path / "results" / "eng" / "possible_decoders"
+    assert sorted(path.name for path in directory.iterdir()) == [f"decoder_{rank}.txt" for rank in range(len(decoders))]
+    assert (directory / "decoder_0.txt").read_text() == breaker.perform_replacement(decoders[0][0])
+
+
+def test_break_cipher_top_decoder_does_not_depend_on_k(breaker):
+    best = breaker.break_cipher(num_top=4, ngram_type="unigrams", top_k=1)
+    decoders = breaker.break_cipher(num_top=4, ngram_type="unigrams", top_k=5)
+    assert best[0][1] == pytest.approx(decoders[0][1])
@@ -0,0 +1,77 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from src.ciphers.monoalphabetic import ngram_model
+from src.ciphers.monoalphabetic.ngram_model import ALPHABET, NgramModel, count_matrix_from_text, encode_text, \
+    get_language_model, ngram_windows
+from src.util.nltk_util import Language
+from tests.corpus import TRAIN_TEXT
+
+
+@pytest.fixture(scope="module")
+def model():
+    return NgramModel.from_text(TRAIN_TEXT, order=3)
+
+
+def test_ngrams_skip_other_characters():
+    codes = encode_text("ab c-dé", ALPHABET)
+    assert codes.tolist() == [0, 1, -1, 2, -1, 3, -1]
+    assert ngram_windows(codes, 2).tolist() == [[0, 1]]
+    assert ngram_windows(codes, 8).shape == (0, 8)
+
+    counts = count_matrix_from_text("abab", 2)
+    assert counts.shape == (len(ALPHABET),) * 2
+    assert counts[0, 1] == 2 and counts[1, 0] == 1 and counts.sum() == 3
+
+
+def test_tables_are_log_probabilities(model):
+    assert model.order == 3
+    for order, table in model.log_probs.items():
+        assert table.shape == (len(ALPHABET) ** order,)
+        assert table.dtype == np.float32
+        # The floor of the missing n-grams adds a little probability mass
+        assert 1 <= np.exp(table.astype(np.float64)).sum() < 1.1
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_save_and_load(tmp_path, model, mmap):
+    directory = str(tmp_path / "model")
+    assert not NgramModel.is_saved(directory, order=3)
+    model.save(directory)
+    assert NgramModel.is_saved(directory, order=3)
+    assert not NgramModel.is_saved(directory, order=4)
+
+    loaded = NgramModel.load(directory, order=3, mmap=mmap)
+    assert loaded.alphabet == model.alphabet
+    assert isinstance(loaded.log_probs[3], np.memmap) == mmap
+    for order in range(1, 4):
+        assert np.array_equal(loaded.log_probs[order], model.log_probs[order])
+
+
+def test_memory_mapped_model_is_pickled_as_directory(tmp_path, model):
+    directory = str(tmp_path / "model")
+    model.save(directory)
+    loaded = NgramModel.load(directory, order=3)
+    assert loaded.__getstate__() == {"alphabet": ALPHABET, "directory": directory, "order": 3}
+    assert len(pickle.dumps(loaded)) < 1000
+
+    restored = pickle.loads(pickle.dumps(loaded))
+    assert isinstance(restored.log_probs[3], np.memmap)
+    assert np.array_equal(restored.log_probs[3], model.log_probs[3])
+
+    # Models in memory are pickled with their tables
+    restored = pickle.loads(pickle.dumps(model))
+    assert np.array_equal(restored.log_probs[3], model.log_probs[3])
+
+
+def test_language_model_is_built_once(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    calls = []
+    monkeypatch.setattr(ngram_model, "get_long_text", lambda language: calls.append(language) or TRAIN_TEXT)
+
+    first = get_language_model(Language.eng, order=2)
+    second = get_language_model(Language.eng, order=2)
+    assert calls == [Language.eng]
+    assert np.array_equal(first.log_probs[2], second.log_probs[2])
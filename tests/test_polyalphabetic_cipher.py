@@ -0,0 +1,93 @@
+import random
+
+import pytest
+
+from src.ciphers import PolyalphabeticCipher
+from src.ciphers.polyalphabetic import polyalphabetic_cipher
+
+# Text with characters outside the alphabet of the keys, including multibyte UTF-8 ones
+CONTENT = "The quick brown fox jumps over 13 lazy dogs, déjà vu — ¿qué? 漢字\n" * 3
+
+
+def seeded_cipher(engine, seed=0):
+    # The keys are shuffled with the global random generator, so the same seed gives the same keys
+    random.seed(seed)
+    return PolyalphabeticCipher(engine=engine)
+
+
+@pytest.mark.parametrize("engine", PolyalphabeticCipher.ENGINES)
+def test_content_round_trip(engine):
+    cipher = PolyalphabeticCipher(engine=engine)
+    ciphered = cipher.cipher_content(CONTENT)
+    assert ciphered != CONTENT
+    assert cipher.decipher_content(ciphered) == CONTENT
+
+
+def test_engines_match():
+    ciphered = seeded_cipher("translate").cipher_content(CONTENT)
+    assert seeded_cipher("numpy").cipher_content(CONTENT) == ciphered
+    assert seeded_cipher("numpy").decipher_content(ciphered) == CONTENT
+
+
+@pytest.mark.parametrize("engine", PolyalphabeticCipher.ENGINES)
+def test_keys_cycle_with_the_position(engine):
+    cipher = PolyalphabeticCipher(num_mappings=3, engine=engine)
+    ciphered = cipher.cipher_content("a" * 12)
+    assert ciphered == ciphered[:3] * 4
+
+
+def test_bytes_match_ascii_content():
+    cipher = PolyalphabeticCipher()
+    content = "Plain ASCII text, 0123456789."
+    assert cipher.cipher_bytes(content.encode("ascii")) == cipher.cipher_content(content).encode("ascii")
+
+
+def test_invalid_engine_is_rejected():
+    with pytest.raises(ValueError):
+        PolyalphabeticCipher(engine="tr")
+
+
+@pytest.mark.parametrize("engine", PolyalphabeticCipher.ENGINES)
+@pytest.mark.parametrize("offset", [1, 4, 5, 23])
+def test_offsets_match_whole_content(engine, offset):
+    cipher = PolyalphabeticCipher(engine=engine)
+    ciphered = cipher.cipher_content(CONTENT)
+    assert cipher.cipher_content(CONTENT[offset:], offset=offset) == ciphered[offset:]
+    assert cipher.decipher_content(ciphered[offset:], offset=offset) == CONTENT[offset:]
+
+    data = CONTENT.encode("utf-8")
+    assert cipher.cipher_bytes(data[offset:], offset=offset) == cipher.cipher_bytes(data)[offset:]
+
+
+def test_chunks_resume_at_an_offset():
+    cipher = PolyalphabeticCipher()
+    chunks = [CONTENT[start:start + 7] for start in range(10, len(CONTENT), 7)]
+    ciphered = list(cipher.cipher_chunks(chunks, offset=10))
+    assert "".join(ciphered) == cipher.cipher_content(CONTENT)[10:]
+    assert "".join(cipher.decipher_chunks(ciphered, offset=10)) == CONTENT[10:]
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_file_round_trip(tmp_path, monkeypatch, workers):
+    # Small ranges, so the file is split across the worker processes
+    monkeypatch.setattr(polyalphabetic_cipher, "MIN_BYTES_PER_WORKER", 1000)
+    cipher = PolyalphabeticCipher()
+    data = CONTENT.encode("utf-8") * 50
+    (tmp_path / "plain.txt").write_bytes(data)
+
+    cipher.cipher_file(str(tmp_path / "plain.txt"), str(tmp_path / "out" / "ciphered.txt"), workers=workers,
+                       chunk_size=100)
+    assert (tmp_path / "out" / "ciphered.txt").read_bytes() == cipher.cipher_bytes(data)
+    cipher.decipher_file(str(tmp_path / "out" / "ciphered.txt"), str(tmp_path / "deciphered.txt"), workers=workers,
+                         chunk_size=100)
+    assert (tmp_path / "deciphered.txt").read_bytes() == data
+
+
+def test_file_range_is_deciphered_alone(tmp_path):
+    cipher = PolyalphabeticCipher()
+    data = CONTENT.encode("utf-8") * 10
+    (tmp_path / "ciphered.txt").write_bytes(cipher.cipher_bytes(data))
+    assert cipher.decipher_file_range(str(tmp_path / "ciphered.txt"), 333, 100) == data[333:433]
+
+    (tmp_path / "empty.txt").write_bytes(b"")
+    assert cipher.decipher_file_range(str(tmp_path / "empty.txt"), 0, 10) == b""
@@ -0,0 +1,135 @@
+import math
+import os
+import pickle
+import signal
+import threading
+import time
+
+import pytest
+
+from src.ciphers import MonoalphabeticCipher
+from src.ciphers.monoalphabetic.ngram_model import ALPHABET, NgramModel, count_matrix_from_text
+from src.ciphers.monoalphabetic.substitution_solver import CountMatrixScorer, MultiRestartSolver, NgramScorer, \
+    SimulatedAnnealingSolver, key_to_replacements, parse_time_limit
+from tests.corpus import TEST_TEXT, TRAIN_TEXT
+
+
+@pytest.fixture(scope="module")
+def ciphered_text():
+    return MonoalphabeticCipher().cipher_content(TEST_TEXT)
+
+
+@pytest.fixture(scope="module")
+def trigram_model():
+    return NgramModel.from_text(TRAIN_TEXT, order=3)
+
+
+@pytest.fixture(scope="module")
+def quadgram_scorer(ciphered_text):
+    return NgramScorer(model=NgramModel.from_text(TRAIN_TEXT, order=4), ciphered_content=ciphered_text)
+
+
+def accuracy(ciphered_content, key):
+    deciphered = ciphered_content.translate(str.maketrans(key_to_replacements(key, ALPHABET)))
+    letters = [(char, plain) for char, plain in zip(deciphered, TEST_TEXT) if plain in ALPHABET]
+    return sum(char == plain for char, plain in letters) / len(letters)
+
+
+def test_count_matrix_scorer_matches_text_scorer(ciphered_text, trigram_model):
+    text_scorer = NgramScorer(model=trigram_model, ciphered_content=ciphered_text)
+    count_scorer = CountMatrixScorer(model=trigram_model, counts=count_matrix_from_text(ciphered_text, 3))
+    key = text_scorer.initial_key()
+    assert count_scorer.score(key) == pytest.approx(text_scorer.score(key))
+
+    for first, second in [(0, 4), (3, 30), (10, 61)]:
+        swapped = key.copy()
+        swapped[first], swapped[second] = key[second], key[first]
+        expected = text_scorer.score(swapped) - text_scorer.score(key)
+        assert text_scorer.swap_delta(key, first, second) == pytest.approx(expected)
+        assert count_scorer.swap_delta(key, first, second) == pytest.approx(expected)
+
+
+def test_scorers_are_pickled_without_tables(ciphered_text, trigram_model):
+    for scorer in [NgramScorer(model=trigram_model, ciphered_content=ciphered_text),
+                   CountMatrixScorer(model=trigram_model, counts=count_matrix_from_text(ciphered_text, 3))]:
+        assert "_log_probs" not in scorer.__getstate__()
+        restored = pickle.loads(pickle.dumps(scorer))
+        key = scorer.initial_key()
+        assert (restored.initial_key() == key).all()
+        assert restored.score(key) == scorer.score(key)
+        assert restored.confidence_score == scorer.confidence_score
+
+
+def test_restarts_solve_the_cipher(ciphered_text, quadgram_scorer):
+    results = MultiRestartSolver(scorer=quadgram_scorer, restarts=4, seed=0).solve(workers=1)
+    assert accuracy(ciphered_text, results[0][0]) > 0.95
+
+
+def test_parallel_restarts_keep_the_best_distinct_keys(ciphered_text, quadgram_scorer):
+    # math.inf never stops early, so every restart runs in the worker processes
+    results = MultiRestartSolver(scorer=quadgram_scorer, restarts=6, seed=0).solve(workers=2, top_k=3,
+                                                                                 confidence=math.inf)
+    scores = [score for _, score in results]
+    assert 1 <= len(results) <= 3
+    assert scores == sorted(scores, reverse=True)
+    assert accuracy(ciphered_text, results[0][0]) > 0.95
+
+
+class CountingScorer(CountMatrixScorer):
+    """
+    Counts the swaps scored by the solver.
+    """
+
+    swaps = 0
+
+    def swap_delta(self, key, first, second):
+        self.swaps += 1
+        return super().swap_delta(key, first, second)
+
+
+@pytest.fixture(scope="module")
+def count_scorer(ciphered_text, trigram_model):
+    return CountMatrixScorer(model=trigram_model, counts=count_matrix_from_text(ciphered_text, 3))
+
+
+@pytest.mark.parametrize("schedule", ["exponential", "linear", "cosine"])
+def test_annealing_stops_after_max_swaps(ciphered_text, trigram_model, schedule):
+    scorer = CountingScorer(model=trigram_model, counts=count_matrix_from_text(ciphered_text, 3))
+    key, score = SimulatedAnnealingSolver(scorer=scorer, schedule=schedule, seed=0).solve(max_swaps=1000)
+    assert scorer.swaps == 1000
+
+    # The best key found is returned, never a worse one than the initial key
+    assert score == pytest.approx(scorer.score(key))
+    assert score >= scorer.score(scorer.initial_key())
+
+
+def test_annealing_stops_at_the_time_limit(count_scorer):
+    start = time.perf_counter()
+    SimulatedAnnealingSolver(scorer=count_scorer, seed=0).solve(time_limit=0.2)
+    assert 0.2 <= time.perf_counter() - start < 2
+
+
+def test_annealing_returns_the_best_key_on_sigint(count_scorer):
+    timer = threading.Timer(0.2, os.kill, (os.getpid(), signal.SIGINT))
+    timer.start()
+    start = time.perf_counter()
+    key, score = SimulatedAnnealingSolver(scorer=count_scorer, seed=0).solve(time_limit=60)
+    timer.join()
+    assert time.perf_counter() - start < 10
+    assert score == pytest.approx(count_scorer.score(key))
+    assert signal.getsignal(signal.SIGINT) is signal.default_int_handler
+
+
+def test_annealing_requires_a_budget(count_scorer):
+    with pytest.raises(ValueError):
+        SimulatedAnnealingSolver(scorer=count_scorer).solve()
+    with pytest.raises(ValueError):
+        SimulatedAnnealingSolver(scorer=count_scorer, schedule="quadratic")
+
+
+def test_parse_time_limit():
+    assert parse_time_limit("500ms") == pytest.approx(0.5)
+    assert parse_time_limit("2m") == 120
+    assert parse_time_limit("3") == 3
+    with pytest.raises(ValueError):
+        parse_time_limit("0s")
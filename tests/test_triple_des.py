@@ -0,0 +1,53 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from src.ciphers import DesCipher, TripleDesCipher
+from src.ciphers.des.des_modes import DesMode
+
+# Known-answer vector of DES (key, plaintext, ciphertext)
+KAT_KEY = "133457799BBCDFF1"
+KAT_PLAINTEXT = "0123456789ABCDEF"
+KAT_CIPHERTEXT = "85E813540F0AB405"
+
+ENGINE_PAIRS = list(itertools.product(DesCipher.ENGINES, DesCipher.BATCH_ENGINES))
+
+
+@pytest.mark.parametrize("engine, batch_engine", ENGINE_PAIRS)
+@pytest.mark.parametrize("keys", [
+    ("133457799BBCDFF1", "0123456789ABCDEF", "FEDCBA9876543210"),
+    ("133457799BBCDFF1", "0123456789ABCDEF"),
+])
+def test_triple_des_matches_chained_des(engine, batch_engine, keys):
+    stages = [DesCipher(engine=engine, batch_engine=batch_engine, key=key) for key in keys]
+    if len(stages) == 2:
+        stages.append(stages[0])
+    triple = TripleDesCipher(engine=engine, batch_engine=batch_engine, key="".join(keys))
+
+    # Encryption is E(K1), D(K2), E(K3)
+    expected = stages[2].cipher_block(stages[1].decipher_block(stages[0].cipher_block(KAT_PLAINTEXT)))
+    assert triple.cipher_block(KAT_PLAINTEXT) == expected
+    assert triple.decipher_block(expected) == KAT_PLAINTEXT
+
+    blocks = np.random.default_rng(1).integers(0, 2 ** 64, size=40, dtype=np.uint64)
+    expected_blocks = stages[2].cipher_blocks(stages[1].decipher_blocks(stages[0].cipher_blocks(blocks)))
+    assert np.array_equal(triple.cipher_blocks(blocks), expected_blocks)
+    assert np.array_equal(triple.decipher_blocks(expected_blocks), blocks)
+
+
+def test_triple_des_with_equal_keys_is_des():
+    assert TripleDesCipher(key=KAT_KEY * 3).cipher_block(KAT_PLAINTEXT) == KAT_CIPHERTEXT
+
+
+@pytest.mark.parametrize("mode", list(DesMode))
+def test_triple_des_bytes_round_trip(mode):
+    cipher = TripleDesCipher(num_keys=2)
+    data = bytes(range(100))
+    assert cipher.decipher_bytes(cipher.cipher_bytes(data, mode=mode), mode=mode) == data
+
+
+@pytest.mark.parametrize("key, num_keys", [(KAT_KEY, 3), (KAT_KEY * 4, 3), (None, 1)])
+def test_triple_des_rejects_invalid_keys(key, num_keys):
+    with pytest.raises(ValueError):
+        TripleDesCipher(key=key, num_keys=num_keys)
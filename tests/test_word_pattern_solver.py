@@ -0,0 +1,44 @@
+import pytest
+
+from src.ciphers import MonoalphabeticCipher
+from src.ciphers.monoalphabetic.ngram_model import ALPHABET
+from src.ciphers.monoalphabetic.word_pattern_solver import WordPatternSolver, build_word_pattern_index, word_pattern
+from tests.corpus import TEST_TEXT, TRAIN_TEXT
+
+
+@pytest.fixture(scope="module")
+def index():
+    return build_word_pattern_index(TRAIN_TEXT)
+
+
+def test_word_pattern():
+    assert word_pattern("that") == "ABCA"
+    assert word_pattern("Hello") == "ABCCD"
+    assert word_pattern("x") == "A"
+
+    # Substitutions keep the pattern of every word
+    cipher = MonoalphabeticCipher()
+    assert word_pattern(cipher.cipher_content("committee")) == word_pattern("committee")
+
+
+def test_index_keeps_frequent_words_in_order():
+    index = build_word_pattern_index("the cat and the dog and the cow sat", min_count=2)
+    assert index == {"ABC": ["the", "and"]}
+    assert build_word_pattern_index("the cat", min_count=1) == {"ABC": ["the", "cat"]}
+
+
+def test_solver_recovers_the_frequent_letters(index):
+    cipher = MonoalphabeticCipher()
+    ciphered = cipher.cipher_content(TEST_TEXT)
+    replacements = WordPatternSolver(index=index, ciphered_content=ciphered).solve()
+    assert len(set(replacements.values())) == len(replacements)
+
+    # Most of the replacements found are the ones of the key
+    plain_to_cipher = dict(zip(ALPHABET, cipher.cipher_content(ALPHABET)))
+    correct = sum(plain_to_cipher[plain] == cipher_char for cipher_char, plain in replacements.items())
+    assert len(replacements) >= 20
+    assert correct / len(replacements) > 0.9
+
+
+def test_solver_without_matching_words(index):
+    assert WordPatternSolver(index=index, ciphered_content="").solve() == {}